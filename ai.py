@@ -0,0 +1,195 @@
+"""
+AI assessments of scan candidates.
+
+Candidates go to the `claude` CLI in small chunks that run in parallel, so one
+slow or failed call only costs the verdicts of its own chunk. Verdicts are cached
+per ticker under a key made of the date and the inputs the verdict depends on
+(price bucket, distance from the ATH, analyst rating), so candidates that have
+not materially changed are not re-queried.
+"""
+
+from __future__ import annotations
+
+import math
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+
+from results import Stock
+from store import AssessmentCache
+
+AI_CHUNK_SIZE = 8
+AI_WORKERS = 4
+AI_TIMEOUT = 180
+# Width of a price bucket (relative) and of a distance-from-ATH bucket (percentage points).
+PRICE_BUCKET = 0.02
+ATH_BUCKET = 5
+
+
+class AIError(Exception):
+    """A chunk's CLI call failed; the message stands in for each ticker's verdict."""
+
+
+def assessment_key(stock: Stock, today: date | None = None) -> str:
+    """Cache key for a stock's verdict: same day, price within ~2%, same ATH bucket and rating."""
+    price_bucket = math.floor(math.log(stock.price) / math.log1p(PRICE_BUCKET)) if stock.price > 0 else 0
+    ath_bucket = math.floor(stock.pct_from_ath / ATH_BUCKET)
+
+    return f"{(today or date.today()).isoformat()}|{price_bucket}|{ath_bucket}|{stock.rating}"
+
+
+def build_prompt(stocks: list[Stock]) -> str:
+    stock_summaries = []
+    for s in stocks:
+        fv_part = f", analyst FV ${s.fair_value:.0f} ({s.upside:+.0f}%)" if s.fair_value else ""
+        rating_part = f", rating {s.rating.upper()}" if s.rating else ""
+        summary = (
+            f"{s.ticker} ({s.name}): "
+            f"Price ${s.price:.0f}, ATH ${s.ath:.0f} ({s.pct_from_ath:+.1f}%), "
+            f"1d change {s.change_1d:+.1f}%, streak {s.streak} days, 30d return {s.roc_30d:+.1f}%"
+            f"{fv_part}{rating_part}"
+        )
+        stock_summaries.append(summary)
+
+    return f"""You are a direct stock analyst. Search for latest news on these stocks, then give a ONE LINE verdict (max 100 chars).
+
+RULES:
+- Start with BUY, WAIT, or PASS
+- State the KEY catalyst or risk in plain English
+- NO URLs, links, or markdown formatting
+- NO vague statements - be specific about WHY
+
+GOOD examples:
+"BUY - Cloud revenue up 40% YoY, AI integrations driving enterprise deals"
+"PASS - Payroll processing facing AI automation threat; defensive but no growth catalyst"
+"WAIT - Strong earnings but China exposure risk with new tariffs pending"
+
+BAD examples (never do this):
+"BUY - [Link](url) shows strong performance"
+"WAIT - Stock is volatile"
+"PASS - Concerns about outlook"
+
+Stocks:
+{chr(10).join(stock_summaries)}
+
+Format: TICKER: [BUY/WAIT/PASS] - specific catalyst or risk"""
+
+
+def parse_assessments(text: str, stocks: list[Stock]) -> dict[str, str]:
+    assessments = {}
+    tickers = [s.ticker.upper() for s in stocks]
+
+    for line in text.strip().split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+
+        for ticker in tickers:
+            if ticker in line.upper():
+                idx = line.upper().find(ticker)
+                assessment = line[idx + len(ticker):].lstrip(":*-() ").strip()
+                if assessment and len(assessment) > 5:
+                    assessments[ticker] = assessment[:120]
+                break
+
+    return assessments
+
+
+def ask_ai(stocks: list[Stock], timeout: float = AI_TIMEOUT) -> dict[str, str]:
+    """Verdicts for stocks from one CLI call; raises AIError if the call fails."""
+    try:
+        result = subprocess.run(
+            ["claude", "-p", build_prompt(stocks), "--model", "sonnet", "--allowedTools", "mcp__fetch__fetch,WebSearch"],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except FileNotFoundError:
+        raise AIError("claude CLI not found") from None
+    except subprocess.TimeoutExpired:
+        raise AIError("AI request timed out") from None
+    except Exception as e:
+        raise AIError(f"AI error: {str(e)[:40]}") from e
+
+    if result.returncode != 0:
+        raise AIError(f"CLI error: {result.stderr[:40]}")
+
+    text = result.stdout
+    assessments = parse_assessments(text, stocks)
+    if not assessments and text.strip():
+        first_line = text.strip().split("\n")[0][:60]
+        raise AIError(f"Parse failed. Raw: {first_line}...")
+
+    return assessments
+
+
+class Assessor:
+    """Runs AI assessments in the background.
+
+    start() answers from the cache straight away and submits the remaining stocks
+    in chunks of chunk_size to a pool of workers; wait() blocks until they land.
+    Only verdicts from successful calls are cached, so failures are retried on
+    the next scan.
+    """
+
+    def __init__(
+        self,
+        cache: AssessmentCache | None = None,
+        chunk_size: int = AI_CHUNK_SIZE,
+        workers: int = AI_WORKERS,
+        timeout: float = AI_TIMEOUT,
+    ):
+        self.cache = cache or AssessmentCache()
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.timeout = timeout
+        self.pending: list[Stock] = []
+        self._keys: dict[str, str] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self._futures: list[Future] = []
+
+    def start(self, stocks: list[Stock]) -> dict[str, str]:
+        """Cached verdicts for stocks; the rest are queried in the background."""
+        cached = {}
+        for stock in stocks:
+            key = assessment_key(stock)
+            verdict = self.cache.get(stock.ticker, key)
+            if verdict is None:
+                self._keys[stock.ticker] = key
+                self.pending.append(stock)
+            else:
+                cached[stock.ticker] = verdict
+
+        if self.pending:
+            chunks = [self.pending[i:i + self.chunk_size] for i in range(0, len(self.pending), self.chunk_size)]
+            self._executor = ThreadPoolExecutor(max_workers=min(self.workers, len(chunks)))
+            self._futures = [self._executor.submit(self._assess, chunk) for chunk in chunks]
+
+        return cached
+
+    def _assess(self, chunk: list[Stock]) -> dict[str, str]:
+        try:
+            verdicts = ask_ai(chunk, self.timeout)
+        except AIError as e:
+            return {s.ticker: str(e) for s in chunk}
+
+        for stock in chunk:
+            if stock.ticker in verdicts:
+                self.cache.put(stock.ticker, self._keys[stock.ticker], verdicts[stock.ticker])
+
+        return verdicts
+
+    def wait(self) -> dict[str, str]:
+        """Verdicts for the stocks start() could not answer from the cache."""
+        verdicts = {}
+        if self._executor is None:
+            return verdicts
+
+        try:
+            for future in self._futures:
+                verdicts.update(future.result())
+        finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self.cache.save()
+
+        return verdicts
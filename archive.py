@@ -0,0 +1,246 @@
+"""
+Historical scan archive.
+
+Every scan is appended to a SQLite database with one row per (run, ticker),
+holding all Stock fields plus the ticker's rank in each section it appeared in.
+Sections of custom screens (screens.json) are kept in custom_ranks, one row per
+(run, section, rank), and each run lists its custom sections, empty ones included.
+Runs are indexed by timestamp and rows by ticker, so time-range and per-ticker
+questions ("how long has NVDA been on the watchlist?") are single indexed
+queries instead of a parse of every scan file.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import sqlite3
+from dataclasses import MISSING, asdict, fields
+from pathlib import Path
+from typing import Iterable
+
+from results import SECTIONS, ScanResult, Stock, load_results, stock_values
+
+ARCHIVE_PATH = Path("data") / "archive.sqlite"
+STOCK_FIELDS = [f.name for f in fields(Stock)]
+FLOAT_FIELDS = {f.name for f in fields(Stock) if str(f.type) == "float"}
+REQUIRED_FIELDS = {f.name for f in fields(Stock) if f.default is MISSING}
+SQL_TYPES = {"str": "TEXT", "float": "REAL", "int": "INTEGER", "bool": "INTEGER"}
+# Upper bound for timestamp prefix ranges: sorts after any ISO timestamp character.
+PREFIX_END = "\uffff"
+
+
+class Archive:
+    """Append-only store of scan results.
+
+    Each ticker's row records its rank (0-based position) in every section it was
+    listed in, NULL elsewhere, so sections can be rebuilt in their original order.
+    """
+
+    def __init__(self, path: Path = ARCHIVE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self._create()
+
+    def _create(self) -> None:
+        stock_columns = ", ".join(f"{f.name} {SQL_TYPES[str(f.type)]}" for f in fields(Stock) if f.name != "ticker")
+        section_columns = ", ".join(f"{section}_rank INTEGER" for section in SECTIONS)
+        self.db.executescript(f"""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY,
+                timestamp TEXT NOT NULL UNIQUE,
+                qqq_30d_return REAL,
+                total_stocks INTEGER,
+                fields TEXT,
+                custom TEXT
+            );
+            CREATE TABLE IF NOT EXISTS stocks (
+                run_id INTEGER NOT NULL REFERENCES runs(id),
+                ticker TEXT NOT NULL,
+                {stock_columns},
+                {section_columns},
+                PRIMARY KEY (run_id, ticker)
+            );
+            CREATE INDEX IF NOT EXISTS stocks_ticker ON stocks(ticker, run_id);
+            CREATE TABLE IF NOT EXISTS custom_ranks (
+                run_id INTEGER NOT NULL REFERENCES runs(id),
+                section TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                ticker TEXT NOT NULL,
+                PRIMARY KEY (run_id, section, rank)
+            );
+            CREATE INDEX IF NOT EXISTS custom_ranks_ticker ON custom_ranks(ticker, run_id);
+        """)
+        run_columns = {row["name"] for row in self.db.execute("PRAGMA table_info(runs)")}
+        for column in ("fields", "custom"):
+            if column not in run_columns:
+                self.db.execute(f"ALTER TABLE runs ADD COLUMN {column} TEXT")
+        # Stock fields added since the archive was created become new (NULL for old runs) columns.
+        existing = {row["name"] for row in self.db.execute("PRAGMA table_info(stocks)")}
+        for f in fields(Stock):
+            if f.name not in existing:
+                self.db.execute(f"ALTER TABLE stocks ADD COLUMN {f.name} {SQL_TYPES[str(f.type)]}")
+
+    def close(self) -> None:
+        self.db.close()
+
+    def add(self, result: ScanResult) -> int | None:
+        """Archive a scan; returns its run id, or None if a run with its timestamp is already stored."""
+        rows: dict[str, dict] = {}
+        for section in SECTIONS:
+            for rank, stock in enumerate(getattr(result, section)):
+                row = rows.setdefault(stock.ticker, stock_values(stock))
+                row[f"{section}_rank"] = rank
+        for section in result.custom.values():
+            for stock in section:
+                rows.setdefault(stock.ticker, stock_values(stock))
+
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT OR IGNORE INTO runs (timestamp, qqq_30d_return, total_stocks, fields, custom) VALUES (?, ?, ?, ?, ?)",
+                (
+                    result.timestamp, float(result.qqq_30d_return), int(result.total_stocks),
+                    ",".join(STOCK_FIELDS), json.dumps(list(result.custom)),
+                ),
+            )
+            if not cursor.rowcount:
+                return None
+
+            run_id = cursor.lastrowid
+            columns = ["run_id", *STOCK_FIELDS, *(f"{section}_rank" for section in SECTIONS)]
+            self.db.executemany(
+                f"INSERT INTO stocks ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [[run_id, *(_sql_value(row.get(c)) for c in columns[1:])] for row in rows.values()],
+            )
+            self.db.executemany(
+                "INSERT INTO custom_ranks (run_id, section, rank, ticker) VALUES (?, ?, ?, ?)",
+                [
+                    (run_id, name, rank, stock.ticker)
+                    for name, section in result.custom.items() for rank, stock in enumerate(section)
+                ],
+            )
+
+        return run_id
+
+    def import_files(self, paths: Iterable[Path]) -> int:
+        """Archive scan JSON files not already stored; returns how many were added."""
+        added = 0
+        for path in sorted(paths):
+            try:
+                result = load_results(path)
+            except (OSError, json.JSONDecodeError, KeyError, TypeError):
+                continue
+            if self.add(result) is not None:
+                added += 1
+
+        return added
+
+    def runs(self, start: str | None = None, end: str | None = None) -> list[dict]:
+        """Runs with start <= timestamp < end (ISO strings or prefixes), oldest first."""
+        rows = self.db.execute(
+            "SELECT * FROM runs WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+            (start or "", end or PREFIX_END),
+        )
+
+        return [dict(row) for row in rows]
+
+    def find(self, when: str) -> int | None:
+        """Id of the latest run whose timestamp starts with when, e.g. "2026-02-04" or "2026-02-04T16"."""
+        row = self.db.execute(
+            "SELECT id FROM runs WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp DESC LIMIT 1",
+            (when, when + PREFIX_END),
+        ).fetchone()
+
+        return row["id"] if row else None
+
+    def previous(self, run_id: int) -> int | None:
+        """Id of the run archived just before run_id."""
+        row = self.db.execute(
+            "SELECT id FROM runs WHERE timestamp < (SELECT timestamp FROM runs WHERE id = ?) ORDER BY timestamp DESC LIMIT 1",
+            (run_id,),
+        ).fetchone()
+
+        return row["id"] if row else None
+
+    def load(self, run_id: int) -> ScanResult:
+        run = self.db.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if run is None:
+            raise KeyError(run_id)
+
+        sections: dict[str, list[tuple[int, Stock]]] = {section: [] for section in SECTIONS}
+        run_fields = _run_fields(run["fields"])
+        stocks = {}
+        for row in self.db.execute("SELECT * FROM stocks WHERE run_id = ?", (run_id,)):
+            stock = stocks[row["ticker"]] = _stock(row, run_fields)
+            for section in SECTIONS:
+                rank = row[f"{section}_rank"]
+                if rank is not None:
+                    sections[section].append((rank, stock))
+
+        # Runs archived before custom sections were recorded load without them.
+        custom: dict[str, list[Stock]] = {name: [] for name in json.loads(run["custom"] or "[]")}
+        for row in self.db.execute("SELECT section, ticker FROM custom_ranks WHERE run_id = ? ORDER BY section, rank", (run_id,)):
+            custom[row["section"]].append(stocks[row["ticker"]])
+
+        return ScanResult(
+            timestamp=run["timestamp"],
+            qqq_30d_return=run["qqq_30d_return"],
+            total_stocks=run["total_stocks"],
+            **{section: [stock for _, stock in sorted(ranked, key=lambda x: x[0])] for section, ranked in sections.items()},
+            custom=custom,
+        )
+
+    def history(self, ticker: str, start: str | None = None, end: str | None = None) -> list[dict]:
+        """Every archived row for ticker in the time range, oldest first, with its run timestamp and sections."""
+        rows = self.db.execute(
+            """
+            SELECT runs.timestamp, runs.fields AS run_fields, runs.custom AS run_custom,
+                (SELECT json_group_array(section) FROM custom_ranks
+                 WHERE custom_ranks.run_id = stocks.run_id AND custom_ranks.ticker = stocks.ticker) AS custom_sections,
+                stocks.*
+            FROM stocks JOIN runs ON runs.id = stocks.run_id
+            WHERE stocks.ticker = ? AND runs.timestamp >= ? AND runs.timestamp < ?
+            ORDER BY runs.timestamp
+            """,
+            (ticker, start or "", end or PREFIX_END),
+        )
+
+        history = []
+        for row in rows:
+            record = {"timestamp": row["timestamp"], **asdict(_stock(row, _run_fields(row["run_fields"])))}
+            listed = set(json.loads(row["custom_sections"]))
+            record["sections"] = [section for section in SECTIONS if row[f"{section}_rank"] is not None] + [
+                name for name in json.loads(row["run_custom"] or "[]") if name in listed
+            ]
+            history.append(record)
+
+        return history
+
+
+def _sql_value(value):
+    # numpy scalars from a live scan are not sqlite-adaptable; item() unwraps them.
+    return value.item() if hasattr(value, "item") else value
+
+
+def _run_fields(value: str | None) -> set[str]:
+    # Runs archived before the field list was recorded had at least every required field.
+    return set(value.split(",")) if value else REQUIRED_FIELDS
+
+
+def _stock(row: sqlite3.Row, run_fields: set[str]) -> Stock:
+    # SQLite stores NaN as NULL, so a NULL float the run archived is NaN. Columns
+    # added after the run was archived are NULL too; those fields keep their defaults.
+    values = {}
+    for name in STOCK_FIELDS:
+        value = row[name]
+        if value is None:
+            if name not in run_fields or name not in FLOAT_FIELDS:
+                continue
+            value = math.nan
+        values[name] = value
+    stock = Stock(**values)
+    stock.is_52w_high = bool(stock.is_52w_high)
+
+    return stock
@@ -0,0 +1,122 @@
+"""
+All-time-high index.
+
+The scan only keeps a year of bars per ticker, so their max is the 52-week
+high, not the all-time high. AthIndex keeps each ticker's all-time-high close
+in a JSON file instead:
+
+    {ticker: {"ath": close, "date": last applied bar (ISO), "close": its close}}
+
+A ticker is seeded once from its full history (one batched period="max"
+request for all new tickers). Each later run folds in the bars since the last
+applied one, so it needs no extra network requests.
+
+The last applied bar doubles as an anchor for split and dividend adjustment.
+When the provider re-adjusts a series, that bar's close changes by the
+adjustment factor, and every earlier close (the all-time high included) changes
+by the same factor. The stored high is rescaled by that factor instead of being
+refetched. A ticker whose anchor bar is no longer in its window (unscanned for
+over a year) is reseeded.
+
+Like IndicatorStore, the index stops one bar short of the latest (possibly
+partial) bar. build_stocks takes the max of the stored high and the window's
+high, which includes the latest bar.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from providers import DataProvider
+from store import ADJUSTMENT_TOLERANCE, CACHE_DIR, normalize_bars, write_json_atomic
+
+
+class AthIndex:
+    """Persistent per-ticker all-time-high closes, split-adjusted and updated from each run's new bars."""
+
+    def __init__(self, path: Path = CACHE_DIR / "ath.json"):
+        self.path = Path(path)
+        self.entries: dict[str, dict] = {}
+        self.seeded = 0
+        self.updated = 0
+        self.adjusted = 0
+        self._dirty = False
+
+        if self.path.exists():
+            with open(self.path) as f:
+                self.entries = json.load(f)
+
+    def get(self, ticker: str) -> float:
+        """ticker's stored all-time-high close, NaN if it has none."""
+        entry = self.entries.get(ticker)
+
+        return entry["ath"] if entry else np.nan
+
+    def highs(self, tickers: list[str]) -> np.ndarray:
+        return np.array([self.get(ticker) for ticker in tickers], dtype="float64")
+
+    def refresh(self, histories: dict[str, pd.DataFrame], provider: DataProvider) -> None:
+        """Fold each ticker's new bars into its high; tickers without a usable entry are seeded from full history."""
+        seed = [ticker for ticker, bars in histories.items() if not bars.empty and not self.update(ticker, bars)]
+        if not seed:
+            return
+
+        for ticker, bars in provider.history(seed, period="max").items():
+            self.seed(ticker, normalize_bars(bars))
+
+    def seed(self, ticker: str, bars: pd.DataFrame) -> None:
+        """Start ticker's entry from its full history."""
+        settled = len(bars) - 1
+        if settled < 1:
+            return
+
+        closes = bars["Close"].to_numpy(dtype="float64")[:settled]
+        self.entries[ticker] = {
+            "ath": float(np.nanmax(closes)),
+            "date": bars.index[settled - 1].date().isoformat(),
+            "close": float(closes[-1]),
+        }
+        self.seeded += 1
+        self._dirty = True
+
+    def update(self, ticker: str, bars: pd.DataFrame) -> bool:
+        """Apply the bars after ticker's anchor; False if ticker needs seeding."""
+        entry = self.entries.get(ticker)
+        if entry is None:
+            return False
+
+        settled = len(bars) - 1
+        dates = bars.index[:settled].to_numpy(dtype="datetime64[D]")
+        position = int(dates.searchsorted(np.datetime64(entry["date"])))
+        if position >= settled or str(dates[position]) != entry["date"]:
+            return False
+
+        closes = bars["Close"].to_numpy(dtype="float64")[:settled]
+        anchor = closes[position]
+        if abs(anchor - entry["close"]) > ADJUSTMENT_TOLERANCE * abs(entry["close"]):
+            # The series was re-adjusted (split, dividend): the high moved by the same factor.
+            entry["ath"] *= anchor / entry["close"]
+            entry["close"] = float(anchor)
+            self.adjusted += 1
+            self._dirty = True
+
+        new = closes[position + 1:]
+        if new.size:
+            entry["ath"] = float(max(entry["ath"], np.nanmax(new)))
+            entry["date"] = str(dates[-1])
+            entry["close"] = float(new[-1])
+            self.updated += 1
+            self._dirty = True
+
+        return True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+
+        write_json_atomic(self.path, self.entries)
+        self._dirty = False
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the scan pipeline.
+
+Generates synthetic price histories and fundamentals for universes of several
+sizes and times the pipeline's hot spots against them, with no network access.
+Results are written as JSON so runs can be compared against a saved baseline:
+
+    python bench.py --output baseline.json
+    python bench.py --compare baseline.json --threshold 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+from rich.console import Console
+
+import render
+import scanner
+from incremental import IndicatorStore
+from indicators import compute_indicators
+from providers import LocalProvider
+from results import ScanResult, Stock, load_results
+from store import BarStore
+from table import StockTable
+
+DEFAULT_SIZES = [500, 5_000, 50_000]
+BARS = 252
+# Per-ticker functions are timed on a sample and extrapolated to the full universe.
+SAMPLE_SIZE = 200
+# Wall time allowed for a fresh interpreter to `import scan` (the render-only path);
+# importing the pipeline and its data stack takes about 0.9s.
+STARTUP_BUDGET = 0.25
+
+
+def synthetic_panel(size: int, bars: int = BARS, seed: int = 0) -> tuple[pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=bars)
+    tickers = [f"S{i:05d}" for i in range(size)]
+    close = 50 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, (bars, size)), axis=0))
+    volume = rng.lognormal(14, 0.5, (bars, size)).round()
+
+    return pd.DataFrame(close, index=index, columns=tickers), pd.DataFrame(volume, index=index, columns=tickers)
+
+
+def synthetic_provider(close: pd.DataFrame, volume: pd.DataFrame) -> LocalProvider:
+    infos = {}
+    bars = {}
+    for ticker in close.columns:
+        c = close[ticker]
+        bars[ticker] = pd.DataFrame({"Open": c, "High": c * 1.01, "Low": c * 0.99, "Close": c, "Volume": volume[ticker]})
+        infos[ticker] = {
+            "sector": "Technology",
+            "shortName": f"{ticker} Corp",
+            "marketCap": 10_000_000_000,
+            "averageVolume": 2_000_000,
+            "currentPrice": float(c.iloc[-1]),
+            "targetMeanPrice": float(c.iloc[-1]) * 1.15,
+            "recommendationKey": "buy",
+        }
+
+    return LocalProvider(infos, bars)
+
+
+def synthetic_stocks(size: int, seed: int = 0) -> list[Stock]:
+    rng = random.Random(seed)
+    stocks = []
+    for i in range(size):
+        price = rng.uniform(10, 500)
+        ath = price * rng.uniform(1.0, 2.5)
+        rsi = rng.uniform(10, 90)
+        stocks.append(Stock(
+            ticker=f"S{i:05d}",
+            name=f"Synthetic {i} Corp",
+            price=price,
+            ath=ath,
+            market_cap=rng.uniform(2e9, 2e12),
+            sector="Technology",
+            pct_from_ath=(price - ath) / ath * 100,
+            change_1d=rng.gauss(0, 3),
+            streak=rng.randint(-7, 7),
+            rsi=rsi,
+            roc_30d=rng.gauss(0, 12),
+            rs_vs_qqq=rng.gauss(0, 10),
+            vol_surge=rng.uniform(0.3, 3),
+            pct_vs_50dma=rng.gauss(0, 8),
+            is_52w_high=rng.random() < 0.05,
+            signal=scanner.rsi_signal_plain(rsi),
+            ai_assessment="WAIT - synthetic catalyst" if rng.random() < 0.1 else "",
+            fair_value=price * rng.uniform(0.8, 1.5),
+            upside=rng.uniform(-20, 50),
+            rating=rng.choice(["buy", "hold", "strong_buy", ""]),
+            fv_vs_ath=rng.uniform(-50, 20),
+        ))
+
+    return stocks
+
+
+def timed(fn: Callable[[], object], repeat: int = 3) -> float:
+    """Best wall time of `repeat` runs, like timeit."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def per_call(fn: Callable[[object], object], args: list, size: int) -> dict:
+    """Time fn over a sample of args and extrapolate to size calls."""
+    seconds = timed(lambda: [fn(a) for a in args], repeat=1)
+    mean = seconds / len(args)
+
+    return {"seconds": mean * size, "per_call": mean, "sampled": len(args)}
+
+
+def render_all(result: ScanResult) -> None:
+    original = render.console
+    render.console = Console(file=io.StringIO(), width=180, force_terminal=True)
+    try:
+        render.render(result)
+    finally:
+        render.console = original
+
+
+def bench_size(size: int, repeat: int = 3) -> dict:
+    results = {}
+    close, volume = synthetic_panel(size)
+    sample = list(close.columns[:min(size, SAMPLE_SIZE)])
+    series = [close[t].reset_index(drop=True) for t in sample]
+
+    results["calculate_rsi"] = per_call(scanner.calculate_rsi, series, size)
+    results["calculate_streak"] = per_call(scanner.calculate_streak, series, size)
+    results["compute_indicators"] = {"seconds": timed(lambda: compute_indicators(close, volume), repeat)}
+
+    # One new bar per ticker against state persisted through the previous one.
+    histories = {t: pd.DataFrame({"Close": close[t], "Volume": volume[t]}) for t in sample}
+    with tempfile.TemporaryDirectory() as tmp:
+        state = IndicatorStore(Path(tmp) / "indicators.json")
+        state.compute({t: bars.iloc[:-2] for t, bars in histories.items()})
+        results["indicator_update"] = per_call(lambda t: state.advance(t, histories[t]), sample, size)
+
+    provider = synthetic_provider(close[sample], volume[sample])
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BarStore(Path(tmp) / "bars")
+        store.sync(sample, provider)
+        results["analyze_stock"] = per_call(lambda t: scanner.analyze_stock(t, 0.0, provider, store), sample, size)
+
+    # The scan categorizes the StockTable build_stocks returns.
+    stocks = StockTable.from_stocks(synthetic_stocks(size))
+    results["categorize"] = {"seconds": timed(lambda: scanner.categorize(stocks, 1.0), repeat)}
+    result = scanner.categorize(stocks, 1.0)
+
+    columns = [("Ticker", 6), ("Name", 18), ("Price", 7), ("ATH", 7), ("%ATH", 8), ("1d%", 8), ("30d%", 8), ("Streak", 6),
+               ("FV", 7), ("%FV", 5), ("FV%ATH", 6), ("Rating", 6), ("RSI", 4), ("Signal", 6), ("Vol", 5), ("52wH", 4)]
+    results["build_row"] = per_call(lambda s: render.build_row(s, columns), stocks[:SAMPLE_SIZE * 5], size)
+    results["render"] = {"seconds": timed(lambda: render_all(result), repeat)}
+    results["render_ndjson"] = {"seconds": timed(lambda: render.write_sections(result, "ndjson", out=io.StringIO()), repeat)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, _ = scanner.save_results(result, Path(tmp))
+        results["save_results"] = {"seconds": timed(lambda: scanner.save_results(result, Path(tmp)), repeat)}
+        results["load_results"] = {"seconds": timed(lambda: load_results(json_path), repeat)}
+        results["scan_file_bytes"] = {"bytes": json_path.stat().st_size}
+
+    return results
+
+
+def bench_startup(repeat: int = 3) -> dict:
+    """Time the render-only path in a fresh interpreter: `import scan`, and a full `scan.py --load`."""
+    root = Path(__file__).parent
+
+    def run(*args: str) -> float:
+        return timed(lambda: subprocess.run([sys.executable, *args], cwd=root, stdout=subprocess.DEVNULL, check=True), repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # About the size of a real scan.
+        json_path, _ = scanner.save_results(scanner.categorize(synthetic_stocks(160), 1.0), Path(tmp))
+        load_seconds = run("scan.py", "--load", str(json_path))
+
+    return {"seconds": run("-c", "import scan"), "budget": STARTUP_BUDGET, "load_seconds": load_seconds}
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Benchmarks that got more than threshold (a fraction) slower than the baseline."""
+    regressions = []
+    for size, benches in current["results"].items():
+        for name, stats in benches.items():
+            before = baseline.get("results", {}).get(size, {}).get(name, {}).get("seconds")
+            if before and "seconds" in stats and stats["seconds"] > before * (1 + threshold):
+                regressions.append(f"{name} @ {size}: {before:.4f}s -> {stats['seconds']:.4f}s (+{(stats['seconds'] / before - 1) * 100:.0f}%)")
+
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline scan pipeline benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Universe sizes to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per whole-universe benchmark (best is kept)")
+    parser.add_argument("--output", "-o", type=str, metavar="FILE", help="Write results JSON here")
+    parser.add_argument("--compare", type=str, metavar="FILE", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    current = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+        },
+        "results": {},
+    }
+
+    current["startup"] = bench_startup(args.repeat)
+    startup = current["startup"]
+    print(f"Render-only import: {startup['seconds'] * 1000:.0f} ms (budget {STARTUP_BUDGET * 1000:.0f} ms), "
+          f"--load: {startup['load_seconds'] * 1000:.0f} ms", file=sys.stderr)
+
+    for size in args.sizes:
+        print(f"Benchmarking {size:,} tickers...", file=sys.stderr)
+        current["results"][str(size)] = bench_size(size, args.repeat)
+        for name, stats in current["results"][str(size)].items():
+            if "seconds" in stats:
+                print(f"  {name:<20} {stats['seconds'] * 1000:>12.1f} ms", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    else:
+        json.dump(current, sys.stdout, indent=2)
+        print()
+
+    over_budget = current["startup"]["seconds"] > STARTUP_BUDGET
+    if over_budget:
+        print("REGRESSION render-only startup is over budget", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
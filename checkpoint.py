@@ -0,0 +1,81 @@
+"""
+Run-scoped scan checkpoints.
+
+Every ticker the fundamentals phase finishes is appended to a JSONL file as soon
+as it completes, so an interrupted or crashed scan can be resumed without
+refetching what it already has.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+
+CHECKPOINT_DIR = Path("data") / "checkpoints"
+# Checkpoint file names are run_<YYYYmmdd_HHMMSS><label>.jsonl.
+STAMP_LENGTH = len("run_20260101_000000")
+
+
+def run_label(shard: tuple[int, int] | None) -> str:
+    """Label of a run's checkpoint file: each shard's is its own, a full scan's is empty."""
+    return f"_shard{shard[0]}of{shard[1]}" if shard else ""
+
+
+class Checkpoint:
+    """Append-only log of {"ticker", "status", "info"} records for one scan run.
+
+    status is "ok" (passed the filters, info holds the fields the scan uses),
+    "rejected" or "failed". Failed tickers are retried on resume. The file is
+    removed once the run's results are saved.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.records: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash mid-write can leave a truncated last line.
+                        continue
+                    self.records[record["ticker"]] = record
+
+    @classmethod
+    def create(cls, directory: Path = CHECKPOINT_DIR, label: str = "") -> Checkpoint:
+        directory.mkdir(parents=True, exist_ok=True)
+
+        return cls(directory / f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}{label}.jsonl")
+
+    @classmethod
+    def latest(cls, directory: Path = CHECKPOINT_DIR, label: str = "") -> Checkpoint | None:
+        """The newest checkpoint of runs with label (see run_label), so a full scan never resumes a shard's."""
+        paths = [p for p in sorted(directory.glob("run_*.jsonl"), reverse=True) if p.stem[STAMP_LENGTH:] == label]
+
+        return cls(paths[0]) if paths else None
+
+    def append(self, ticker: str, status: str, info: dict | None = None) -> None:
+        record = {"ticker": ticker, "status": status, "info": info}
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            self.records[ticker] = record
+            with open(self.path, "a") as f:
+                f.write(line)
+
+    def done(self) -> set[str]:
+        """Tickers a resumed run skips: those that passed or were rejected."""
+        return {t for t, r in self.records.items() if r["status"] != "failed"}
+
+    def failed(self) -> set[str]:
+        return {t for t, r in self.records.items() if r["status"] == "failed"}
+
+    def infos(self) -> dict[str, dict]:
+        return {t: r["info"] for t, r in self.records.items() if r["status"] == "ok"}
+
+    def remove(self) -> None:
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,49 @@
+import type { ScanResult, Stock, TabKey } from "@/lib/types";
+
+const SECTIONS: TabKey[] = [
+	"watchlist",
+	"big_drops",
+	"big_gains",
+	"down_streaks",
+	"up_streaks",
+	"parabolic",
+];
+
+type ScanFileV2 = {
+	version: 2;
+	timestamp: string;
+	qqq_30d_return: number;
+	total_stocks: number;
+	columns: string[];
+	stocks: Record<string, unknown[]>;
+	sections: Partial<Record<TabKey, string[]>>;
+};
+
+// Version 2 scan files store each stock once in a ticker-keyed table and
+// sections as ticker lists; version 1 files repeat stock objects per section.
+export const normalizeScan = (raw: ScanResult | ScanFileV2): ScanResult => {
+	if (!("version" in raw) || raw.version < 2) return raw as ScanResult;
+
+	const stocks: Record<string, Stock> = {};
+	for (const [ticker, row] of Object.entries(raw.stocks)) {
+		const stock: Record<string, unknown> = { ticker };
+		raw.columns.forEach((column, i) => {
+			stock[column] = row[i];
+		});
+		stocks[ticker] = stock as Stock;
+	}
+
+	const sections = Object.fromEntries(
+		SECTIONS.map((section) => [
+			section,
+			(raw.sections[section] ?? []).map((ticker) => stocks[ticker]),
+		]),
+	) as Record<TabKey, Stock[]>;
+
+	return {
+		timestamp: raw.timestamp,
+		qqq_30d_return: raw.qqq_30d_return,
+		total_stocks: raw.total_stocks,
+		...sections,
+	};
+};
@@ -0,0 +1,189 @@
+"""
+Scan-to-scan diffs.
+
+Compares two scans and reports what changed as events:
+
+    entered / left   a ticker joined or dropped out of a section
+    rsi_cross        a ticker's RSI crossed 30 or 70 (level); before/after are the RSIs
+    ai_flip          a ticker's AI verdict changed, e.g. WAIT -> BUY; before/after are the verdicts
+
+Each scan is indexed once by ticker (its stock and the set of sections it is
+in), so the diff is a set comparison per ticker rather than a search of one
+scan's sections for every stock of the other. Scans only hold their section
+members, so RSI and AI events cover tickers listed in both scans.
+
+Entered/left events cover the sections both scans have: a custom screen added
+to screens.json between them, or missing from a run archived before custom
+sections were, is not reported as every ticker entering or leaving it.
+
+Archived runs are loaded by id with indexed queries, so diffing the latest run
+against its predecessor costs the same with five archived runs or five hundred.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import math
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Any, NamedTuple
+
+from rich.table import Table
+
+from archive import Archive
+from render import console
+from results import ScanResult, Stock, load_results
+from screens import load_screens
+
+KINDS = ("entered", "left", "rsi_cross", "ai_flip")
+RSI_LEVELS = (30, 70)
+VERDICTS = ("BUY", "SELL", "WAIT", "PASS")
+
+
+@dataclass(frozen=True)
+class Event:
+    kind: str
+    ticker: str
+    section: str = ""
+    level: int | None = None
+    before: Any = None
+    after: Any = None
+
+
+class Listing(NamedTuple):
+    stock: Stock
+    sections: frozenset[str]
+
+
+def index(result: ScanResult) -> dict[str, Listing]:
+    """Each ticker of a scan with its stock (as first listed) and the sections it is in."""
+    stocks: dict[str, Stock] = {}
+    sections: dict[str, set[str]] = {}
+    for section, listed in result.sections().items():
+        for stock in listed:
+            stocks.setdefault(stock.ticker, stock)
+            sections.setdefault(stock.ticker, set()).add(section)
+
+    return {ticker: Listing(stock, frozenset(sections[ticker])) for ticker, stock in stocks.items()}
+
+
+def verdict(ai_assessment: str) -> str:
+    """The verdict word an AI assessment starts with, or ""."""
+    upper = ai_assessment.upper()
+
+    return next((word for word in VERDICTS if upper.startswith(word)), "")
+
+
+def diff(old: ScanResult, new: ScanResult) -> list[Event]:
+    """Events from old to new, by kind, then section order, then ticker."""
+    before, after = index(old), index(new)
+    shared = old.sections().keys() & new.sections().keys()
+    order = {section: i for i, section in enumerate(new.sections()) if section in shared}
+
+    events = []
+    for ticker in before.keys() | after.keys():
+        was, now = before.get(ticker), after.get(ticker)
+        was_in = was.sections & shared if was else frozenset()
+        now_in = now.sections & shared if now else frozenset()
+        events += [Event("entered", ticker, section) for section in now_in - was_in]
+        events += [Event("left", ticker, section) for section in was_in - now_in]
+        if not (was and now):
+            continue
+
+        rsi_before, rsi_after = was.stock.rsi, now.stock.rsi
+        if not (math.isnan(rsi_before) or math.isnan(rsi_after)):
+            for level in RSI_LEVELS:
+                if (rsi_before < level) != (rsi_after < level):
+                    events.append(Event("rsi_cross", ticker, level=level, before=round(rsi_before, 1), after=round(rsi_after, 1)))
+
+        verdict_before, verdict_after = verdict(was.stock.ai_assessment), verdict(now.stock.ai_assessment)
+        if verdict_before and verdict_after and verdict_before != verdict_after:
+            events.append(Event("ai_flip", ticker, before=verdict_before, after=verdict_after))
+
+    return sorted(events, key=lambda e: (KINDS.index(e.kind), order.get(e.section, -1), e.level or 0, e.ticker))
+
+
+def scans_to_compare(specs: list[str], archive: Archive, data_dir: Path = Path("data")) -> tuple[ScanResult, ScanResult]:
+    """The (old, new) scans for --diff: two given scans, or one (default the latest) and the scan before it.
+
+    A scan is a scan file path or an archived run's timestamp prefix. Before
+    anything is archived, the latest scan files in data_dir are compared.
+    """
+    if len(specs) == 2:
+        return _resolve(specs[0], archive), _resolve(specs[1], archive)
+
+    spec = specs[0] if specs else ""
+    if spec and Path(spec).exists():
+        path = Path(spec)
+        earlier = [p for p in sorted(path.parent.glob("scan_*.json")) if p.name < path.name]
+        if not earlier:
+            raise LookupError(f"No scan file before {path}")
+        return load_results(earlier[-1]), load_results(path)
+
+    run_id = archive.find(spec)
+    previous = archive.previous(run_id) if run_id is not None else None
+    if previous is not None:
+        return archive.load(previous), archive.load(run_id)
+    if spec:
+        raise LookupError(f"No archived run and predecessor match: {spec}")
+
+    files = sorted(data_dir.glob("scan_*.json"))
+    if len(files) < 2:
+        raise LookupError("Need two scans to compare")
+
+    return load_results(files[-2]), load_results(files[-1])
+
+
+def _resolve(spec: str, archive: Archive) -> ScanResult:
+    if Path(spec).exists():
+        return load_results(Path(spec))
+
+    run_id = archive.find(spec)
+    if run_id is None:
+        raise LookupError(f"No scan file or archived run matches: {spec}")
+
+    return archive.load(run_id)
+
+
+def write_events(events: list[Event], old: ScanResult, new: ScanResult, output_format: str, out: IO[str] | None = None) -> None:
+    """Stream events to out (stdout) as NDJSON or CSV rows, each with the two scans' timestamps."""
+    out = out or sys.stdout
+    header = ["from", "to", *Event.__dataclass_fields__]
+    writer = csv.writer(out, lineterminator="\n")
+    if output_format == "csv":
+        writer.writerow(header)
+
+    for event in events:
+        row = {"from": old.timestamp, "to": new.timestamp, **asdict(event)}
+        if output_format == "csv":
+            writer.writerow(row.values())
+        else:
+            out.write(json.dumps(row, separators=(",", ":")) + "\n")
+
+
+def render_diff(events: list[Event], old: ScanResult, new: ScanResult) -> None:
+    """Compact summary: one line per section that changed, then RSI crosses and AI flips."""
+    console.print(f"[bold white]🔀 DIFF[/bold white] [dim]{old.timestamp[:16]} → {new.timestamp[:16]}[/dim]")
+    if not events:
+        console.print("[dim]  No changes[/dim]")
+        return
+
+    titles = {screen.name: screen.title.split(" - ")[0] for screen in load_screens()}
+    lines: dict[str, list[str]] = {}
+    for event in events:
+        if event.kind == "entered":
+            lines.setdefault(titles.get(event.section, event.section), []).append(f"[green]+{event.ticker}[/green]")
+        elif event.kind == "left":
+            lines.setdefault(titles.get(event.section, event.section), []).append(f"[red]−{event.ticker}[/red]")
+        elif event.kind == "rsi_cross":
+            arrow = "↑" if event.after > event.before else "↓"
+            lines.setdefault("RSI crossed", []).append(f"{event.ticker} {arrow}{event.level} [dim]({event.after})[/dim]")
+        else:
+            lines.setdefault("AI flipped", []).append(f"{event.ticker} [dim]{event.before}→[/dim]{event.after}")
+
+    table = Table(show_header=False, box=None, padding=(0, 1, 0, 2))
+    for label, items in lines.items():
+        table.add_row(label, " ".join(items))
+    console.print(table)
@@ -0,0 +1,191 @@
+"""
+Rate-limit-aware concurrent fetcher.
+
+FetchScheduler runs per-ticker requests through a token bucket and an adaptive
+concurrency limit, retrying throttled and transient failures with exponential
+backoff. Concurrency grows while requests are fast and clean and is cut back on
+throttling or rising latency (additive increase, multiplicative decrease).
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator
+
+from providers import RateLimitError, TransientError
+
+RETRYABLE = (RateLimitError, TransientError, ConnectionError, TimeoutError)
+
+
+@dataclass
+class FetchResult:
+    item: Any
+    value: Any = None
+    error: Exception | None = None
+    attempts: int = 0
+    latency: float = 0.0
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average with bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.clock = clock
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self.clock()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def set_rate(self, rate: float) -> None:
+        with self._lock:
+            self.rate = rate
+
+
+class AdaptiveLimit:
+    """A semaphore whose size moves between minimum and maximum based on feedback."""
+
+    def __init__(self, initial: int, minimum: int, maximum: int):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.active = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.active >= int(self.limit):
+                self._cond.wait()
+            self.active += 1
+
+    def release(self) -> None:
+        with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    def increase(self) -> None:
+        with self._cond:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def decrease(self, factor: float = 0.5) -> None:
+        with self._cond:
+            self.limit = max(self.minimum, self.limit * factor)
+
+
+class FetchScheduler:
+    """Runs fn over items concurrently, yielding a FetchResult per item as it completes.
+
+    Throttling (RateLimitError) halves both the concurrency limit and the request rate,
+    and slow responses trim the limit; successful requests under target_latency grow
+    both back. Retryable errors are retried up to max_retries times with jittered
+    exponential backoff; anything else fails the item straight away. Failures are
+    returned, never silently dropped.
+    """
+
+    def __init__(
+        self,
+        workers: int = 10,
+        min_workers: int = 2,
+        max_workers: int = 32,
+        rate: float = 20.0,
+        max_rate: float = 50.0,
+        min_rate: float = 0.5,
+        max_retries: int = 4,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        target_latency: float = 2.0,
+    ):
+        self.limit = AdaptiveLimit(workers, min_workers, max_workers)
+        self.bucket = TokenBucket(rate, burst=max(1.0, workers))
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.target_latency = target_latency
+        self.stats = {"requests": 0, "retries": 0, "throttled": 0, "failed": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def _throttled(self) -> None:
+        self._count("throttled")
+        self.limit.decrease()
+        with self._lock:
+            self.bucket.set_rate(max(self.min_rate, self.bucket.rate / 2))
+
+    def _succeeded(self, latency: float) -> None:
+        if latency > self.target_latency:
+            self.limit.decrease(0.9)
+            return
+
+        self.limit.increase()
+        with self._lock:
+            self.bucket.set_rate(min(self.max_rate, self.bucket.rate + 0.5))
+
+    def _call(self, fn: Callable[[Any], Any], item: Any) -> FetchResult:
+        result = FetchResult(item)
+        for attempt in range(self.max_retries + 1):
+            result.attempts = attempt + 1
+            self.bucket.acquire()
+            self.limit.acquire()
+            start = time.monotonic()
+            try:
+                self._count("requests")
+                result.value = fn(item)
+                result.latency = time.monotonic() - start
+                self._succeeded(result.latency)
+                result.error = None
+                return result
+            except RETRYABLE as e:
+                result.error = e
+                if isinstance(e, RateLimitError):
+                    self._throttled()
+            except Exception as e:
+                result.error = e
+                break
+            finally:
+                self.limit.release()
+
+            if attempt < self.max_retries:
+                self._count("retries")
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+                time.sleep(delay * random.uniform(0.5, 1.0))
+
+        result.latency = time.monotonic() - start
+        self._count("failed")
+
+        return result
+
+    def run(self, fn: Callable[[Any], Any], items: Iterable[Any]) -> Iterator[FetchResult]:
+        items = list(items)
+        if not items:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=min(self.limit.maximum, len(items)))
+        try:
+            futures = [executor.submit(self._call, fn, item) for item in items]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # On Ctrl-C or an abandoned generator, drop queued items instead of draining them.
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,249 @@
+"""
+Incremental indicator state.
+
+Instead of recomputing every indicator from a year of bars on each run, the
+scanner keeps per-ticker running state between runs: the RSI gain/loss sums,
+the current streak, rolling close and volume sums and a monotonic queue for the
+trailing high. Each new bar updates that state in constant time.
+
+The latest bar of a history may still be today's partial bar, so the persisted
+state stops one bar short of it ("settled"); each run applies the latest bar to
+a copy. A state whose last close no longer matches the stored bars (a split or
+dividend re-adjusted the series) is reseeded from the full history.
+
+verify() checks the state-derived indicators against a full recompute with
+compute_indicators.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from indicators import HIGH_52W_MARGIN, MA_WINDOW, ROC_WINDOW, RSI_PERIOD, VOLUME_WINDOW, compute_indicators, panel_from_histories
+from store import CACHE_DIR, write_json_atomic
+
+# Running sums this close to zero are zero; removing a delta that was added can leave float dust.
+EPSILON = 1e-9
+# Indicator columns compared by verify().
+VERIFY_COLUMNS = ["price", "ath", "pct_from_ath", "change_1d", "streak", "rsi", "roc_30d", "vol_surge", "pct_vs_50dma"]
+
+
+class TickerState:
+    """Everything needed to update one ticker's indicators by a bar in O(1)."""
+
+    def __init__(self):
+        self.date = ""  # last applied bar, ISO date
+        self.closes: deque[float] = deque(maxlen=MA_WINDOW)
+        self.volumes: deque[float] = deque(maxlen=VOLUME_WINDOW)
+        self.close_sum = 0.0
+        self.volume_sum = 0.0
+        self.volume_bars = 0
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        self.streak = 0
+        self.last_return = 0.0
+        # (date, close) pairs with decreasing closes; the first is the trailing high.
+        self.highs: deque[tuple[str, float]] = deque()
+
+    @classmethod
+    def seed(cls, dates: np.ndarray, closes: np.ndarray, volumes: np.ndarray) -> TickerState:
+        state = cls()
+        state.extend(dates, closes, volumes)
+
+        return state
+
+    def extend(self, dates: np.ndarray, closes: np.ndarray, volumes: np.ndarray) -> None:
+        """Apply consecutive bars given as datetime64 dates and float closes and volumes."""
+        days = np.datetime_as_string(dates, unit="D")
+        for day, close, volume in zip(days.tolist(), closes.tolist(), volumes.tolist()):
+            self.update(day, close, volume)
+
+    def update(self, day: str, close: float, volume: float) -> None:
+        """Apply the next bar."""
+        if self.closes:
+            previous = self.closes[-1]
+            delta = close - previous
+            ret = close / previous - 1
+            continues = (ret > 0 and self.last_return > 0) or (ret <= 0 and self.last_return < 0)
+            direction = 1 if ret > 0 else -1
+            self.streak = self.streak + direction if continues else direction
+            self.last_return = ret
+        else:
+            delta = 0.0
+
+        # The RSI window holds the last RSI_PERIOD deltas; the oldest one leaves.
+        if len(self.closes) > RSI_PERIOD:
+            old = self.closes[-RSI_PERIOD] - self.closes[-RSI_PERIOD - 1]
+            self.gain_sum -= max(old, 0.0)
+            self.loss_sum -= max(-old, 0.0)
+        self.gain_sum = _settle(self.gain_sum + max(delta, 0.0))
+        self.loss_sum = _settle(self.loss_sum + max(-delta, 0.0))
+
+        if len(self.closes) == MA_WINDOW:
+            self.close_sum -= self.closes[0]
+        self.closes.append(close)
+        self.close_sum += close
+
+        if len(self.volumes) == VOLUME_WINDOW and not np.isnan(self.volumes[0]):
+            self.volume_sum -= self.volumes[0]
+            self.volume_bars -= 1
+        self.volumes.append(volume)
+        if not np.isnan(volume):
+            self.volume_sum += volume
+            self.volume_bars += 1
+
+        while self.highs and self.highs[-1][1] <= close:
+            self.highs.pop()
+        self.highs.append((day, close))
+        self.date = day
+
+    def trim(self, start: str) -> None:
+        """Drop trailing-high candidates from before start (the first bar of the window)."""
+        while len(self.highs) > 1 and self.highs[0][0] < start:
+            self.highs.popleft()
+
+    def indicators(self, count: int, price: float = np.nan) -> dict:
+        """compute_indicators' row for this state, count being the number of bars in the window."""
+        closes = self.closes
+        last_close = closes[-1]
+        current = last_close if np.isnan(price) else price
+        high = self.highs[0][1]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = np.float64(self.gain_sum) / self.loss_sum
+            rsi = float(100 - (100 / (1 + rs))) if count >= RSI_PERIOD else np.nan
+            avg_vol = self.volume_sum / self.volume_bars if self.volume_bars else np.nan
+            ma_50 = self.close_sum / len(closes)
+
+        return {
+            "bars": count,
+            "last_close": last_close,
+            "price": current,
+            "ath": high,
+            "high_52w": high,
+            "pct_from_ath": (current - high) / high * 100,
+            "change_1d": (current - closes[-2]) / closes[-2] * 100 if count >= 2 else 0.0,
+            "streak": self.streak if count >= 2 else 0,
+            "rsi": rsi,
+            "roc_30d": (current - closes[-ROC_WINDOW]) / closes[-ROC_WINDOW] * 100 if count >= ROC_WINDOW else 0.0,
+            "vol_surge": self.volumes[-1] / avg_vol if avg_vol > 0 else 1.0,
+            "pct_vs_50dma": (current - ma_50) / ma_50 * 100 if count >= MA_WINDOW else 0.0,
+            "is_52w_high": current >= high * HIGH_52W_MARGIN,
+        }
+
+    def copy(self) -> TickerState:
+        state = TickerState()
+        state.__dict__.update({k: deque(v, maxlen=v.maxlen) if isinstance(v, deque) else v for k, v in self.__dict__.items()})
+
+        return state
+
+    def to_dict(self) -> dict:
+        return {k: list(v) if isinstance(v, deque) else v for k, v in self.__dict__.items()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> TickerState:
+        state = cls()
+        for key, value in data.items():
+            current = getattr(state, key)
+            if isinstance(current, deque):
+                value = deque((tuple(v) if isinstance(v, list) else v for v in value), maxlen=current.maxlen)
+            setattr(state, key, value)
+
+        return state
+
+
+def _settle(value: float) -> float:
+    return 0.0 if value < EPSILON else value
+
+
+class IndicatorStore:
+    """Persistent per-ticker TickerStates: {ticker: state} in a JSON file."""
+
+    def __init__(self, path: Path = CACHE_DIR / "indicators.json"):
+        self.path = Path(path)
+        self.states: dict[str, TickerState] = {}
+        self.seeded = 0
+        self.updated = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            with open(self.path) as f:
+                self.states = {ticker: TickerState.from_dict(data) for ticker, data in json.load(f).items()}
+
+    def advance(self, ticker: str, bars: pd.DataFrame) -> TickerState:
+        """ticker's state with every bar applied, updating the persisted (settled) state first."""
+        dates = bars.index.to_numpy(dtype="datetime64[D]")
+        closes = bars["Close"].to_numpy(dtype="float64")
+        volumes = bars["Volume"].to_numpy(dtype="float64")
+        settled = len(dates) - 1
+        start = str(dates[0])
+
+        # Where the stored state left off, if the bars still agree with it.
+        state = self.states.get(ticker)
+        position = -1
+        if state is not None and settled:
+            position = int(dates[:settled].searchsorted(np.datetime64(state.date)))
+            if position >= settled or str(dates[position]) != state.date or closes[position] != state.closes[-1]:
+                position = -1
+
+        if position < 0:
+            state = TickerState.seed(dates[:settled], closes[:settled], volumes[:settled])
+            self.seeded += 1
+        elif position < settled - 1:
+            state.extend(dates[position + 1:settled], closes[position + 1:settled], volumes[position + 1:settled])
+            self.updated += 1
+        if settled:
+            state.trim(start)
+            with self._lock:
+                self.states[ticker] = state
+                self._dirty = True
+
+        current = state.copy()
+        current.extend(dates[settled:], closes[settled:], volumes[settled:])
+        current.trim(start)
+
+        return current
+
+    def compute(self, histories: dict[str, pd.DataFrame], prices: pd.Series | None = None) -> pd.DataFrame:
+        """compute_indicators' frame for histories, from the advanced per-ticker states."""
+        rows = {}
+        for ticker, bars in histories.items():
+            if bars.empty:
+                continue
+            price = prices.get(ticker, np.nan) if prices is not None else np.nan
+            rows[ticker] = self.advance(ticker, bars).indicators(len(bars), price)
+
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+    def verify(self, histories: dict[str, pd.DataFrame], rtol: float = 1e-7) -> list[str]:
+        """Tickers whose state-derived indicators differ from a full recompute."""
+        histories = {t: bars for t, bars in histories.items() if not bars.empty}
+        if not histories:
+            return []
+
+        incremental = self.compute(histories)
+        full = compute_indicators(panel_from_histories(histories, "Close"), panel_from_histories(histories, "Volume"))
+        incremental = incremental.reindex(full.index)
+
+        matches = np.ones(len(full), dtype=bool)
+        for column in VERIFY_COLUMNS:
+            a = incremental[column].to_numpy(dtype="float64")
+            b = full[column].to_numpy(dtype="float64")
+            matches &= np.isclose(a, b, rtol=rtol, atol=rtol, equal_nan=True)
+
+        return list(full.index[~matches])
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+
+        with self._lock:
+            write_json_atomic(self.path, {ticker: state.to_dict() for ticker, state in self.states.items()})
+            self._dirty = False
@@ -0,0 +1,144 @@
+"""
+Vectorized indicator engine.
+
+Computes the scanner's per-stock indicators for a whole universe at once from a
+dates x tickers close/volume panel. Results match calculate_rsi, calculate_streak
+and the per-ticker math in scan.py, but every step is a NumPy array operation.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+RSI_PERIOD = 14
+ROC_WINDOW = 30
+VOLUME_WINDOW = 20
+MA_WINDOW = 50
+HIGH_52W_MARGIN = 0.98
+
+
+def compact(valid: np.ndarray, *panels: np.ndarray) -> list[np.ndarray]:
+    """Move each column's valid rows to the bottom, keeping their order, NaN-padding the top.
+
+    After this, row -1 is every ticker's latest bar and row -k its k-th latest, whatever
+    dates the tickers are missing.
+    """
+    if valid.all():
+        return list(panels)
+
+    order = np.argsort(valid, axis=0, kind="stable")
+    padding = ~np.take_along_axis(valid, order, axis=0)
+    compacted = []
+    for values in panels:
+        out = np.take_along_axis(values, order, axis=0)
+        out[padding] = np.nan
+        compacted.append(out)
+
+    return compacted
+
+
+def _tail(values: np.ndarray, window: int) -> np.ndarray:
+    return values[-window:] if len(values) >= window else values
+
+
+def rsi(close: np.ndarray, count: np.ndarray, period: int = RSI_PERIOD) -> np.ndarray:
+    """Simple-moving-average RSI of the latest bar for each column of a compacted panel."""
+    delta = np.diff(close[-(period + 1):], axis=0)
+    # NaN deltas (padding, first bar) count as zero, exactly like Series.where(delta > 0, 0).
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = gain.mean(axis=0) / loss.mean(axis=0)
+        values = 100 - (100 / (1 + rs))
+
+    values[count < period] = np.nan
+    values[count == 0] = 50
+
+    return values
+
+
+def streak(close: np.ndarray, count: np.ndarray) -> np.ndarray:
+    """Signed count of consecutive up (+) or down (-) days ending at the latest bar."""
+    if len(close) < 2:
+        return np.zeros(close.shape[1], dtype=int)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = close[1:] / close[:-1] - 1
+
+    direction = np.where(returns[-1] > 0, 1, -1)
+    same_way = np.where(direction > 0, returns > 0, returns < 0)[::-1]
+    # The latest day always counts, even when flat; earlier days must strictly continue it.
+    same_way[0] = True
+    run = np.where(same_way.all(axis=0), len(same_way), np.argmin(same_way, axis=0))
+
+    return np.where(count >= 2, direction * run, 0)
+
+
+def compute_indicators(
+    close: pd.DataFrame,
+    volume: pd.DataFrame,
+    price: pd.Series | None = None,
+) -> pd.DataFrame:
+    """Indicators for every ticker (column) of a dates x tickers panel, one row per ticker.
+
+    price is the current price per ticker; where missing the latest close is used.
+    """
+    tickers = close.columns
+    volume = volume.reindex(index=close.index, columns=tickers)
+
+    raw_close = close.to_numpy(dtype="float64")
+    valid = ~np.isnan(raw_close)
+    c, v = compact(valid, raw_close, volume.to_numpy(dtype="float64"))
+    count = valid.sum(axis=0)
+
+    last_close = c[-1]
+    if price is None:
+        current = last_close.copy()
+    else:
+        current = price.reindex(tickers).to_numpy(dtype="float64")
+        current = np.where(np.isnan(current), last_close, current)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ath = np.nanmax(c, axis=0, initial=-np.inf)
+        ath[count == 0] = np.nan
+        high_52w = ath
+        pct_from_ath = (current - ath) / ath * 100
+
+        prev_close = c[-2] if len(c) >= 2 else np.full(len(tickers), np.nan)
+        change_1d = np.where(count >= 2, (current - prev_close) / prev_close * 100, 0.0)
+
+        then = c[-ROC_WINDOW] if len(c) >= ROC_WINDOW else np.full(len(tickers), np.nan)
+        roc_30d = np.where(count >= ROC_WINDOW, (current - then) / then * 100, 0.0)
+
+        vol_tail = _tail(v, VOLUME_WINDOW)
+        avg_vol = np.nansum(vol_tail, axis=0) / (~np.isnan(vol_tail)).sum(axis=0)
+        vol_surge = np.where(avg_vol > 0, v[-1] / avg_vol, 1.0)
+
+        ma_50 = _tail(c, MA_WINDOW).mean(axis=0)
+        pct_vs_50dma = np.where(count >= MA_WINDOW, (current - ma_50) / ma_50 * 100, 0.0)
+
+    return pd.DataFrame({
+        "bars": count,
+        "last_close": last_close,
+        "price": current,
+        "ath": ath,
+        "high_52w": high_52w,
+        "pct_from_ath": pct_from_ath,
+        "change_1d": change_1d,
+        "streak": streak(c, count),
+        "rsi": rsi(c, count),
+        "roc_30d": roc_30d,
+        "vol_surge": vol_surge,
+        "pct_vs_50dma": pct_vs_50dma,
+        "is_52w_high": current >= high_52w * HIGH_52W_MARGIN,
+    }, index=tickers)
+
+
+def panel_from_histories(histories: dict[str, pd.DataFrame], column: str) -> pd.DataFrame:
+    """Date-aligned dates x tickers panel of one OHLCV column."""
+    if not histories:
+        return pd.DataFrame()
+
+    return pd.concat({ticker: bars[column] for ticker, bars in histories.items()}, axis=1).sort_index()
@@ -0,0 +1,142 @@
+"""
+Scan profiler.
+
+Records wall time per scan stage, latency samples per call type and counters
+(filter rejections, exception classes), and reports them as JSON and as a
+console table.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from providers import DataProvider
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+
+    return sorted_values[rank]
+
+
+class Profiler:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.counters: dict[str, Counter] = defaultdict(Counter)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def record(self, call_type: str, seconds: float) -> None:
+        with self._lock:
+            self.latencies[call_type].append(seconds)
+
+    def count(self, category: str, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[category][key] += n
+
+    def summary(self) -> dict:
+        latencies = {}
+        for call_type, samples in self.latencies.items():
+            ordered = sorted(samples)
+            latencies[call_type] = {
+                "count": len(ordered),
+                "total": sum(ordered),
+                "mean": sum(ordered) / len(ordered),
+                "p50": percentile(ordered, 50),
+                "p90": percentile(ordered, 90),
+                "p99": percentile(ordered, 99),
+                "max": ordered[-1],
+            }
+
+        return {
+            "total_seconds": time.perf_counter() - self.started,
+            "stages": dict(self.stages),
+            "latencies": latencies,
+            "counters": {category: dict(counter.most_common()) for category, counter in self.counters.items()},
+        }
+
+    def write(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+        return path
+
+    def render(self, console: Console) -> None:
+        summary = self.summary()
+        total = summary["total_seconds"] or 1.0
+
+        stages = Table(title="⏱ STAGES", box=box.ROUNDED, expand=True, header_style="bold cyan", title_style="bold white")
+        stages.add_column("Stage")
+        stages.add_column("Seconds", justify="right")
+        stages.add_column("%", justify="right")
+        for name, seconds in summary["stages"].items():
+            stages.add_row(name, f"{seconds:.2f}", f"{seconds / total * 100:.0f}%")
+        stages.add_row("[bold]total[/bold]", f"[bold]{total:.2f}[/bold]", "")
+        console.print(stages)
+
+        if summary["latencies"]:
+            calls = Table(title="📶 CALL LATENCY (ms)", box=box.ROUNDED, expand=True, header_style="bold cyan", title_style="bold white")
+            for column in ("Call", "Count", "p50", "p90", "p99", "Max"):
+                calls.add_column(column, justify="left" if column == "Call" else "right")
+            for call_type, stats in summary["latencies"].items():
+                calls.add_row(
+                    call_type,
+                    str(stats["count"]),
+                    *(f"{stats[key] * 1000:.0f}" for key in ("p50", "p90", "p99", "max")),
+                )
+            console.print(calls)
+
+        for category, counter in summary["counters"].items():
+            if counter:
+                line = ", ".join(f"{key} {count}" for key, count in counter.items())
+                console.print(f"[dim]{category}:[/dim] {line}")
+
+
+class ProfiledProvider(DataProvider):
+    """Times every call to the wrapped provider under "info" and "history"."""
+
+    def __init__(self, inner: DataProvider, profiler: Profiler):
+        self.inner = inner
+        self.profiler = profiler
+
+    def universe(self) -> list[str] | None:
+        return self.inner.universe()
+
+    def info(self, ticker: str) -> dict:
+        start = time.perf_counter()
+        try:
+            return self.inner.info(ticker)
+        finally:
+            self.profiler.record("info", time.perf_counter() - start)
+
+    def history(self, tickers: list[str], start: date | None = None, period: str = "1y") -> dict[str, pd.DataFrame]:
+        began = time.perf_counter()
+        try:
+            return self.inner.history(tickers, start=start, period=period)
+        finally:
+            self.profiler.record("history", time.perf_counter() - began)
@@ -0,0 +1,226 @@
+"""
+Market data providers.
+
+Everything the scanner needs from the outside world — fundamentals and daily bars —
+goes through a DataProvider, so the scan can run against Yahoo Finance or, for
+offline runs and timing, against data held in memory or on local disk.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import yfinance as yf
+from yfinance.exceptions import YFRateLimitError
+
+
+class RateLimitError(Exception):
+    """The data source is throttling us (HTTP 429 or equivalent)."""
+
+
+class TransientError(Exception):
+    """A network failure worth retrying."""
+
+
+class DataProvider:
+    """Source of ticker fundamentals and daily OHLCV bars."""
+
+    def universe(self) -> list[str] | None:
+        """Tickers to scan, or None to use the index-constituent universe."""
+        return None
+
+    def info(self, ticker: str) -> dict:
+        raise NotImplementedError
+
+    def history(self, tickers: list[str], start: date | None = None, period: str = "1y") -> dict[str, pd.DataFrame]:
+        """Daily bars per ticker, from start onwards if given, otherwise for the trailing period.
+
+        Tickers with no data are left out of the result.
+        """
+        raise NotImplementedError
+
+    def quotes(self, tickers: list[str]) -> dict[str, pd.DataFrame]:
+        """Each ticker's latest daily bar, today's partial one during the session (price and volume so far).
+
+        Batched like history(); tickers with no data are left out.
+        """
+        return {ticker: bars.iloc[-1:] for ticker, bars in self.history(tickers, period="1d").items()}
+
+
+class YahooProvider(DataProvider):
+    """Yahoo Finance via yfinance, downloading history for many tickers per request."""
+
+    def __init__(self, batch_size: int = 200, session=None):
+        self.batch_size = batch_size
+        # None shares yfinance's own pooled session across all threads.
+        self.session = session
+
+    def info(self, ticker: str) -> dict:
+        try:
+            return yf.Ticker(ticker, session=self.session).info
+        except YFRateLimitError as e:
+            raise RateLimitError(str(e)) from e
+        except OSError as e:
+            raise TransientError(str(e)) from e
+
+    def history(self, tickers: list[str], start: date | None = None, period: str = "1y") -> dict[str, pd.DataFrame]:
+        bars = {}
+        for i in range(0, len(tickers), self.batch_size):
+            batch = tickers[i:i + self.batch_size]
+            df = yf.download(
+                batch,
+                start=start,
+                period=None if start else period,
+                group_by="ticker",
+                auto_adjust=True,
+                threads=True,
+                progress=False,
+                multi_level_index=True,
+                session=self.session,
+            )
+            if df is None or df.empty:
+                continue
+
+            downloaded = set(df.columns.get_level_values(0))
+            for ticker in batch:
+                if ticker not in downloaded:
+                    continue
+                ticker_bars = df[ticker].dropna(subset=["Close"])
+                if not ticker_bars.empty:
+                    bars[ticker] = ticker_bars
+
+        return bars
+
+
+class LocalProvider(DataProvider):
+    """Fundamentals and bars held in memory, optionally loaded from a directory.
+
+    Directory layout: info.json maps ticker -> info dict, bars/<TICKER>.csv holds
+    daily OHLCV bars with a Date index.
+    """
+
+    def __init__(self, infos: dict[str, dict], bars: dict[str, pd.DataFrame]):
+        self.infos = infos
+        self.bars = bars
+
+    @classmethod
+    def from_dir(cls, path: Path) -> LocalProvider:
+        path = Path(path)
+        with open(path / "info.json") as f:
+            infos = json.load(f)
+
+        bars = {}
+        for csv_path in sorted((path / "bars").glob("*.csv")):
+            bars[csv_path.stem] = pd.read_csv(csv_path, index_col="Date", parse_dates=True)
+
+        return cls(infos, bars)
+
+    def to_dir(self, path: Path) -> None:
+        path = Path(path)
+        (path / "bars").mkdir(parents=True, exist_ok=True)
+        with open(path / "info.json", "w") as f:
+            json.dump(self.infos, f)
+
+        for ticker, bars in self.bars.items():
+            bars.to_csv(path / "bars" / f"{ticker}.csv", index_label="Date")
+
+    def universe(self) -> list[str] | None:
+        return list(self.infos)
+
+    def info(self, ticker: str) -> dict:
+        if ticker not in self.infos:
+            raise KeyError(f"No fundamentals for {ticker}")
+
+        return self.infos[ticker]
+
+    def history(self, tickers: list[str], start: date | None = None, period: str = "1y") -> dict[str, pd.DataFrame]:
+        result = {}
+        for ticker in tickers:
+            bars = self.bars.get(ticker)
+            if bars is None or bars.empty:
+                continue
+
+            if start is not None:
+                bars = bars[bars.index >= pd.Timestamp(start)]
+            elif period != "max":
+                bars = bars[bars.index > bars.index[-1] - _period_offset(period)]
+
+            if not bars.empty:
+                result[ticker] = bars
+
+        return result
+
+
+def _period_offset(period: str) -> pd.DateOffset:
+    """Translate a yfinance period string ("60d", "6mo", "1y") into an offset."""
+    if period.endswith("mo"):
+        return pd.DateOffset(months=int(period[:-2]))
+    if period.endswith("d"):
+        return pd.DateOffset(days=int(period[:-1]))
+    if period.endswith("y"):
+        return pd.DateOffset(years=int(period[:-1]))
+
+    raise ValueError(f"Unsupported period: {period}")
+
+
+class FlakyProvider(DataProvider):
+    """Wraps another provider, adding latency and induced throttling/transient errors.
+
+    Stands in for a misbehaving Yahoo so retry and adaptive-concurrency behaviour can
+    be tested and benchmarked offline. With max_concurrent set, any call beyond that
+    many in flight is throttled, like a server enforcing a per-client limit.
+    """
+
+    def __init__(
+        self,
+        inner: DataProvider,
+        latency: float = 0.0,
+        throttle_rate: float = 0.0,
+        error_rate: float = 0.0,
+        max_concurrent: int | None = None,
+        seed: int | None = None,
+    ):
+        self.inner = inner
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.max_concurrent = max_concurrent
+        self.calls = 0
+        self.throttled = 0
+        self.in_flight = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def universe(self) -> list[str] | None:
+        return self.inner.universe()
+
+    def info(self, ticker: str) -> dict:
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            over_limit = self.max_concurrent is not None and self.in_flight > self.max_concurrent
+            roll = self._random.random()
+
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            if over_limit or roll < self.throttle_rate:
+                with self._lock:
+                    self.throttled += 1
+                raise RateLimitError(f"429 Too Many Requests for {ticker}")
+            if roll < self.throttle_rate + self.error_rate:
+                raise TransientError(f"connection reset fetching {ticker}")
+
+            return self.inner.info(ticker)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def history(self, tickers: list[str], start: date | None = None, period: str = "1y") -> dict[str, pd.DataFrame]:
+        return self.inner.history(tickers, start=start, period=period)
@@ -0,0 +1,107 @@
+"""
+Quotes-only refresh: re-price the last scan's stocks from cached data.
+
+A full scan fetches fundamentals and syncs a year of bars for the whole
+universe. During the session what changes is mostly the price, so this mode
+skips all of that:
+
+    eligible set   tickers whose cached fundamentals pass the filters and that
+                   are not in the negative cache (the last scan's candidates)
+    quotes         one batched request per ~200 tickers for today's bar (price
+                   and volume so far)
+    history        the stored bars, with the quote applied in memory as the
+                   latest bar; the store itself is left to the next full scan.
+                   A ticker whose stored bars end before the quote's previous
+                   session would get the quote across a gap, so it is brought
+                   up to date with a delta sync instead
+
+Indicators (change_1d, pct_from_ath, roc_30d, vol_surge, RSI, streak) are then
+rebuilt from the indicator and ATH state, and the stocks are re-categorized,
+rendered and saved like a scan.
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from archive import Archive
+from ath import AthIndex
+from incremental import IndicatorStore
+from providers import DataProvider, YahooProvider
+from render import console
+from results import ScanResult
+from scanner import build_stocks, categorize, get_qqq_30d_return, publish, screen_reason
+from store import BarStore, FundamentalsCache, NegativeCache, merge_bars, normalize_bars
+
+
+def eligible_tickers(cache: FundamentalsCache, negative: NegativeCache) -> list[str]:
+    """Tickers whose cached fundamentals, however old, pass the scan's filters."""
+    return [
+        ticker for ticker in cache.entries
+        if not negative.reason(ticker) and screen_reason(cache.known(ticker)) is None
+    ]
+
+
+def refresh_quotes(
+    skip_ai: bool = False,
+    provider: DataProvider | None = None,
+    store: BarStore | None = None,
+    cache: FundamentalsCache | None = None,
+    negative: NegativeCache | None = None,
+    indicator_state: IndicatorStore | None = None,
+    ath_index: AthIndex | None = None,
+    archive: Archive | None = None,
+    output_format: str = "rich",
+    output_dir: Path = Path("data"),
+) -> ScanResult | None:
+    """Re-price the eligible set from batched quotes against its stored history; None if there is nothing cached."""
+    started = time.perf_counter()
+    provider = provider or YahooProvider()
+    store = store or BarStore()
+    cache = cache or FundamentalsCache()
+    indicator_state = indicator_state or IndicatorStore()
+
+    stored = {ticker: store.load(ticker) for ticker in eligible_tickers(cache, negative or NegativeCache())}
+    stored = {ticker: bars for ticker, bars in stored.items() if bars is not None and not bars.empty}
+    if not stored:
+        console.print("[red]No cached fundamentals and history to refresh; run a full scan first.[/red]")
+        return None
+
+    with console.status(f"[bold cyan]Fetching quotes for {len(stored)} stocks...[/bold cyan]"):
+        quotes = provider.quotes(list(stored))
+        qqq_30d = get_qqq_30d_return(provider)
+
+    histories = dict(stored)
+    gapped = []
+    for ticker, quote in quotes.items():
+        quote = normalize_bars(quote)
+        # A quote older than the stored bars (e.g. before the open) adds nothing.
+        if ticker not in stored or quote.empty or quote.index[-1] < stored[ticker].index[-1]:
+            continue
+        # Sessions missing in between would make the quote's change_1d, streak and RSI
+        # run against a stale close (holidays only cost an unneeded sync).
+        if stored[ticker].index[-1] < quote.index[-1] - pd.offsets.BDay(1):
+            gapped.append(ticker)
+        else:
+            histories[ticker] = merge_bars(stored[ticker], quote)
+    if gapped:
+        with console.status(f"[bold cyan]Syncing price history for {len(gapped)} stocks behind by more than a session...[/bold cyan]"):
+            histories.update(store.sync(gapped, provider))
+    # Without price fields, build_stocks prices every stock off its latest bar: the quote.
+    infos = {ticker: cache.known(ticker) for ticker in histories}
+    results = build_stocks(infos, histories, qqq_30d, indicator_state, ath_index or AthIndex())
+    indicator_state.save()
+
+    console.print(f"[green]Re-priced {len(results)} stocks from {len(quotes)} quotes "
+                  f"in {time.perf_counter() - started:.1f}s[/green]\n")
+    scan_result = categorize(results, qqq_30d)
+    if not results:
+        console.print("[red]No stocks matched the criteria.[/red]")
+        return scan_result
+
+    publish(scan_result, results, skip_ai, archive=archive, output_dir=output_dir, output_format=output_format)
+
+    return scan_result
@@ -0,0 +1,452 @@
+"""
+Console rendering of scan results.
+
+Only needs rich, so showing a saved scan (scan.py --load, bullish-stale) starts
+without importing the data stack.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import sys
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import IO, Any, Callable
+
+from rich.console import Console
+from rich.table import Table
+from rich.panel import Panel
+from rich.text import Text
+from rich import box
+
+from results import ScanResult, Stock, json_safe
+from screens import Screen, ScreenError, load_screens
+
+console = Console()
+
+FORMATS = ("rich", "plain", "csv", "ndjson", "markdown")
+
+
+def rsi_label(rsi: float) -> str:
+    if rsi < 30:
+        return "BUY"
+    elif rsi < 40:
+        return "WATCH"
+    elif rsi > 70:
+        return "SELL"
+
+    return "-"
+
+
+SIGNAL_STYLES = {"BUY": "bold green", "WATCH": "bold #ff5555", "SELL": "bold #ff5555", "-": "dim"}
+
+
+def rsi_signal(rsi: float) -> str:
+    label = rsi_label(rsi)
+    style = SIGNAL_STYLES[label]
+
+    return f"[{style}]{label}[/{style}]"
+
+
+def format_streak(streak: int) -> str:
+    if streak > 0:
+        return f"[bold green]↑{streak}[/bold green]"
+    elif streak < 0:
+        return f"[bold red]↓{abs(streak)}[/bold red]"
+
+    return "[dim]—[/dim]"
+
+
+def format_pct(value: float, invert: bool = False) -> str:
+    color = "red" if (value < 0) != invert else "green"
+
+    return f"[bold {color}]{value:+.1f}%[/bold {color}]"
+
+
+def format_price(value: float) -> str:
+    return f"[bold]${value:,.0f}[/bold]"
+
+
+def format_rsi(rsi: float) -> str:
+    if rsi < 30:
+        return f"[bold green]{rsi:.0f}[/bold green]"
+    elif rsi < 40:
+        return f"[bold yellow]{rsi:.0f}[/bold yellow]"
+    elif rsi > 70:
+        return f"[bold red]{rsi:.0f}[/bold red]"
+
+    return f"[white]{rsi:.0f}[/white]"
+
+
+def format_upside(value: float) -> str:
+    if value == 0:
+        return "[dim]—[/dim]"
+    color = "green" if value > 0 else "red"
+
+    return f"[bold {color}]{value:+.0f}%[/bold {color}]"
+
+
+def format_rating(rating: str) -> str:
+    r = rating.lower()
+    if r in ("buy", "strong_buy", "strongbuy"):
+        return f"[bold green]{rating.upper()}[/bold green]"
+    elif r in ("hold", "neutral"):
+        return f"[bold yellow]{rating.upper()}[/bold yellow]"
+    elif r in ("sell", "strong_sell", "strongsell", "underperform"):
+        return f"[bold red]{rating.upper()}[/bold red]"
+    elif rating:
+        return f"[dim]{rating.upper()}[/dim]"
+
+    return "[dim]—[/dim]"
+
+
+def plain_pct(value: float) -> str:
+    return f"{value:+.1f}%"
+
+
+def plain_price(value: float) -> str:
+    return f"${value:,.0f}"
+
+
+def plain_streak(streak: int) -> str:
+    if streak > 0:
+        return f"↑{streak}"
+    elif streak < 0:
+        return f"↓{abs(streak)}"
+
+    return "—"
+
+
+def plain_upside(value: float) -> str:
+    return f"{value:+.0f}%" if value else "—"
+
+
+def format_vol(vol_surge: float) -> str:
+    color = "green" if vol_surge > 1.5 else "dim"
+
+    return f"[{color}]{vol_surge:.1f}x[/{color}]"
+
+
+# A cell formatter: stock -> the cell's value for one output target.
+Formatter = Callable[[Stock], Any]
+
+
+@dataclass(frozen=True)
+class Column:
+    """A result table column: its layout, the Stock field it shows and its formatter per output target.
+
+    rich cells carry console markup, plain and markdown ones are bare text, and
+    csv and ndjson get the field's raw value.
+    """
+
+    name: str
+    field: str
+    width: int
+    justify: str
+    formatters: dict[str, Formatter]
+
+
+def make_column(name: str, field: str, width: int, rich: Formatter, plain: Formatter, justify: str = "right") -> Column:
+    raw = attrgetter(field)
+
+    return Column(name, field, width, justify, {
+        "rich": rich,
+        "plain": plain,
+        "markdown": lambda stock: plain(stock).replace("|", "\\|"),
+        "csv": raw,
+        "ndjson": raw,
+    })
+
+
+COLUMNS = {column.name: column for column in (
+    make_column("Ticker", "ticker", 6, lambda s: f"[bold white]{s.ticker}[/bold white]", attrgetter("ticker"), "left"),
+    make_column("Name", "name", 18, lambda s: f"[dim]{s.name[:20]}[/dim]", lambda s: s.name[:20], "left"),
+    make_column("Price", "price", 7, lambda s: format_price(s.price), lambda s: plain_price(s.price)),
+    make_column("ATH", "ath", 7, lambda s: f"[dim]${s.ath:,.0f}[/dim]", lambda s: plain_price(s.ath)),
+    make_column("52wHi", "high_52w", 7, lambda s: f"[dim]${s.high_52w:,.0f}[/dim]", lambda s: plain_price(s.high_52w)),
+    make_column("%ATH", "pct_from_ath", 8, lambda s: format_pct(s.pct_from_ath), lambda s: plain_pct(s.pct_from_ath)),
+    make_column("1d%", "change_1d", 8, lambda s: format_pct(s.change_1d), lambda s: plain_pct(s.change_1d)),
+    make_column("30d%", "roc_30d", 8, lambda s: format_pct(s.roc_30d), lambda s: plain_pct(s.roc_30d)),
+    make_column("Streak", "streak", 6, lambda s: format_streak(s.streak), lambda s: plain_streak(s.streak)),
+    make_column(
+        "FV", "fair_value", 7,
+        lambda s: format_price(s.fair_value) if s.fair_value else "[dim]—[/dim]",
+        lambda s: plain_price(s.fair_value) if s.fair_value else "—",
+    ),
+    make_column("%FV", "upside", 5, lambda s: format_upside(s.upside), lambda s: plain_upside(s.upside)),
+    make_column("FV%ATH", "fv_vs_ath", 6, lambda s: format_upside(s.fv_vs_ath), lambda s: plain_upside(s.fv_vs_ath)),
+    make_column("Rating", "rating", 6, lambda s: format_rating(s.rating), lambda s: s.rating.upper() or "—", "left"),
+    make_column("RSI", "rsi", 4, lambda s: format_rsi(s.rsi), lambda s: f"{s.rsi:.0f}"),
+    make_column("Signal", "signal", 6, lambda s: rsi_signal(s.rsi), lambda s: rsi_label(s.rsi), "left"),
+    make_column("Vol", "vol_surge", 5, lambda s: format_vol(s.vol_surge), lambda s: f"{s.vol_surge:.1f}x"),
+    make_column(
+        "52wH", "is_52w_high", 4,
+        lambda s: "[bold green]YES[/bold green]" if s.is_52w_high else "",
+        lambda s: "YES" if s.is_52w_high else "",
+        "left",
+    ),
+)}
+COLUMN_WIDTHS = {name: column.width for name, column in COLUMNS.items()}
+
+
+def row_formatter(names: list[str], target: str) -> Callable[[Stock], list]:
+    """A function formatting a stock's cells for the named columns, with the formatters looked up once."""
+    formatters = [COLUMNS[name].formatters[target] for name in names]
+
+    return lambda stock: [format_cell(stock) for format_cell in formatters]
+
+
+def build_row(stock: Stock, columns: list[tuple]) -> list[str]:
+    return [COLUMNS[name].formatters["rich"](stock) for name, _ in columns]
+
+
+def build_ai_text(ai: str) -> Text:
+    ai_text = Text("└ ", style="dim")
+    ai_upper = ai.upper()
+    if ai_upper.startswith("BUY"):
+        ai_text.append("BUY", style="bold green")
+        ai_text.append(ai[3:], style="italic dim")
+    elif ai_upper.startswith("SELL"):
+        ai_text.append("SELL", style="bold #ff5555")
+        ai_text.append(ai[4:], style="italic dim")
+    elif ai_upper.startswith("WAIT"):
+        ai_text.append("WAIT", style="bold #ff5555")
+        ai_text.append(ai[4:], style="italic dim")
+    elif ai_upper.startswith("PASS"):
+        ai_text.append("PASS", style="bold #ff5555")
+        ai_text.append(ai[4:], style="italic dim")
+    else:
+        ai_text.append(ai, style="italic dim")
+
+    return ai_text
+
+
+def render_table_with_ai(title: str, stocks: list[Stock], columns: list[tuple], ai_assessments: dict[str, str]) -> None:
+    if not stocks:
+        console.print(f"\n[dim]No stocks in {title}[/dim]")
+        return
+
+    table = Table(
+        title=title,
+        box=box.ROUNDED,
+        show_header=True,
+        header_style="bold cyan",
+        expand=True,
+        title_style="bold white",
+    )
+
+    for col_name, col_width in columns:
+        table.add_column(col_name, min_width=col_width, no_wrap=True, justify=COLUMNS[col_name].justify)
+
+    format_row = row_formatter([col_name for col_name, _ in columns], "rich")
+    for stock in stocks:
+        table.add_row(*format_row(stock))
+
+    console.print(table)
+
+    for stock in stocks:
+        ai = ai_assessments.get(stock.ticker, "")
+        if ai:
+            ai_text = Text(f"  {stock.ticker} ", style="bold white")
+            ai_text.append_text(build_ai_text(ai))
+            console.print(ai_text)
+
+
+def render_ai_updates(stocks: list[Stock]) -> None:
+    """Print AI verdicts that landed after the tables were rendered."""
+    if not stocks:
+        return
+
+    console.print("[bold white]🤖 AI ANALYSIS[/bold white]")
+    for stock in stocks:
+        ai_text = Text(f"  {stock.ticker} ", style="bold white")
+        ai_text.append_text(build_ai_text(stock.ai_assessment))
+        console.print(ai_text)
+
+
+def render_table_simple(title: str, stocks: list[Stock], columns: list[tuple]) -> None:
+    if not stocks:
+        console.print(f"\n[dim]No stocks in {title}[/dim]")
+        return
+
+    table = Table(
+        title=title,
+        box=box.ROUNDED,
+        show_header=True,
+        header_style="bold cyan",
+        expand=True,
+        title_style="bold white",
+    )
+
+    for col_name, col_width in columns:
+        table.add_column(col_name, min_width=col_width, no_wrap=True, justify=COLUMNS[col_name].justify)
+
+    format_row = row_formatter([col_name for col_name, _ in columns], "rich")
+    for stock in stocks:
+        table.add_row(*format_row(stock))
+
+    console.print(table)
+
+
+def screen_columns(screen: Screen) -> list[tuple[str, int]]:
+    """A screen's (column, width) pairs for build_row."""
+    unknown = [name for name in screen.columns if name not in COLUMN_WIDTHS]
+    if unknown:
+        raise ScreenError(f"screen {screen.name!r}: unknown columns {', '.join(unknown)}")
+
+    return [(name, COLUMN_WIDTHS[name]) for name in screen.columns]
+
+
+def ai_stocks(result: ScanResult, screens: tuple[Screen, ...]) -> list[Stock]:
+    """The stocks of the AI-assessed screens, screen by screen (a stock in two of them appears twice)."""
+    sections = result.sections()
+
+    return [stock for screen in screens if screen.ai for stock in sections.get(screen.name, [])]
+
+
+def render_sections(result: ScanResult, ai_assessments: dict[str, str], screens: tuple[Screen, ...] | None = None) -> None:
+    """One table per screen, in screen order."""
+    screens = screens or load_screens()
+    sections = result.sections()
+    for i, screen in enumerate(screens):
+        if i:
+            console.print()
+        stocks = sections.get(screen.name, [])
+        if screen.ai:
+            render_table_with_ai(screen.title, stocks, screen_columns(screen), ai_assessments)
+        else:
+            render_table_simple(screen.title, stocks, screen_columns(screen))
+
+
+def render_summary(result: ScanResult, stocks: list[Stock], screens: tuple[Screen, ...] | None = None) -> None:
+    """Summary table; the RSI signal counts are over stocks."""
+    screens = screens or load_screens()
+    buy_signals = len([s for s in stocks if s.rsi < 30])
+    watch_signals = len([s for s in stocks if 30 <= s.rsi < 40])
+
+    summary = Table(title="📈 SUMMARY", box=box.ROUNDED, show_header=False, expand=True, title_style="bold white")
+    summary.add_column("Metric", style="dim", ratio=1)
+    summary.add_column("Value", style="bold", justify="right", ratio=1)
+
+    summary.add_row("Total tech stocks", str(result.total_stocks))
+    summary.add_row("RSI < 30 (BUY)", f"[green]{buy_signals}[/green]")
+    summary.add_row("RSI 30-40 (WATCH)", f"[yellow]{watch_signals}[/yellow]")
+    sections = result.sections()
+    for screen in screens:
+        if screen.label:
+            summary.add_row(screen.label, str(len(sections.get(screen.name, []))))
+
+    console.print()
+    console.print(summary)
+
+
+def write_sections(
+    result: ScanResult,
+    output_format: str,
+    screens: tuple[Screen, ...] | None = None,
+    out: IO[str] | None = None,
+) -> None:
+    """Stream every screen's rows to out (stdout) as plain text, CSV, NDJSON or Markdown.
+
+    Rows are written as they are formatted, with no table layout. plain and
+    markdown show each screen's columns under its title; csv and ndjson rows
+    carry the section name and the raw value of every column, so all sections
+    share one schema.
+    """
+    out = out or sys.stdout
+    screens = screens or load_screens()
+    sections = result.sections()
+
+    if output_format in ("csv", "ndjson"):
+        names = list(COLUMNS)
+        header = ["section", *(COLUMNS[name].field for name in names), "ai_assessment"]
+        format_row = row_formatter(names, output_format)
+        writer = csv.writer(out, lineterminator="\n")
+        if output_format == "csv":
+            writer.writerow(header)
+        for screen in screens:
+            for stock in sections.get(screen.name, []):
+                values = [screen.name, *format_row(stock), stock.ai_assessment]
+                if output_format == "csv":
+                    writer.writerow(values)
+                else:
+                    out.write(json.dumps(json_safe(dict(zip(header, values))), separators=(",", ":")) + "\n")
+        return
+
+    for i, screen in enumerate(screens):
+        stocks = sections.get(screen.name, [])
+        names = [name for name, _ in screen_columns(screen)]
+        headers = names + (["AI"] if screen.ai else [])
+        format_row = row_formatter(names, output_format)
+        if i:
+            out.write("\n")
+
+        if output_format == "markdown":
+            out.write(f"### {screen.title}\n\n")
+            if not stocks:
+                out.write("_No stocks_\n")
+                continue
+            align = ["---:" if COLUMNS[name].justify == "right" else ":---" for name in names]
+            align += [":---"] if screen.ai else []
+            out.write(f"| {' | '.join(headers)} |\n| {' | '.join(align)} |\n")
+            for stock in stocks:
+                cells = format_row(stock) + ([stock.ai_assessment.replace("|", "\\|")] if screen.ai else [])
+                out.write(f"| {' | '.join(cells)} |\n")
+        else:
+            out.write(f"{screen.title}\n")
+            if not stocks:
+                out.write("No stocks\n")
+                continue
+            out.write("\t".join(headers) + "\n")
+            for stock in stocks:
+                cells = format_row(stock) + ([stock.ai_assessment] if screen.ai else [])
+                out.write("\t".join(cells) + "\n")
+
+
+def render(result: ScanResult, screens: tuple[Screen, ...] | None = None, output_format: str = "rich") -> None:
+    """Render scan results to the console, or stream them to stdout in a headless output_format."""
+    screens = screens or load_screens()
+    if output_format != "rich":
+        write_sections(result, output_format, screens)
+        return
+
+    console.print(Panel.fit(
+        f"[bold cyan]BULLISH SCANNER[/bold cyan]\n[dim]{result.timestamp}[/dim]",
+        border_style="cyan"
+    ))
+
+    console.print(f"[dim]QQQ 30-day return: {result.qqq_30d_return:+.1f}%[/dim]")
+    console.print(f"[green]Loaded {result.total_stocks} tech stocks[/green]\n")
+
+    # Build AI assessments dict from loaded data
+    assessed = ai_stocks(result, screens)
+    ai_assessments = {stock.ticker: stock.ai_assessment for stock in assessed if stock.ai_assessment}
+
+    render_sections(result, ai_assessments, screens)
+    render_summary(result, assessed, screens)
+
+
+def render_history(ticker: str, history: list[dict]) -> None:
+    """Render a ticker's archived rows, one per scan it appeared in."""
+    if not history:
+        console.print(f"[red]{ticker} is not in any archived scan[/red]")
+        return
+
+    table = Table(title=f"🗂 {ticker} HISTORY", box=box.ROUNDED, expand=True, header_style="bold cyan", title_style="bold white")
+    for column in ("Scan", "Price", "%ATH", "1d%", "RSI", "Sections"):
+        table.add_column(column, justify="left" if column in ("Scan", "Sections") else "right")
+    for row in history:
+        table.add_row(
+            row["timestamp"][:16].replace("T", " "),
+            format_price(row["price"]),
+            format_pct(row["pct_from_ath"]),
+            format_pct(row["change_1d"]),
+            format_rsi(row["rsi"]),
+            ", ".join(row["sections"]),
+        )
+    console.print(table)
+
+    on_watchlist = [row["timestamp"] for row in history if "watchlist" in row["sections"]]
+    if on_watchlist:
+        console.print(f"[dim]On the watchlist in {len(on_watchlist)} of {len(history)} archived scans, first {on_watchlist[0][:10]}[/dim]")
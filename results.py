@@ -0,0 +1,201 @@
+"""
+Scan result types shared by the scanner, the archive and the renderers, and the
+scan file format.
+
+Version 2 scan files store each stock once, as a row in a ticker-keyed table,
+and each section as an ordered list of tickers, minified:
+
+    {"version": 2, "timestamp": ..., "qqq_30d_return": ..., "total_stocks": ...,
+     "columns": ["name", "price", ...], "stocks": {"NVDA": ["NVIDIA", 181.2, ...]},
+     "sections": {"watchlist": ["NVDA", ...], ...}}
+
+Sections of custom screens (screens.json) are stored in "sections" next to the
+built-in six and load into ScanResult.custom.
+
+Version 1 files (no "version" key) repeat the full stock object in every section
+it appears in; load_results reads both.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Iterable
+
+
+@dataclass
+class Stock:
+    ticker: str
+    name: str
+    price: float
+    ath: float
+    market_cap: float
+    sector: str
+    pct_from_ath: float
+    change_1d: float
+    streak: int
+    rsi: float
+    roc_30d: float
+    rs_vs_qqq: float
+    vol_surge: float
+    pct_vs_50dma: float
+    is_52w_high: bool
+    signal: str = ""
+    ai_assessment: str = ""
+    fair_value: float = 0.0
+    upside: float = 0.0
+    rating: str = ""
+    fv_vs_ath: float = 0.0
+    # The ATH above is the all-time high (ath.AthIndex); this is the high of the last year of bars.
+    high_52w: float = 0.0
+
+
+@dataclass
+class ScanResult:
+    timestamp: str
+    qqq_30d_return: float
+    total_stocks: int
+    watchlist: list[Stock]
+    big_drops: list[Stock]
+    big_gains: list[Stock]
+    down_streaks: list[Stock]
+    up_streaks: list[Stock]
+    parabolic: list[Stock]
+    # Sections of user-defined screens (screens.json) beyond the built-in six, by name.
+    custom: dict[str, list[Stock]] = field(default_factory=dict)
+
+    def sections(self) -> dict[str, list[Stock]]:
+        """Every section by name: the built-in ones in SECTIONS order, then the custom ones."""
+        return {**{section: getattr(self, section) for section in SECTIONS}, **self.custom}
+
+
+def stock_values(stock: Stock) -> dict:
+    """A stock's fields by name, like asdict(); also works for table.StockRow views."""
+    return {name: getattr(stock, name) for name in STOCK_FIELD_NAMES}
+
+
+SCAN_FORMAT = 2
+SECTIONS = ("watchlist", "big_drops", "big_gains", "down_streaks", "up_streaks", "parabolic")
+STOCK_FIELD_NAMES = [f.name for f in fields(Stock)]
+STOCK_COLUMNS = [name for name in STOCK_FIELD_NAMES if name != "ticker"]
+
+
+def encode_stocks(stocks: Iterable[Stock]) -> dict[str, list]:
+    """Each stock's STOCK_COLUMNS values by ticker; the first of a repeated ticker wins."""
+    rows: dict[str, list] = {}
+    for stock in stocks:
+        if stock.ticker not in rows:
+            rows[stock.ticker] = [getattr(stock, column) for column in STOCK_COLUMNS]
+
+    return rows
+
+
+def decode_stocks(columns: list[str], rows: dict[str, list]) -> dict[str, Stock]:
+    """Stocks by ticker from encode_stocks rows written with columns."""
+    # Columns this version of Stock doesn't know are dropped; missing ones take their defaults.
+    known = {f.name for f in fields(Stock)}
+
+    return {
+        ticker: Stock(ticker=ticker, **{c: v for c, v in zip(columns, row) if c in known})
+        for ticker, row in rows.items()
+    }
+
+
+def encode_results(result: ScanResult) -> dict:
+    """The version 2 document for a scan."""
+    sections = result.sections()
+    stocks = encode_stocks(stock for section in sections.values() for stock in section)
+
+    return {
+        "version": SCAN_FORMAT,
+        "timestamp": result.timestamp,
+        "qqq_30d_return": result.qqq_30d_return,
+        "total_stocks": result.total_stocks,
+        "columns": STOCK_COLUMNS,
+        "stocks": stocks,
+        "sections": {name: [stock.ticker for stock in section] for name, section in sections.items()},
+    }
+
+
+def _json_default(obj):
+    # numpy scalars (np.float64, np.bool_, ...) unwrap to their Python value.
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_json(data) -> str:
+    """Minified JSON that also accepts numpy scalars."""
+    return json.dumps(data, separators=(",", ":"), default=_json_default)
+
+
+def json_safe(value):
+    """value with NaN and infinite floats, at any depth of dicts and lists, replaced by None.
+
+    NaN (e.g. RSI of a flat series) and infinities are not valid JSON; browsers' JSON.parse rejects them.
+    """
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: json_safe(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [json_safe(item) for item in value]
+
+    return value
+
+
+def dumps_results(result: ScanResult) -> str:
+    """Minified version 2 JSON for a scan."""
+    return dumps_json(encode_results(result))
+
+
+def decode_results(data: dict) -> ScanResult:
+    """A ScanResult from a parsed scan file of any version."""
+    if data.get("version", 1) < 2:
+        return _decode_v1(data)
+
+    stocks = decode_stocks(data["columns"], data["stocks"])
+
+    return ScanResult(
+        timestamp=data["timestamp"],
+        qqq_30d_return=data["qqq_30d_return"],
+        total_stocks=data["total_stocks"],
+        **{section: [stocks[t] for t in data["sections"].get(section, [])] for section in SECTIONS},
+        custom={
+            name: [stocks[t] for t in tickers] for name, tickers in data["sections"].items() if name not in SECTIONS
+        },
+    )
+
+
+def _decode_v1(data: dict) -> ScanResult:
+    return ScanResult(
+        timestamp=data["timestamp"],
+        qqq_30d_return=data["qqq_30d_return"],
+        total_stocks=data["total_stocks"],
+        watchlist=[Stock(**s) for s in data["watchlist"]],
+        big_drops=[Stock(**s) for s in data["big_drops"]],
+        big_gains=[Stock(**s) for s in data["big_gains"]],
+        down_streaks=[Stock(**s) for s in data["down_streaks"]],
+        up_streaks=[Stock(**s) for s in data["up_streaks"]],
+        parabolic=[Stock(**s) for s in data["parabolic"]],
+    )
+
+
+def load_results(json_path: Path) -> ScanResult:
+    """Load scan results from a JSON file of any format version."""
+    with open(json_path) as f:
+        return decode_results(json.load(f))
+
+
+def get_latest_scan(output_dir: Path) -> Path | None:
+    """Get the most recent scan JSON file."""
+    json_files = sorted(output_dir.glob("scan_*.json"), reverse=True)
+
+    return json_files[0] if json_files else None
+
+
+def section_membership(result: ScanResult) -> dict[str, frozenset[str]]:
+    """The set of tickers in each section, ignoring order."""
+    return {name: frozenset(stock.ticker for stock in section) for name, section in result.sections().items()}
@@ -0,0 +1,689 @@
+"""
+Bullish scan pipeline.
+
+Dynamically discovers tech stocks from S&P 500 and NASDAQ-100, fetches their
+fundamentals and price history, computes indicators and sorts them into the
+scan's sections. Importing this module pulls in the data stack (pandas, numpy,
+yfinance); rendering saved results only needs render.py.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import requests
+from rich.panel import Panel
+from rich.progress import Progress, SpinnerColumn, TextColumn
+
+from ai import Assessor
+from archive import Archive
+from ath import AthIndex
+from checkpoint import Checkpoint, run_label
+from fetcher import RETRYABLE, FetchScheduler
+from incremental import IndicatorStore
+from indicators import compute_indicators, panel_from_histories
+from profiler import ProfiledProvider, Profiler
+from providers import DataProvider, YahooProvider
+from render import ai_stocks, console, render_ai_updates, render_sections, render_summary, write_sections
+from results import SECTIONS, ScanResult, Stock, dumps_results
+from screens import Screen, load_screens, select
+from shard import SHARD_DIR, in_shard, read_shards, write_shard
+from store import FIELD_TTLS, BarStore, ConstituentCache, FundamentalsCache, NegativeCache
+from table import StockTable, stocks_frame
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36"
+}
+
+# Configuration
+MIN_MARKET_CAP = 2_000_000_000
+MIN_AVG_VOLUME = 500_000
+MIN_PRICE = 10
+
+TECH_SECTORS = {
+    "Technology",
+    "Communication Services",
+    "Consumer Cyclical",
+}
+
+
+SP500_URL = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+NASDAQ100_URL = "https://en.wikipedia.org/wiki/Nasdaq-100"
+
+
+def read_constituents_table(html: str) -> list[pd.DataFrame]:
+    """Parse only the constituents table when the page marks it, instead of every table."""
+    try:
+        return pd.read_html(StringIO(html), attrs={"id": "constituents"})
+    except ValueError:
+        return pd.read_html(StringIO(html))
+
+
+def parse_sp500_tickers(html: str) -> list[str]:
+    df = read_constituents_table(html)[0]
+
+    return df["Symbol"].str.replace(".", "-", regex=False).tolist()
+
+
+def parse_nasdaq100_tickers(html: str) -> list[str]:
+    for table in read_constituents_table(html):
+        if "Ticker" in table.columns:
+            return table["Ticker"].tolist()
+        if "Symbol" in table.columns:
+            return table["Symbol"].tolist()
+
+    return []
+
+
+def fetch_constituents(index: str, url: str, parse, cache: ConstituentCache) -> list[str]:
+    """Constituents from the cache while fresh, otherwise revalidated with a conditional GET.
+
+    Falls back to the last good list if the page cannot be fetched or parsed.
+    """
+    if cache.is_fresh(index):
+        return cache.get(index)["tickers"]
+
+    cached = cache.get(index)
+    headers = dict(HEADERS)
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    try:
+        response = requests.get(url, headers=headers, timeout=30)
+        if response.status_code == 304 and cached:
+            cache.touch(index)
+            return cached["tickers"]
+
+        response.raise_for_status()
+        tickers = parse(response.text)
+        if not tickers:
+            raise ValueError("no tickers found")
+
+        cache.put(index, tickers, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+        return tickers
+
+    except Exception as e:
+        if cached:
+            console.print(f"[yellow]  Could not refresh {index} ({str(e)[:60]}), using cached list[/yellow]")
+            return cached["tickers"]
+
+        console.print(f"[red]  Could not fetch {index}: {str(e)[:60]}[/red]")
+        return []
+
+
+def fetch_sp500_tickers(cache: ConstituentCache | None = None) -> list[str]:
+    return fetch_constituents("sp500", SP500_URL, parse_sp500_tickers, cache or ConstituentCache())
+
+
+def fetch_nasdaq100_tickers(cache: ConstituentCache | None = None) -> list[str]:
+    return fetch_constituents("nasdaq100", NASDAQ100_URL, parse_nasdaq100_tickers, cache or ConstituentCache())
+
+
+def get_dynamic_universe(cache: ConstituentCache | None = None) -> list[str]:
+    cache = cache or ConstituentCache()
+
+    console.print("[dim]Fetching S&P 500 and NASDAQ-100 components...[/dim]")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        sp500_future = executor.submit(fetch_sp500_tickers, cache)
+        ndx_future = executor.submit(fetch_nasdaq100_tickers, cache)
+        sp500 = sp500_future.result()
+        ndx = ndx_future.result()
+
+    console.print(f"[dim]  Found {len(sp500)} S&P 500 stocks[/dim]")
+    console.print(f"[dim]  Found {len(ndx)} NASDAQ-100 stocks[/dim]")
+
+    universe = list(set(sp500 + ndx))
+    console.print(f"[dim]  Combined universe: {len(universe)} unique tickers[/dim]\n")
+
+    return universe
+
+
+def calculate_rsi(prices: pd.Series, period: int = 14) -> float:
+    delta = prices.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    rs = gain / loss
+    rsi = 100 - (100 / (1 + rs))
+
+    return rsi.iloc[-1] if not rsi.empty else 50
+
+
+def calculate_streak(prices: pd.Series) -> int:
+    if len(prices) < 2:
+        return 0
+
+    daily_returns = prices.pct_change().dropna()
+    if daily_returns.empty:
+        return 0
+
+    streak = 0
+    direction = None
+
+    for ret in reversed(daily_returns.values):
+        if direction is None:
+            direction = 1 if ret > 0 else -1
+            streak = direction
+        elif (ret > 0 and direction > 0) or (ret < 0 and direction < 0):
+            streak += direction
+        else:
+            break
+
+    return streak
+
+
+def rsi_signal_plain(rsi: float) -> str:
+    if rsi < 30:
+        return "BUY"
+    elif rsi < 40:
+        return "WATCH"
+    elif rsi > 70:
+        return "SELL"
+
+    return "-"
+
+
+def rejection_reason(info: dict) -> str | None:
+    """Which filter an info dict fails, if any. Fields missing from info are not checked."""
+    if "sector" in info and info["sector"] not in TECH_SECTORS:
+        return "sector"
+    if "marketCap" in info and (info["marketCap"] or 0) < MIN_MARKET_CAP:
+        return "market_cap"
+    if "averageVolume" in info and (info["averageVolume"] or 0) < MIN_AVG_VOLUME:
+        return "avg_volume"
+
+    current_price = info.get("currentPrice") or info.get("regularMarketPrice")
+    if current_price is not None and current_price < MIN_PRICE:
+        return "price"
+
+    return None
+
+
+def fetch_fundamentals(ticker: str, provider: DataProvider, cache: FundamentalsCache | None = None) -> dict | None:
+    """Ticker info if it passes the sector, market cap, volume and price filters.
+
+    The price may be missing (e.g. expired in the cache); build_stocks then prices
+    the stock off its latest bar.
+    """
+    info = get_info(ticker, provider, cache)
+
+    return info if screen_reason(info) is None else None
+
+
+def get_info(ticker: str, provider: DataProvider, cache: FundamentalsCache | None = None) -> dict:
+    return cache.get(ticker, provider.info) if cache else provider.info(ticker)
+
+
+def screen_reason(info: dict) -> str | None:
+    """Why a freshly fetched info dict fails the filters; unlike rejection_reason, a missing sector,
+    market cap or volume fails (only the price may be missing)."""
+    if not info.get("sector"):
+        return "sector"
+    if info.get("marketCap") is None:
+        return "market_cap"
+    if info.get("averageVolume") is None:
+        return "avg_volume"
+
+    return rejection_reason(info)
+
+
+def prefilter(
+    universe: list[str],
+    cache: FundamentalsCache,
+    negative: NegativeCache,
+) -> tuple[list[str], Counter]:
+    """Drop tickers that cached metadata or the negative cache already rule out, without any network call."""
+    remaining = []
+    dropped: Counter = Counter()
+    for ticker in universe:
+        if negative.reason(ticker):
+            dropped["negative_cache"] += 1
+            continue
+
+        reason = rejection_reason(cache.fresh(ticker))
+        if reason:
+            dropped[reason] += 1
+            continue
+
+        remaining.append(ticker)
+
+    return remaining, dropped
+
+
+def build_stocks(
+    infos: dict[str, dict],
+    histories: dict[str, pd.DataFrame],
+    qqq_returns_30d: float,
+    indicator_state: IndicatorStore | None = None,
+    ath_index: AthIndex | None = None,
+) -> StockTable:
+    """Turn screened fundamentals plus bar histories into a StockTable, one row per stock.
+
+    Indicators come from indicator_state's per-ticker running state when given,
+    otherwise they are computed for all tickers at once from the full histories.
+    The histories' max is the 52-week high; the all-time high also takes
+    ath_index's stored high into account when given.
+    """
+    histories = {t: hist for t, hist in histories.items() if t in infos and len(hist) >= 30}
+    if not histories:
+        return StockTable.from_stocks([])
+
+    prices = pd.Series({
+        t: infos[t].get("currentPrice") or infos[t].get("regularMarketPrice") or np.nan
+        for t in histories
+    }, dtype="float64")
+    if indicator_state is not None:
+        indicators = indicator_state.compute(histories, prices)
+    else:
+        indicators = compute_indicators(
+            panel_from_histories(histories, "Close"),
+            panel_from_histories(histories, "Volume"),
+            prices,
+        )
+
+    indicators = indicators[~(indicators["price"] < MIN_PRICE)]
+    tickers = indicators.index.tolist()
+    price = indicators["price"].to_numpy(dtype="float64")
+    high_52w = indicators["high_52w"].to_numpy(dtype="float64")
+    ath = np.fmax(ath_index.highs(tickers), high_52w) if ath_index is not None else high_52w
+    rsi = indicators["rsi"].to_numpy(dtype="float64")
+    fair_value = np.array([infos[t].get("targetMeanPrice", 0) or 0 for t in tickers], dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        upside = np.where((fair_value != 0) & (price != 0), (fair_value - price) / price * 100, 0.0)
+        fv_vs_ath = np.where((fair_value != 0) & (ath != 0), (fair_value - ath) / ath * 100, 0.0)
+        pct_from_ath = (price - ath) / ath * 100
+
+    return StockTable({
+        "ticker": tickers,
+        "name": [(infos[t].get("shortName") or t)[:25] for t in tickers],
+        "price": price,
+        "ath": ath,
+        "market_cap": [infos[t].get("marketCap", 0) for t in tickers],
+        "sector": [infos[t].get("sector", "") for t in tickers],
+        "pct_from_ath": pct_from_ath,
+        "change_1d": indicators["change_1d"].to_numpy(),
+        "streak": indicators["streak"].to_numpy(),
+        "rsi": rsi,
+        "roc_30d": indicators["roc_30d"].to_numpy(),
+        "rs_vs_qqq": indicators["roc_30d"].to_numpy() - qqq_returns_30d,
+        "vol_surge": indicators["vol_surge"].to_numpy(),
+        "pct_vs_50dma": indicators["pct_vs_50dma"].to_numpy(),
+        "is_52w_high": indicators["is_52w_high"].to_numpy(),
+        # rsi_signal_plain over the whole column
+        "signal": np.select([rsi < 30, rsi < 40, rsi > 70], ["BUY", "WATCH", "SELL"], "-").astype(object),
+        "fair_value": fair_value,
+        "upside": upside,
+        "rating": [infos[t].get("recommendationKey", "") or "" for t in tickers],
+        "fv_vs_ath": fv_vs_ath,
+        "high_52w": high_52w,
+    })
+
+
+def analyze_stock(
+    ticker: str,
+    qqq_returns_30d: float,
+    provider: DataProvider | None = None,
+    store: BarStore | None = None,
+    cache: FundamentalsCache | None = None,
+    ath_index: AthIndex | None = None,
+) -> Stock | None:
+    provider = provider or YahooProvider()
+    store = store or BarStore()
+    try:
+        info = fetch_fundamentals(ticker, provider, cache)
+        if info is None:
+            return None
+
+        histories = store.sync([ticker], provider)
+        if ath_index is not None:
+            ath_index.refresh(histories, provider)
+        stocks = build_stocks({ticker: info}, histories, qqq_returns_30d, ath_index=ath_index)
+
+        return stocks[0].to_stock() if len(stocks) else None
+
+    except Exception:
+        return None
+
+
+def get_qqq_30d_return(provider: DataProvider | None = None) -> float:
+    provider = provider or YahooProvider()
+    try:
+        return return_30d(provider.history(["QQQ"], period="60d").get("QQQ"))
+    except Exception:
+        pass
+
+    return 0
+
+
+def return_30d(hist: pd.DataFrame | None) -> float:
+    """Percent change over the last 30 bars, or 0 with fewer bars."""
+    if hist is not None and len(hist) >= 30:
+        return ((hist["Close"].iloc[-1] - hist["Close"].iloc[-30]) / hist["Close"].iloc[-30]) * 100
+
+    return 0
+
+
+def save_results(result: ScanResult, output_dir: Path) -> tuple[Path, Path]:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+    json_path = output_dir / f"scan_{timestamp}.json"
+    csv_path = output_dir / f"scan_{timestamp}.csv"
+    write_results(result, json_path, csv_path)
+
+    return json_path, csv_path
+
+
+def write_results(result: ScanResult, json_path: Path, csv_path: Path) -> None:
+    """Write (or rewrite) a scan's JSON and CSV files."""
+    # Save JSON
+    with open(json_path, "w") as f:
+        f.write(dumps_results(result))
+
+    # Save CSV for spreadsheet compatibility
+    all_stocks = [stock for section in result.sections().values() for stock in section]
+    # Deduplicate
+    seen = set()
+    unique_stocks = []
+    for s in all_stocks:
+        if s.ticker not in seen:
+            seen.add(s.ticker)
+            unique_stocks.append(s)
+
+    stocks_frame(unique_stocks).to_csv(csv_path, index=False)
+
+
+def categorize(results: StockTable | list[Stock], qqq_30d: float, screens: tuple[Screen, ...] | None = None) -> ScanResult:
+    """Sort results into the sections of the screens in screens.json."""
+    picks = select(screens or load_screens(), results)
+
+    return ScanResult(
+        timestamp=datetime.now().isoformat(),
+        qqq_30d_return=qqq_30d,
+        total_stocks=len(results),
+        **{section: picks.pop(section, []) for section in SECTIONS},
+        custom=picks,
+    )
+
+
+def publish(
+    scan_result: ScanResult,
+    results: StockTable,
+    skip_ai: bool = False,
+    profiler: Profiler | None = None,
+    archive: Archive | None = None,
+    output_dir: Path = Path("data"),
+    output_format: str = "rich",
+) -> tuple[Path, Path]:
+    """Assess, render, save and archive a scan categorized from results; returns its JSON and CSV paths.
+
+    results is the StockTable of every stock that passed the filters (build_stocks);
+    the summary counts are taken from it.
+
+    Headless output formats (see render.FORMATS) stream the rows to stdout once
+    every AI verdict is in, instead of rendering tables before they land.
+    """
+    profiler = profiler or Profiler()
+    screens = load_screens()
+
+    # Get AI assessments for the AI screens: cached verdicts now, the rest in the
+    # background while the tables render and the results are saved.
+    ai_assessments = {}
+    assessor = None
+    assessed = ai_stocks(scan_result, screens)
+    if not skip_ai:
+        ai_candidates = list({s.ticker: s for s in assessed}.values())
+
+        if ai_candidates:
+            assessor = Assessor()
+            ai_assessments = assessor.start(ai_candidates)
+            if assessor.pending:
+                console.print(f"[dim]AI analysis: {len(ai_assessments)} cached, {len(assessor.pending)} running in background[/dim]\n")
+
+            # Update stocks with AI assessments
+            for stock in assessed:
+                stock.ai_assessment = ai_assessments.get(stock.ticker, "")
+
+    if output_format == "rich":
+        with profiler.stage("render"):
+            render_sections(scan_result, ai_assessments, screens)
+            render_summary(scan_result, results, screens)
+
+    # Save results
+    with profiler.stage("save"):
+        json_path, csv_path = save_results(scan_result, output_dir)
+    console.print("\n[dim]Results saved to:[/dim]")
+    console.print(f"  [dim]JSON: {json_path}[/dim]")
+    console.print(f"  [dim]CSV:  {csv_path}[/dim]")
+
+    if assessor and assessor.pending:
+        with console.status("[bold cyan]Waiting for AI analysis...[/bold cyan]"), profiler.stage("ai"):
+            landed = assessor.wait()
+        for stock in assessed:
+            if stock.ticker in landed:
+                stock.ai_assessment = landed[stock.ticker]
+        with profiler.stage("save"):
+            write_results(scan_result, json_path, csv_path)
+        if output_format == "rich":
+            console.print()
+            render_ai_updates([s for s in assessor.pending if s.ticker in landed])
+        console.print(f"  [dim]AI analysis added to {json_path}[/dim]")
+
+    if output_format != "rich":
+        with profiler.stage("render"):
+            write_sections(scan_result, output_format, screens)
+
+    with profiler.stage("save"):
+        (archive or Archive()).add(scan_result)
+
+    return json_path, csv_path
+
+
+def merge_shards(
+    skip_ai: bool = False,
+    directory: Path = SHARD_DIR,
+    archive: Archive | None = None,
+    output_format: str = "rich",
+    output_dir: Path = Path("data"),
+) -> ScanResult:
+    """Combine a sharded run's results and categorize, render, save and archive them as one scan."""
+    stocks, qqq_30d = read_shards(directory)
+    results = StockTable.from_stocks(stocks)
+    console.print(f"[dim]Merged {len(results)} stocks from {directory}[/dim]\n")
+    scan_result = categorize(results, qqq_30d)
+    if not results:
+        console.print("[red]No stocks matched the criteria.[/red]")
+        return scan_result
+
+    publish(scan_result, results, skip_ai, archive=archive, output_dir=output_dir, output_format=output_format)
+
+    return scan_result
+
+
+@dataclass
+class ScanState:
+    """What a scan fetched: screened fundamentals and bar histories by ticker.
+
+    Watch mode keeps this in memory to refresh without refetching it.
+    """
+    infos: dict[str, dict] = field(default_factory=dict)
+    histories: dict[str, pd.DataFrame] = field(default_factory=dict)
+
+
+def scan(
+    skip_ai: bool = False,
+    provider: DataProvider | None = None,
+    store: BarStore | None = None,
+    cache: FundamentalsCache | None = None,
+    negative: NegativeCache | None = None,
+    scheduler: FetchScheduler | None = None,
+    resume: Checkpoint | None = None,
+    profile: bool = False,
+    archive: Archive | None = None,
+    state: ScanState | None = None,
+    shard: tuple[int, int] | None = None,
+    indicator_state: IndicatorStore | None = None,
+    output_format: str = "rich",
+    ath_index: AthIndex | None = None,
+    output_dir: Path = Path("data"),
+) -> ScanResult:
+    profiler = Profiler()
+    provider = ProfiledProvider(provider or YahooProvider(), profiler)
+    store = store or BarStore()
+    cache = cache or FundamentalsCache()
+    negative = negative or NegativeCache()
+    indicator_state = indicator_state or IndicatorStore()
+    ath_index = ath_index or AthIndex()
+
+    console.print(Panel.fit(
+        f"[bold cyan]BULLISH SCANNER[/bold cyan]\n[dim]{datetime.now().strftime('%Y-%m-%d %H:%M')}[/dim]",
+        border_style="cyan"
+    ))
+
+    with profiler.stage("universe"):
+        universe = provider.universe() or get_dynamic_universe()
+    if shard:
+        universe = in_shard(universe, shard)
+        console.print(f"[dim]Shard {shard[0]}/{shard[1]}: {len(universe)} tickers[/dim]")
+
+    console.print("[dim]Fetching QQQ benchmark...[/dim]")
+    with profiler.stage("qqq"):
+        qqq_30d = get_qqq_30d_return(provider)
+    console.print(f"[dim]QQQ 30-day return: {qqq_30d:+.1f}%[/dim]\n")
+
+    if resume:
+        # Failures of the interrupted run (e.g. throttling) are retried, not skipped as negative.
+        for ticker in resume.failed():
+            negative.discard(ticker)
+    with profiler.stage("prefilter"):
+        universe, dropped = prefilter(universe, cache, negative)
+    for reason, count in dropped.items():
+        profiler.count("prefilter", reason, count)
+    if dropped:
+        summary = ", ".join(f"{reason} {count}" for reason, count in dropped.most_common())
+        console.print(f"[dim]Pre-filter dropped {sum(dropped.values())} tickers ({summary})[/dim]")
+
+    checkpoint = resume or Checkpoint.create(label=run_label(shard))
+    infos: dict[str, dict] = checkpoint.infos()
+    if resume:
+        done = checkpoint.done()
+        universe = [t for t in universe if t not in done]
+        console.print(f"[dim]Resuming {checkpoint.path}: {len(done)} tickers done, {len(universe)} remaining[/dim]")
+
+    scheduler = scheduler or FetchScheduler()
+    failures: Counter = Counter()
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+    ) as progress, profiler.stage("fundamentals"):
+        task = progress.add_task("[cyan]Fetching fundamentals...", total=len(universe))
+
+        try:
+            for fetched in scheduler.run(lambda ticker: get_info(ticker, provider, cache), universe):
+                progress.advance(task)
+                profiler.record("ticker", fetched.latency)
+                if fetched.error is not None:
+                    error = type(fetched.error).__name__
+                    failures[error] += 1
+                    profiler.count("errors", error)
+                    # Throttling or a flaky connection says nothing about the ticker; retry it next run.
+                    if not isinstance(fetched.error, RETRYABLE):
+                        negative.add(fetched.item, f"error: {error}")
+                    checkpoint.append(fetched.item, "failed")
+                    continue
+
+                reason = screen_reason(fetched.value)
+                if reason:
+                    profiler.count("rejections", reason)
+                    checkpoint.append(fetched.item, "rejected")
+                else:
+                    infos[fetched.item] = fetched.value
+                    checkpoint.append(fetched.item, "ok", {k: fetched.value.get(k) for k in FIELD_TTLS})
+        except KeyboardInterrupt:
+            cache.save()
+            negative.save()
+            console.print(f"\n[yellow]Interrupted. Resume with --resume {checkpoint.path}[/yellow]")
+            raise
+
+    if failures:
+        summary = ", ".join(f"{name} {count}" for name, count in failures.most_common())
+        console.print(f"[yellow]{sum(failures.values())} tickers failed after retries ({summary})[/yellow]")
+    if scheduler.stats["throttled"]:
+        console.print(f"[yellow]Throttled {scheduler.stats['throttled']} times, {scheduler.stats['retries']} retries[/yellow]")
+
+    cache.save()
+    console.print(f"[dim]Fundamentals: {cache.hits} cached, {cache.misses} fetched[/dim]")
+
+    with console.status(f"[bold cyan]Syncing price history for {len(infos)} stocks...[/bold cyan]"), profiler.stage("history"):
+        histories = store.sync(list(infos), provider)
+
+    for ticker in infos:
+        if len(histories.get(ticker, ())) < 30:
+            profiler.count("rejections", "short_history")
+            negative.add(ticker, "short_history")
+        else:
+            negative.discard(ticker)
+    negative.save()
+
+    # New tickers are seeded from full history (one batched request); the rest update from the synced bars.
+    with profiler.stage("ath"):
+        ath_index.refresh({t: h for t, h in histories.items() if t in infos}, provider)
+    ath_index.save()
+    profiler.count("ath_index", "seeded", ath_index.seeded)
+    profiler.count("ath_index", "adjusted", ath_index.adjusted)
+
+    if state is not None:
+        state.infos = infos
+        state.histories = histories
+
+    with profiler.stage("indicators"):
+        results = build_stocks(infos, histories, qqq_30d, indicator_state, ath_index)
+    indicator_state.save()
+    profiler.count("indicator_state", "seeded", indicator_state.seeded)
+    profiler.count("indicator_state", "updated", indicator_state.updated)
+    if profile:
+        with profiler.stage("verify"):
+            mismatched = indicator_state.verify({t: h for t, h in histories.items() if t in infos and len(h) >= 30})
+        profiler.count("indicator_state", "mismatched", len(mismatched))
+        if mismatched:
+            console.print(f"[yellow]Indicator state differs from a full recompute for {len(mismatched)} tickers: {', '.join(mismatched[:10])}[/yellow]")
+
+    console.print(f"\n[green]Found {len(results)} tech stocks matching criteria[/green]\n")
+
+    with profiler.stage("categorize"):
+        scan_result = categorize(results, qqq_30d)
+    if shard:
+        # A shard's part of the run is done; --merge categorizes and saves the union.
+        path = write_shard(results, qqq_30d, shard)
+        checkpoint.remove()
+        console.print(f"[dim]Shard results saved to: {path}[/dim]")
+        return scan_result
+    if not results:
+        console.print("[red]No stocks matched the criteria.[/red]")
+        checkpoint.remove()
+        return scan_result
+
+    json_path, _ = publish(scan_result, results, skip_ai, profiler, archive, output_dir, output_format)
+    checkpoint.remove()
+
+    if profile:
+        for name, value in scheduler.stats.items():
+            profiler.count("scheduler", name, value)
+        for name, value in (("hits", cache.hits), ("misses", cache.misses)):
+            profiler.count("fundamentals_cache", name, value)
+        metrics_path = profiler.write(output_dir / json_path.name.replace("scan_", "metrics_"))
+        console.print()
+        profiler.render(console)
+        console.print(f"  [dim]Metrics: {metrics_path}[/dim]")
+
+    return scan_result
@@ -0,0 +1,208 @@
+"""
+Declarative screens.
+
+The scan's sections are defined in screens.json, one object per screen:
+
+    name     section name; the six built-in ones fill ScanResult's fields, any
+             other name becomes a custom section
+    filter   expression over Stock fields, e.g. "roc_30d > 15 and rsi > 55";
+             comparisons, and/or/not, + - * / and number, string or true/false
+             constants
+    sort     Stock field to order picks by, "-field" for descending (optional)
+    limit    keep at most this many picks (optional)
+    title    table title; columns the table's columns (see render.COLUMNS)
+    ai       whether the screen's picks get an AI verdict
+    label    row label in the summary table (optional)
+
+Filters are parsed once into closures that evaluate over whole columns, so
+select() runs every screen as one boolean mask and one stable argsort over the
+columns of a StockTable (see table.py), not as a Python pass per screen.
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import operator
+from dataclasses import dataclass, field, fields
+from functools import lru_cache, reduce
+from pathlib import Path
+from typing import Any, Callable, Mapping
+
+from results import Stock
+
+SCREENS_PATH = Path(__file__).with_name("screens.json")
+STOCK_FIELDS = {f.name for f in fields(Stock)}
+DEFAULT_COLUMNS = ("Ticker", "Name", "Price", "%ATH", "FV", "%FV", "FV%ATH", "Rating", "RSI", "Signal")
+
+_COMPARISONS = {
+    ast.Lt: operator.lt, ast.LtE: operator.le, ast.Gt: operator.gt,
+    ast.GtE: operator.ge, ast.Eq: operator.eq, ast.NotEq: operator.ne,
+}
+_ARITHMETIC = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv}
+_CONSTANTS = {"true": True, "false": False}
+
+# Column arrays by field name -> an array (or a scalar, for constant subexpressions)
+Evaluator = Callable[[Mapping[str, Any]], Any]
+
+
+class ScreenError(ValueError):
+    """A screen definition or filter expression is invalid."""
+
+
+def compile_filter(expression: str) -> tuple[Evaluator, frozenset[str]]:
+    """An evaluator over column arrays for a filter expression, and the fields it reads."""
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError as e:
+        raise ScreenError(f"invalid filter {expression!r}: {e.msg}") from None
+
+    names: set[str] = set()
+    evaluator = _compile(tree.body, expression, names)
+
+    return evaluator, frozenset(names)
+
+
+def _compile(node: ast.AST, expression: str, names: set[str]) -> Evaluator:
+    if isinstance(node, ast.BoolOp):
+        parts = [_compile(value, expression, names) for value in node.values]
+        combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+        # != 0 makes a numeric operand (e.g. "streak and ...") a mask of its truthiness, so & and | stay logical.
+        return lambda columns: reduce(combine, (part(columns) != 0 for part in parts))
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub)):
+        operand = _compile(node.operand, expression, names)
+        if isinstance(node.op, ast.Not):
+            # Not ~: that flips the bits of a numeric operand ("not 1" would be -2).
+            return lambda columns: operand(columns) == 0
+        return lambda columns: -operand(columns)
+
+    if isinstance(node, ast.Compare) and all(type(op) in _COMPARISONS for op in node.ops):
+        # a < b < c is (a < b) and (b < c), elementwise
+        operands = [_compile(value, expression, names) for value in [node.left, *node.comparators]]
+        ops = [_COMPARISONS[type(op)] for op in node.ops]
+
+        def compare(columns):
+            values = [operand(columns) for operand in operands]
+            return reduce(operator.and_, (op(a, b) for op, a, b in zip(ops, values, values[1:])))
+
+        return compare
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+        left = _compile(node.left, expression, names)
+        right = _compile(node.right, expression, names)
+        op = _ARITHMETIC[type(node.op)]
+        return lambda columns: op(left(columns), right(columns))
+
+    if isinstance(node, ast.Name):
+        if node.id in _CONSTANTS:
+            value = _CONSTANTS[node.id]
+            return lambda columns: value
+        if node.id not in STOCK_FIELDS:
+            raise ScreenError(f"unknown field {node.id!r} in filter {expression!r}")
+        names.add(node.id)
+        return lambda columns: columns[node.id]
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str, bool)):
+        value = node.value
+        return lambda columns: value
+
+    raise ScreenError(f"unsupported syntax {ast.get_source_segment(expression, node)!r} in filter {expression!r}")
+
+
+@dataclass(frozen=True)
+class Screen:
+    name: str
+    title: str
+    filter: str
+    sort: str = ""
+    limit: int | None = None
+    columns: tuple[str, ...] = DEFAULT_COLUMNS
+    ai: bool = False
+    label: str = ""
+    evaluate: Evaluator = field(default=None, repr=False, compare=False)
+    fields: frozenset[str] = field(default=frozenset(), repr=False, compare=False)
+
+    @property
+    def sort_field(self) -> str:
+        return self.sort.lstrip("-")
+
+    @property
+    def descending(self) -> bool:
+        return self.sort.startswith("-")
+
+
+def make_screen(definition: dict) -> Screen:
+    """A Screen from one screens.json object, with its filter compiled."""
+    name = definition.get("name", "")
+    if not name.isidentifier():
+        raise ScreenError(f"screen name must be an identifier: {name!r}")
+    unknown = set(definition) - {"name", "title", "filter", "sort", "limit", "columns", "ai", "label"}
+    if unknown:
+        raise ScreenError(f"screen {name!r}: unknown keys {', '.join(sorted(unknown))}")
+
+    evaluate, names = compile_filter(definition.get("filter", "true"))
+    sort = definition.get("sort", "")
+    if sort and sort.lstrip("-") not in STOCK_FIELDS:
+        raise ScreenError(f"screen {name!r}: unknown sort field {sort!r}")
+
+    return Screen(
+        name=name,
+        title=definition.get("title", name),
+        filter=definition.get("filter", "true"),
+        sort=sort,
+        limit=definition.get("limit"),
+        columns=tuple(definition.get("columns", DEFAULT_COLUMNS)),
+        ai=bool(definition.get("ai", False)),
+        label=definition.get("label", ""),
+        evaluate=evaluate,
+        fields=names | ({sort.lstrip("-")} if sort else set()),
+    )
+
+
+@lru_cache(maxsize=None)
+def load_screens(path: Path = SCREENS_PATH) -> tuple[Screen, ...]:
+    """The screens defined in a screens.json file, compiled; cached per path."""
+    with open(path) as f:
+        definitions = json.load(f)
+
+    screens = tuple(make_screen(definition) for definition in definitions)
+    names = [screen.name for screen in screens]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ScreenError(f"{path}: duplicate screen names {', '.join(duplicates)}")
+
+    return screens
+
+
+def select(screens: tuple[Screen, ...], stocks: list[Stock]) -> dict[str, list[Stock]]:
+    """Each screen's picks from stocks (a StockTable, or a list made into one), filtered, sorted (stably) and limited.
+
+    Picks are the table's row views.
+    """
+    # numpy is only needed here, so loading the screens for rendering stays light.
+    import numpy as np
+
+    from table import as_table
+
+    stocks = as_table(stocks)
+    count = len(stocks)
+    columns = stocks.columns
+
+    picks = {}
+    for screen in screens:
+        mask = np.broadcast_to(np.asarray(screen.evaluate(columns), dtype=bool), (count,))
+        index = np.flatnonzero(mask)
+        if screen.sort:
+            key = columns[screen.sort_field][index]
+            if screen.descending:
+                # Stable descending: ties keep their input order, as with sorted(key=-x).
+                order = (len(key) - 1 - np.argsort(key[::-1], kind="stable"))[::-1]
+            else:
+                order = np.argsort(key, kind="stable")
+            index = index[order]
+        if screen.limit is not None:
+            index = index[:screen.limit]
+        picks[screen.name] = stocks.rows(index)
+
+    return picks
@@ -0,0 +1,183 @@
+"""
+Local HTTP JSON API over saved scans.
+
+    GET /scans                              every saved scan: id, timestamp, total_stocks
+    GET /scans/<id|latest>                  a full scan, sections as lists of stocks
+    GET /scans/<id|latest>/<section>        one section
+    GET /scans/<id|latest>/stocks/<TICKER>  one stock, with the sections it is in
+    GET /tickers/<TICKER>/history           the ticker's rows across archived scans
+
+A scan's id is its file name without "scan_" and ".json" (e.g. 20260205_1033).
+Each scan file is parsed once, when it first appears in the data directory, and
+every response for it is serialized and hashed right then; requests are served
+from those bytes. Every response carries an ETag, and a matching If-None-Match
+gets an empty 304.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from archive import ARCHIVE_PATH, Archive
+from results import ScanResult, json_safe, load_results
+
+DEFAULT_PORT = 8765
+# How often the data directory is re-listed for new scans, at most.
+REFRESH_INTERVAL = 1.0
+
+
+@dataclass(frozen=True)
+class Response:
+    body: bytes
+    etag: str
+
+
+def make_response(payload) -> Response:
+    body = json.dumps(json_safe(payload), separators=(",", ":"), allow_nan=False).encode()
+
+    return Response(body, f'"{hashlib.sha1(body).hexdigest()}"')
+
+
+def scan_responses(scan_id: str, result: ScanResult) -> dict[str, Response]:
+    """Every response for one scan, keyed by request path."""
+    data = asdict(result)
+    responses = {f"/scans/{scan_id}": make_response(data)}
+
+    memberships: dict[str, list[str]] = {}
+    stocks: dict[str, dict] = {}
+    for section, section_stocks in result.sections().items():
+        rows = [asdict(stock) for stock in section_stocks]
+        responses[f"/scans/{scan_id}/{section}"] = make_response(rows)
+        for stock in rows:
+            stocks.setdefault(stock["ticker"], stock)
+            memberships.setdefault(stock["ticker"], []).append(section)
+
+    for ticker, stock in stocks.items():
+        responses[f"/scans/{scan_id}/stocks/{ticker}"] = make_response({**stock, "sections": memberships[ticker]})
+
+    return responses
+
+
+class ScanIndex:
+    """Pre-serialized responses for every scan file in a directory, kept current as scans are saved."""
+
+    def __init__(self, data_dir: Path = Path("data"), archive_path: Path = ARCHIVE_PATH):
+        self.data_dir = Path(data_dir)
+        self.archive_path = Path(archive_path)
+        self.responses: dict[str, Response] = {}
+        self.latest: str | None = None
+        # path -> (mtime, listing entry, responses) for every parsed scan file
+        self._scans: dict[Path, tuple[float, dict, dict[str, Response]]] = {}
+        self._refreshed = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> None:
+        """Pick up new, changed and deleted scan files; at most every REFRESH_INTERVAL unless forced."""
+        now = time.monotonic()
+        if not force and now - self._refreshed < REFRESH_INTERVAL:
+            return
+
+        with self._lock:
+            self._refreshed = now
+            current = {path: path.stat().st_mtime for path in sorted(self.data_dir.glob("scan_*.json"))}
+            if current == {path: scan[0] for path, scan in self._scans.items()}:
+                return
+
+            scans = {}
+            for path, mtime in current.items():
+                if path in self._scans and self._scans[path][0] == mtime:
+                    scans[path] = self._scans[path]
+                    continue
+                try:
+                    result = load_results(path)
+                except (OSError, json.JSONDecodeError, KeyError, TypeError):
+                    continue
+                scan_id = path.stem.removeprefix("scan_")
+                entry = {"id": scan_id, "timestamp": result.timestamp, "total_stocks": result.total_stocks}
+                scans[path] = (mtime, entry, scan_responses(scan_id, result))
+
+            # History responses are dropped too: a new scan may have added archive rows.
+            responses = {}
+            for _, _, by_path in scans.values():
+                responses.update(by_path)
+            listing = [entry for _, entry, _ in scans.values()]
+            responses["/scans"] = make_response(listing)
+
+            self._scans = scans
+            self.responses = responses
+            self.latest = listing[-1]["id"] if listing else None
+
+    def get(self, path: str) -> Response | None:
+        self.refresh()
+        path = path.rstrip("/") or "/"
+        if self.latest and (path == "/scans/latest" or path.startswith("/scans/latest/")):
+            path = f"/scans/{self.latest}" + path[len("/scans/latest"):]
+
+        response = self.responses.get(path)
+        if response is None and path.startswith("/tickers/") and path.endswith("/history"):
+            response = self._history(path)
+
+        return response
+
+    def _history(self, path: str) -> Response | None:
+        ticker = path[len("/tickers/"):-len("/history")].upper()
+        if not ticker or "/" in ticker or not self.archive_path.exists():
+            return None
+
+        # sqlite connections are per thread; opening one is cheap next to the query.
+        archive = Archive(self.archive_path)
+        try:
+            history = archive.history(ticker)
+        finally:
+            archive.close()
+        if not history:
+            return None
+
+        response = make_response(history)
+        with self._lock:
+            self.responses[path] = response
+
+        return response
+
+
+class Handler(BaseHTTPRequestHandler):
+    # Keep-alive, so polling clients reuse their connection.
+    protocol_version = "HTTP/1.1"
+    index: ScanIndex
+
+    def do_GET(self) -> None:
+        response = self.index.get(self.path.split("?", 1)[0])
+        if response is None:
+            self._send(404, make_response({"error": f"not found: {self.path}"}))
+        elif response.etag in self.headers.get("If-None-Match", ""):
+            self._send(304, response, body=False)
+        else:
+            self._send(200, response)
+
+    def _send(self, status: int, response: Response, body: bool = True) -> None:
+        self.send_response(status)
+        self.send_header("ETag", response.etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if body:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(response.body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(response.body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def make_server(index: ScanIndex, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    handler = type("ScanHandler", (Handler,), {"index": index})
+    index.refresh(force=True)
+
+    return ThreadingHTTPServer((host, port), handler)
@@ -0,0 +1,143 @@
+"""
+Sharded scans.
+
+`scan.py --shard K/N` scans only the tickers whose stable hash lands in shard K
+of N and writes their stocks to data/shards/shard_KofN.json instead of
+categorizing and saving. Once every shard of a run has written its file,
+`scan.py --merge` combines them, categorizes the union and saves a single scan,
+exactly as an unsharded run would. `scan.py --shards N` runs all N shards as
+local processes and merges them.
+
+A ticker's shard depends only on its symbol and N, so shards can run on
+different machines and every run of shard K sees the same tickers (and keeps
+its own warm fundamentals cache).
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+from results import STOCK_COLUMNS, Stock, decode_stocks, dumps_json, encode_stocks
+
+SHARD_DIR = Path("data") / "shards"
+SCAN_SCRIPT = Path(__file__).resolve().with_name("scan.py")
+
+
+class ShardError(Exception):
+    """Shard files are missing or don't belong to the same run."""
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """(K, N) from "K/N", with 1 <= K <= N."""
+    try:
+        k, n = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"expected K/N, e.g. 2/4: {value!r}") from None
+    if not 1 <= k <= n:
+        raise ValueError(f"shard must be between 1/{n} and {n}/{n}: {value!r}")
+
+    return k, n
+
+
+def shard_of(ticker: str, n: int) -> int:
+    """The 1-based shard ticker belongs to out of n; the same on every machine and run."""
+    return zlib.crc32(ticker.encode()) % n + 1
+
+
+def in_shard(tickers: Iterable[str], shard: tuple[int, int]) -> list[str]:
+    k, n = shard
+
+    return [t for t in tickers if shard_of(t, n) == k]
+
+
+def shard_file(path: Path, shard: tuple[int, int]) -> Path:
+    """A per-shard variant of a cache file, e.g. fundamentals.json -> fundamentals.shard2of4.json."""
+    k, n = shard
+
+    return path.with_name(f"{path.stem}.shard{k}of{n}{path.suffix}")
+
+
+def shard_path(shard: tuple[int, int], directory: Path = SHARD_DIR) -> Path:
+    k, n = shard
+
+    return directory / f"shard_{k}of{n}.json"
+
+
+def write_shard(stocks: list[Stock], qqq_30d: float, shard: tuple[int, int], directory: Path = SHARD_DIR) -> Path:
+    """Write a shard's stocks; an empty shard still writes its file so the merge knows it finished."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = shard_path(shard, directory)
+    data = {
+        "shard": shard[0],
+        "shards": shard[1],
+        "timestamp": datetime.now().isoformat(),
+        "qqq_30d_return": qqq_30d,
+        "columns": STOCK_COLUMNS,
+        "stocks": encode_stocks(stocks),
+    }
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(dumps_json(data))
+    tmp.replace(path)
+
+    return path
+
+
+def read_shards(directory: Path = SHARD_DIR) -> tuple[list[Stock], float]:
+    """Every stock of the most recent sharded run, in shard order, and the run's QQQ 30-day return.
+
+    The run's shard count is taken from the newest shard file. Raises ShardError
+    if any of its shards is missing or the shards were scanned on different days.
+    """
+    paths = list(directory.glob("shard_*of*.json"))
+    if not paths:
+        raise ShardError(f"No shard files in {directory}")
+    with open(max(paths, key=lambda p: p.stat().st_mtime)) as f:
+        n = json.load(f)["shards"]
+
+    missing = [k for k in range(1, n + 1) if not shard_path((k, n), directory).exists()]
+    if missing:
+        raise ShardError(f"Missing shard {', '.join(f'{k}/{n}' for k in missing)} in {directory}")
+
+    shards = []
+    for k in range(1, n + 1):
+        with open(shard_path((k, n), directory)) as f:
+            shards.append(json.load(f))
+
+    days = sorted({data["timestamp"][:10] for data in shards})
+    if len(days) > 1:
+        stale = [f"{data['shard']}/{n}" for data in shards if data["timestamp"][:10] != days[-1]]
+        raise ShardError(f"Shards are from different days; rerun shard {', '.join(stale)}")
+
+    stocks = [stock for data in shards for stock in decode_stocks(data["columns"], data["stocks"]).values()]
+
+    return stocks, shards[0]["qqq_30d_return"]
+
+
+def launch(n: int, args: list[str] | None = None) -> list[int]:
+    """Run shards 1..n of a scan as parallel local processes; returns the shards that failed.
+
+    Each shard's console output goes to shard_KofN.log next to its results.
+    """
+    SHARD_DIR.mkdir(parents=True, exist_ok=True)
+    for k in range(1, n + 1):
+        shard_path((k, n)).unlink(missing_ok=True)
+
+    processes = {}
+    for k in range(1, n + 1):
+        log = open(SHARD_DIR / f"shard_{k}of{n}.log", "w")
+        command = [sys.executable, str(SCAN_SCRIPT), "--shard", f"{k}/{n}", *(args or [])]
+        processes[k] = (subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT), log)
+
+    failed = []
+    for k, (process, log) in processes.items():
+        if process.wait() != 0:
+            failed.append(k)
+        log.close()
+
+    return failed
@@ -0,0 +1,384 @@
+"""
+On-disk caches for the scanner.
+
+BarStore keeps daily OHLCV bars as one columnar .npz file per ticker so a scan
+only has to download the bars newer than the last stored date. FundamentalsCache
+keeps the few `info` fields the scan uses, each with its own expiry,
+ConstituentCache keeps the last good index-constituent lists, NegativeCache
+remembers tickers that recently failed so they are not retried on every run and
+AssessmentCache keeps AI verdicts until the inputs they were based on change.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from providers import DataProvider
+
+CACHE_DIR = Path("data") / "cache"
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Relative close difference on an already stored, completed bar that means
+# Yahoo re-adjusted the series (split or dividend) and the stored copy is stale.
+ADJUSTMENT_TOLERANCE = 1e-4
+
+# How long each cached `info` field stays valid. Prices expire quickly; when they
+# are stale the scan falls back to the latest bar's close.
+FIELD_TTLS = {
+    "sector": timedelta(days=30),
+    "shortName": timedelta(days=30),
+    "marketCap": timedelta(days=1),
+    "averageVolume": timedelta(days=1),
+    "targetMeanPrice": timedelta(hours=6),
+    "recommendationKey": timedelta(hours=6),
+    "currentPrice": timedelta(minutes=15),
+    "regularMarketPrice": timedelta(minutes=15),
+}
+PRICE_FIELDS = {"currentPrice", "regularMarketPrice"}
+
+
+def normalize_bars(df: pd.DataFrame) -> pd.DataFrame:
+    """Strip timezone/time-of-day from the index and keep only OHLCV columns."""
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+
+    bars = df[BAR_COLUMNS].astype("float64")
+    bars.index = index.normalize()
+
+    return bars[~bars.index.duplicated(keep="last")].sort_index()
+
+
+def merge_bars(old: pd.DataFrame, new: pd.DataFrame, lookback: timedelta = timedelta(days=365)) -> pd.DataFrame:
+    """old with new's bars appended; new wins where they overlap (e.g. today's partial bar)."""
+    new = normalize_bars(new)
+    merged = pd.concat([old[old.index < new.index[0]], new])
+    since = pd.Timestamp(date.today() - lookback)
+
+    return merged[merged.index >= since]
+
+
+def write_json_atomic(path: Path, data) -> None:
+    """Write data as compact JSON to path via a pid-suffixed temp file, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+class BarStore:
+    """Daily bars partitioned by ticker: <root>/<TICKER>.npz with one array per column."""
+
+    def __init__(self, root: Path = CACHE_DIR / "bars"):
+        self.root = Path(root)
+
+    def path(self, ticker: str) -> Path:
+        return self.root / f"{ticker.upper()}.npz"
+
+    def load(self, ticker: str, since: date | None = None) -> pd.DataFrame | None:
+        path = self.path(ticker)
+        if not path.exists():
+            return None
+
+        with np.load(path) as data:
+            index = pd.DatetimeIndex(data["date"].astype("datetime64[ns]"))
+            bars = pd.DataFrame({col: data[col] for col in BAR_COLUMNS}, index=index)
+
+        if since is not None:
+            bars = bars[bars.index >= pd.Timestamp(since)]
+
+        return bars
+
+    def write(self, ticker: str, bars: pd.DataFrame) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.path(ticker)
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+
+        arrays = {col: bars[col].to_numpy(dtype="float64") for col in BAR_COLUMNS}
+        arrays["date"] = bars.index.to_numpy().astype("datetime64[D]")
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+
+    def append(self, ticker: str, new: pd.DataFrame, stored: pd.DataFrame | None = None) -> pd.DataFrame:
+        """Merge new bars into the stored series, new values winning on overlapping dates."""
+        new = normalize_bars(new)
+        if stored is None:
+            stored = self.load(ticker)
+        if stored is not None:
+            new = pd.concat([stored[stored.index < new.index[0]], new]) if not new.empty else stored
+
+        self.write(ticker, new)
+
+        return new
+
+    def sync(
+        self,
+        tickers: list[str],
+        provider: DataProvider,
+        lookback: timedelta = timedelta(days=365),
+        period: str = "1y",
+    ) -> dict[str, pd.DataFrame]:
+        """Bring tickers' bars up to date and return the trailing lookback window of each.
+
+        Tickers are grouped by fetch start so the provider sees a few batched
+        requests instead of one per ticker. The last stored bar is always refetched
+        because it may have been a partial intraday bar. The fetch starts one bar
+        earlier, at the last bar that was already complete when stored: a mismatch
+        on it means the series was re-adjusted, so that ticker is reseeded.
+        """
+        since = pd.Timestamp(date.today() - lookback)
+        stored = {ticker: self.load(ticker) for ticker in tickers}
+
+        seed = [t for t, bars in stored.items() if bars is None or bars.empty]
+        by_start = defaultdict(list)
+        for ticker, bars in stored.items():
+            if ticker not in seed:
+                by_start[bars.index[-2 if len(bars) > 1 else -1].date()].append(ticker)
+
+        result = {}
+        for start, group in by_start.items():
+            fetched = provider.history(group, start=start)
+            for ticker in group:
+                old = stored[ticker]
+                new = fetched.get(ticker)
+                if new is None or new.empty:
+                    result[ticker] = old
+                    continue
+
+                new = normalize_bars(new)
+                # The last stored bar may have been partial; the one before it was complete.
+                if len(old) > 1 and old.index[-2] in new.index:
+                    anchor = old.index[-2]
+                    old_close = old["Close"].iloc[-2]
+                    if abs(new.at[anchor, "Close"] - old_close) > ADJUSTMENT_TOLERANCE * abs(old_close):
+                        seed.append(ticker)
+                        continue
+
+                result[ticker] = self.append(ticker, new, old)
+
+        if seed:
+            for ticker, bars in provider.history(seed, period=period).items():
+                bars = normalize_bars(bars)
+                self.write(ticker, bars)
+                result[ticker] = bars
+
+        return {ticker: bars[bars.index >= since] for ticker, bars in result.items()}
+
+
+class FundamentalsCache:
+    """Persistent per-field TTL cache for ticker `info` dicts.
+
+    Stored as {ticker: {field: [value, fetched_at_epoch]}}. A ticker's info is only
+    refetched once one of its non-price fields has expired.
+    """
+
+    def __init__(self, path: Path = CACHE_DIR / "fundamentals.json", ttls: dict[str, timedelta] = FIELD_TTLS):
+        self.path = Path(path)
+        self.ttls = {name: ttl.total_seconds() for name, ttl in ttls.items()}
+        self.entries: dict[str, dict[str, list]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            with open(self.path) as f:
+                self.entries = json.load(f)
+
+    def fresh(self, ticker: str, now: float | None = None) -> dict:
+        """Cached fields for ticker that have not expired yet; fields Yahoo did not report are left out."""
+        now = now or time.time()
+        entry = self.entries.get(ticker, {})
+
+        return {
+            name: value
+            for name, (value, fetched_at) in entry.items()
+            if value is not None and name in self.ttls and now - fetched_at < self.ttls[name]
+        }
+
+    def known(self, ticker: str) -> dict:
+        """Every cached non-price field for ticker, however old: the fundamentals of its last scan."""
+        return {
+            name: value
+            for name, (value, _) in self.entries.get(ticker, {}).items()
+            if value is not None and name not in PRICE_FIELDS
+        }
+
+    def expired(self, ticker: str, now: float | None = None) -> list[str]:
+        """Non-price fields that are missing or past their TTL."""
+        now = now or time.time()
+        entry = self.entries.get(ticker, {})
+
+        return [
+            name for name, ttl in self.ttls.items()
+            if name not in PRICE_FIELDS and (name not in entry or now - entry[name][1] >= ttl)
+        ]
+
+    def get(self, ticker: str, fetch: Callable[[str], dict]) -> dict:
+        now = time.time()
+        if not self.expired(ticker, now):
+            with self._lock:
+                self.hits += 1
+
+            return self.fresh(ticker, now)
+
+        fetched = fetch(ticker)
+        with self._lock:
+            self.misses += 1
+            self.entries[ticker] = {name: [fetched.get(name), now] for name in self.ttls}
+            self._dirty = True
+
+        return fetched
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+
+        with self._lock:
+            write_json_atomic(self.path, self.entries)
+            self._dirty = False
+
+
+class ConstituentCache:
+    """Index constituent lists plus the HTTP validators they were fetched with.
+
+    Stored as {index: {"tickers": [...], "etag": ..., "last_modified": ..., "checked_at": epoch}}.
+    """
+
+    def __init__(self, path: Path = CACHE_DIR / "universe.json", max_age: timedelta = timedelta(days=1)):
+        self.path = Path(path)
+        self.max_age = max_age.total_seconds()
+        self.entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            with open(self.path) as f:
+                self.entries = json.load(f)
+
+    def get(self, index: str) -> dict | None:
+        return self.entries.get(index)
+
+    def is_fresh(self, index: str) -> bool:
+        entry = self.entries.get(index)
+
+        return entry is not None and time.time() - entry["checked_at"] < self.max_age
+
+    def put(self, index: str, tickers: list[str], etag: str | None = None, last_modified: str | None = None) -> None:
+        with self._lock:
+            self.entries[index] = {
+                "tickers": tickers,
+                "etag": etag,
+                "last_modified": last_modified,
+                "checked_at": time.time(),
+            }
+            self._save()
+
+    def touch(self, index: str) -> None:
+        """Mark a cached list as revalidated (HTTP 304)."""
+        with self._lock:
+            self.entries[index]["checked_at"] = time.time()
+            self._save()
+
+    def _save(self) -> None:
+        write_json_atomic(self.path, self.entries)
+
+
+class NegativeCache:
+    """Tickers that errored or lacked history, skipped until their entry expires.
+
+    Stored as {ticker: {"reason": ..., "strikes": n, "until": epoch}}. Each repeat
+    failure doubles the expiry, up to max_ttl, so dead symbols fade out of the scan.
+    """
+
+    def __init__(
+        self,
+        path: Path = CACHE_DIR / "negative.json",
+        ttl: timedelta = timedelta(days=1),
+        max_ttl: timedelta = timedelta(days=30),
+    ):
+        self.path = Path(path)
+        self.ttl = ttl.total_seconds()
+        self.max_ttl = max_ttl.total_seconds()
+        self.entries: dict[str, dict] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            with open(self.path) as f:
+                self.entries = json.load(f)
+
+    def reason(self, ticker: str, now: float | None = None) -> str | None:
+        """Why ticker is being skipped, or None if it should be fetched."""
+        entry = self.entries.get(ticker)
+        if entry is None or (now or time.time()) >= entry["until"]:
+            return None
+
+        return entry["reason"]
+
+    def add(self, ticker: str, reason: str) -> None:
+        with self._lock:
+            strikes = self.entries.get(ticker, {}).get("strikes", 0) + 1
+            ttl = min(self.ttl * 2 ** (strikes - 1), self.max_ttl)
+            self.entries[ticker] = {"reason": reason, "strikes": strikes, "until": time.time() + ttl}
+            self._dirty = True
+
+    def discard(self, ticker: str) -> None:
+        with self._lock:
+            if self.entries.pop(ticker, None) is not None:
+                self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+
+        with self._lock:
+            write_json_atomic(self.path, self.entries)
+            self._dirty = False
+
+
+class AssessmentCache:
+    """Last AI verdict per ticker with the key it was made under.
+
+    Stored as {ticker: {"key": ..., "verdict": ...}}; a verdict is reused only while
+    the caller's key for the ticker (date plus the inputs the verdict depends on)
+    is unchanged.
+    """
+
+    def __init__(self, path: Path = CACHE_DIR / "assessments.json"):
+        self.path = Path(path)
+        self.entries: dict[str, dict] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            with open(self.path) as f:
+                self.entries = json.load(f)
+
+    def get(self, ticker: str, key: str) -> str | None:
+        entry = self.entries.get(ticker)
+
+        return entry["verdict"] if entry and entry["key"] == key else None
+
+    def put(self, ticker: str, key: str, verdict: str) -> None:
+        with self._lock:
+            self.entries[ticker] = {"key": key, "verdict": verdict}
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+
+        with self._lock:
+            write_json_atomic(self.path, self.entries)
+            self._dirty = False
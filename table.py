@@ -0,0 +1,130 @@
+"""
+Columnar scan results.
+
+A StockTable holds a scan's stocks as one typed NumPy array per Stock field
+instead of one dataclass (and one __dict__) per ticker. Screens filter and sort
+its columns directly, and the CSV export slices them into a DataFrame.
+
+StockRow is a __slots__ view of one row that reads and writes the table's
+columns, with Stock's attribute names, so code written against Stock (build_row,
+the AI prompt, the scan file encoder) works with it unchanged. Setting an
+attribute on a row (e.g. ai_assessment) writes the table, so every section
+showing that ticker sees it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import fields
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+
+from results import STOCK_FIELD_NAMES as FIELDS, Stock, stock_values
+
+DTYPES = {
+    f.name: {"float": np.float64, "int": np.int64, "bool": np.bool_}.get(str(f.type), object)
+    for f in fields(Stock)
+}
+# Yahoo reports market caps as ints; keep them as given so scan files don't change.
+DTYPES["market_cap"] = object
+
+
+class StockRow:
+    """One row of a StockTable, read and written through Stock's attribute names."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: StockTable, index: int):
+        object.__setattr__(self, "_table", table)
+        object.__setattr__(self, "_index", index)
+
+    def __getattr__(self, name: str):
+        try:
+            column = self._table.columns[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+        # item() gives a plain Python value, not a NumPy scalar.
+        return column.item(self._index)
+
+    def __setattr__(self, name: str, value) -> None:
+        if name not in self._table.columns:
+            raise AttributeError(name)
+        self._table.columns[name][self._index] = value
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (Stock, StockRow)):
+            return NotImplemented
+
+        return all(getattr(self, name) == getattr(other, name) for name in FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"StockRow({self.ticker!r}, row={self._index})"
+
+    def to_stock(self) -> Stock:
+        return Stock(**stock_values(self))
+
+
+class StockTable(Sequence):
+    """Struct-of-arrays table of stocks: columns[field] is an array with one entry per stock."""
+
+    def __init__(self, columns: dict[str, np.ndarray]):
+        count = len(columns["ticker"])
+        self.columns = {}
+        for name in FIELDS:
+            values = columns.get(name)
+            if values is None:
+                default = Stock.__dataclass_fields__[name].default
+                values = np.full(count, default, dtype=DTYPES[name])
+            self.columns[name] = np.asarray(values, dtype=DTYPES[name])
+        self._rows: list[StockRow] | None = None
+
+    @classmethod
+    def from_stocks(cls, stocks: Iterable[Stock]) -> StockTable:
+        stocks = list(stocks)
+
+        return cls({name: [getattr(stock, name) for stock in stocks] for name in FIELDS})
+
+    def __len__(self) -> int:
+        return len(self.columns["ticker"])
+
+    def __getitem__(self, index: int) -> StockRow:
+        return self._all_rows()[index]
+
+    def __iter__(self) -> Iterator[StockRow]:
+        return iter(self._all_rows())
+
+    def _all_rows(self) -> list[StockRow]:
+        # One view per row, made once: sections picking the same stock share its view, as they shared its Stock.
+        if self._rows is None:
+            self._rows = [StockRow(self, i) for i in range(len(self))]
+        return self._rows
+
+    def rows(self, indices: Iterable[int]) -> list[StockRow]:
+        rows = self._all_rows()
+        if isinstance(indices, np.ndarray):
+            indices = indices.tolist()
+        return [rows[i] for i in indices]
+
+    def frame(self, indices: np.ndarray | None = None) -> pd.DataFrame:
+        """The table (or the given rows) as a DataFrame with Stock's columns."""
+        if indices is None:
+            return pd.DataFrame(self.columns)
+
+        return pd.DataFrame({name: column[indices] for name, column in self.columns.items()})
+
+
+def as_table(stocks: Iterable[Stock]) -> StockTable:
+    return stocks if isinstance(stocks, StockTable) else StockTable.from_stocks(stocks)
+
+
+def stocks_frame(stocks: list) -> pd.DataFrame:
+    """A DataFrame of stocks with Stock's columns; rows of one StockTable are sliced from its columns."""
+    tables = {id(stock._table) for stock in stocks if isinstance(stock, StockRow)}
+    if stocks and len(tables) == 1 and all(isinstance(stock, StockRow) for stock in stocks):
+        return stocks[0]._table.frame(np.array([stock._index for stock in stocks], dtype=np.intp))
+
+    return pd.DataFrame([stock_values(stock) for stock in stocks], columns=FIELDS)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import os
+import stat
+import sys
+from pathlib import Path
+
+import scanner
+from ai import Assessor, assessment_key
+from conftest import make_stock
+from results import get_latest_scan
+from scan_test import make_provider
+from store import AssessmentCache, BarStore
+
+STUB = """#!{python}
+import os, re, sys
+prompt = sys.argv[sys.argv.index("-p") + 1]
+tickers = re.findall(r"^([A-Z]+) \\(", prompt, re.M)
+with open(os.environ["STUB_CALLS"], "a") as f:
+    f.write(" ".join(tickers) + "\\n")
+if "FAIL" in tickers:
+    sys.stderr.write("boom")
+    sys.exit(1)
+for ticker in tickers:
+    print(f"{{ticker}}: WAIT - stub verdict for {{ticker}}")
+"""
+
+
+def install_stub(tmp_path, monkeypatch) -> Path:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    claude = bin_dir / "claude"
+    claude.write_text(STUB.format(python=sys.executable))
+    claude.chmod(claude.stat().st_mode | stat.S_IEXEC)
+    calls = tmp_path / "calls.txt"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("STUB_CALLS", str(calls))
+
+    return calls
+
+
+def call_log(calls: Path) -> list[list[str]]:
+    return [line.split() for line in calls.read_text().splitlines()] if calls.exists() else []
+
+
+def test_key_ignores_small_moves_but_not_material_ones():
+    stock = make_stock("AAA", price=100.0, pct_from_ath=-31.0, rating="buy")
+
+    assert assessment_key(stock) == assessment_key(make_stock("AAA", price=100.5, pct_from_ath=-31.0, rating="buy"))
+    assert assessment_key(stock) != assessment_key(make_stock("AAA", price=110.0, pct_from_ath=-31.0, rating="buy"))
+    assert assessment_key(stock) != assessment_key(make_stock("AAA", price=100.0, pct_from_ath=-36.0, rating="buy"))
+    assert assessment_key(stock) != assessment_key(make_stock("AAA", price=100.0, pct_from_ath=-31.0, rating="hold"))
+
+
+def test_chunks_run_in_parallel_and_verdicts_are_cached(tmp_path, monkeypatch):
+    calls = install_stub(tmp_path, monkeypatch)
+    stocks = [make_stock(ticker) for ticker in ("AAA", "BBB", "CCC", "DDD", "EEE")]
+
+    assessor = Assessor(AssessmentCache(tmp_path / "ai.json"), chunk_size=2)
+    assert assessor.start(stocks) == {}
+    verdicts = assessor.wait()
+
+    assert verdicts["CCC"] == "WAIT - stub verdict for CCC"
+    assert sorted(len(chunk) for chunk in call_log(calls)) == [1, 2, 2]
+
+    again = Assessor(AssessmentCache(tmp_path / "ai.json"), chunk_size=2)
+    assert again.start(stocks)["EEE"] == "WAIT - stub verdict for EEE"
+    assert again.pending == []
+    assert len(call_log(calls)) == 3
+
+
+def test_failed_chunk_only_affects_its_own_tickers_and_is_not_cached(tmp_path, monkeypatch):
+    install_stub(tmp_path, monkeypatch)
+    cache = AssessmentCache(tmp_path / "ai.json")
+    assessor = Assessor(cache, chunk_size=1)
+    assessor.start([make_stock("AAA"), make_stock("FAIL")])
+
+    verdicts = assessor.wait()
+
+    assert verdicts["AAA"].startswith("WAIT")
+    assert verdicts["FAIL"] == "CLI error: boom"
+    assert set(json.loads((tmp_path / "ai.json").read_text())) == {"AAA"}
+
+
+def test_scan_saves_first_and_updates_saved_results_with_verdicts(tmp_path, monkeypatch):
+    calls = install_stub(tmp_path, monkeypatch)
+    monkeypatch.chdir(tmp_path)
+
+    result = scanner.scan(provider=make_provider(), store=BarStore(tmp_path / "bars"))
+
+    saved = json.loads(get_latest_scan(tmp_path / "data").read_text())
+    verdicts = {t: row[saved["columns"].index("ai_assessment")] for t, row in saved["stocks"].items()}
+    candidates = {s.ticker for s in result.watchlist + result.big_drops + result.down_streaks}
+    assert candidates
+    assert all(verdicts[t].startswith("WAIT - stub") for t in candidates)
+    assert len(call_log(calls)) == 1
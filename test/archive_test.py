@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import math
+from dataclasses import replace
+from pathlib import Path
+
+from archive import Archive
+from conftest import make_result, make_stock
+from results import load_results
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def test_round_trips_sections_in_order(tmp_path):
+    archive = Archive(tmp_path / "archive.sqlite")
+    a, b = make_stock("AAA", pct_from_ath=-50.0), make_stock("BBB", ai_assessment="BUY - cheap", is_52w_high=True)
+    result = make_result("2026-02-04T16:03:00", [a, b], big_drops=[b])
+
+    run_id = archive.add(result)
+
+    assert archive.load(run_id) == result
+    assert archive.add(result) is None
+
+
+def test_find_latest_run_by_timestamp_prefix(tmp_path):
+    archive = Archive(tmp_path / "archive.sqlite")
+    for timestamp in ("2026-02-04T09:30:00", "2026-02-04T16:03:00", "2026-02-05T10:33:00"):
+        archive.add(make_result(timestamp, [make_stock("AAA")]))
+
+    assert archive.load(archive.find("2026-02-04")).timestamp == "2026-02-04T16:03:00"
+    assert archive.load(archive.find("2026-02-04T09")).timestamp == "2026-02-04T09:30:00"
+    assert archive.find("2026-02-06") is None
+    assert len(archive.runs(start="2026-02-04", end="2026-02-05")) == 2
+
+
+def test_history_reports_section_membership_per_run(tmp_path):
+    archive = Archive(tmp_path / "archive.sqlite")
+    stock = make_stock("NVDA")
+    archive.add(make_result("2026-02-04T16:00:00", [stock]))
+    archive.add(make_result("2026-02-05T16:00:00", [], big_drops=[replace(stock, price=90.0)]))
+    archive.add(make_result("2026-02-06T16:00:00", [make_stock("AAA")]))
+
+    history = archive.history("NVDA")
+
+    assert [row["sections"] for row in history] == [["watchlist"], ["big_drops"]]
+    assert history[1]["price"] == 90.0
+    assert len(archive.history("NVDA", start="2026-02-05")) == 1
+
+
+def test_import_files_is_idempotent(tmp_path):
+    archive = Archive(tmp_path / "archive.sqlite")
+    paths = sorted(DATA_DIR.glob("scan_*.json"))
+
+    # The two earliest scans in data/ were truncated mid-write and are skipped.
+    assert archive.import_files(paths) == len(paths) - 2
+    assert archive.import_files(paths) == 0
+
+    latest = load_results(paths[-1])
+    assert archive.load(archive.find(latest.timestamp)) == latest
+
+
+def test_archives_created_before_a_new_stock_field_get_its_column(tmp_path):
+    path = tmp_path / "archive.sqlite"
+    archive = Archive(path)
+    old_run = archive.add(make_result("2026-02-04T16:00:00", [make_stock("AAA")]))
+    archive.db.execute("ALTER TABLE stocks DROP COLUMN high_52w")
+    archive.db.execute("ALTER TABLE runs DROP COLUMN fields")
+    archive.db.commit()
+    archive.close()
+
+    archive = Archive(path)
+    run_id = archive.add(make_result("2026-02-05T16:00:00", [make_stock("AAA", high_52w=140.0)]))
+
+    assert archive.load(run_id).watchlist[0].high_52w == 140.0
+    assert archive.load(old_run).watchlist[0].high_52w == 0.0
+
+
+def test_round_trips_nan_indicators(tmp_path):
+    archive = Archive(tmp_path / "archive.sqlite")
+    run_id = archive.add(make_result("2026-02-04T16:00:00", [make_stock("FLAT", rsi=float("nan"), upside=float("nan"))]))
+
+    stock = archive.load(run_id).watchlist[0]
+    assert math.isnan(stock.rsi) and math.isnan(stock.upside)
+    assert stock.fair_value == make_stock("FLAT").fair_value
+    assert math.isnan(archive.history("FLAT")[0]["rsi"])
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+import scanner
+from ath import AthIndex
+from conftest import make_bars, make_info
+from providers import LocalProvider
+from store import BarStore
+
+
+class CountingProvider(LocalProvider):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.periods: list[str] = []
+
+    def history(self, tickers, start=None, period="1y"):
+        self.periods.append(period if start is None else "delta")
+        return super().history(tickers, start, period)
+
+
+def test_seeded_once_from_full_history_then_updated_from_new_bars(tmp_path):
+    bars = make_bars(900, seed=11)
+    bars.iloc[100, bars.columns.get_loc("Close")] = 500.0  # an old peak, years back
+    provider = CountingProvider({"T": make_info("T", 100.0)}, {"T": bars.iloc[:-5]})
+    store = BarStore(tmp_path / "bars")
+    path = tmp_path / "ath.json"
+
+    index = AthIndex(path)
+    index.refresh(store.sync(["T"], provider), provider)
+    index.save()
+    assert provider.periods == ["1y", "max"]
+    assert index.get("T") == 500.0 and index.seeded == 1
+
+    # Five more days, the last one a new high: no full-history request, and the
+    # stored high only takes the bars before the (possibly partial) latest one.
+    provider.bars["T"] = bars.copy()
+    provider.bars["T"].iloc[-2, bars.columns.get_loc("Close")] = 600.0
+    provider.periods.clear()
+    index = AthIndex(path)
+    index.refresh(store.sync(["T"], provider), provider)
+    assert provider.periods == ["delta"]
+    assert (index.get("T"), index.seeded, index.updated) == (600.0, 0, 1)
+
+
+def test_split_rescales_the_stored_high(tmp_path):
+    bars = make_bars(400, seed=12)
+    index = AthIndex(tmp_path / "ath.json")
+    index.seed("T", bars)
+    high = index.get("T")
+
+    # A 4:1 split re-adjusts every close; one new bar since.
+    new_bar = bars.iloc[[-1]].set_axis([bars.index[-1] + pd.offsets.BDay()])
+    split = pd.concat([bars.iloc[-300:], new_bar])
+    split["Close"] /= 4
+
+    assert index.update("T", split)
+    assert index.get("T") == pytest.approx(max(high, bars["Close"].iloc[-1]) / 4)
+    assert index.adjusted == 1
+
+    # An anchor that fell out of the window needs a reseed.
+    assert not index.update("T", split.iloc[-50:-20])
+
+
+def test_build_stocks_separates_ath_from_52_week_high(tmp_path):
+    bars = make_bars(260, seed=13)
+    index = AthIndex(tmp_path / "ath.json")
+    index.entries["T"] = {"ath": 1000.0, "date": bars.index[-2].date().isoformat(), "close": float(bars["Close"].iloc[-2])}
+    price = float(bars["Close"].iloc[-1])
+
+    stock = scanner.build_stocks({"T": make_info("T", price)}, {"T": bars}, 0.0, ath_index=index)[0]
+
+    assert stock.high_52w == bars["Close"].max()
+    assert stock.ath == 1000.0
+    assert stock.pct_from_ath == pytest.approx((price - 1000.0) / 10)
+    assert stock.fv_vs_ath == pytest.approx((price * 1.2 - 1000.0) / 10)
+    assert scanner.build_stocks({"T": make_info("T", price)}, {"T": bars}, 0.0)[0].ath == stock.high_52w
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+import scan
+from backtest import backtest, indicator_panels, run_backtest, screen_masks, streak_panel
+from conftest import make_bars
+from indicators import compute_indicators
+from providers import LocalProvider
+
+
+def make_panel(tickers: int = 8, days: int = 200) -> tuple[pd.DataFrame, pd.DataFrame]:
+    bars = {f"T{i}": make_bars(days, seed=i) for i in range(tickers)}
+
+    return pd.DataFrame({t: b["Close"] for t, b in bars.items()}), pd.DataFrame({t: b["Volume"] for t, b in bars.items()})
+
+
+def test_last_day_matches_the_scan_indicators():
+    close, volume = make_panel()
+    close.iloc[:40, 0] = np.nan  # listed later than the others
+    panels = indicator_panels(close)
+    full = compute_indicators(close, volume)
+
+    for column in ("pct_from_ath", "change_1d", "streak", "rsi", "roc_30d"):
+        assert np.allclose(panels[column].iloc[-1].to_numpy(float), full[column].to_numpy(float), equal_nan=True), column
+
+
+def test_streak_panel_matches_calculate_streak_on_every_day():
+    close = make_bars(80, seed=5)["Close"]
+    close.iloc[30:33] = close.iloc[29]  # flat days
+    streaks = streak_panel(close.to_frame().pct_change())
+
+    for day in range(2, len(close) + 1):
+        assert streaks.iloc[day - 1, 0] == scan.calculate_streak(close.iloc[:day])
+
+
+def test_report_counts_the_screens_picks():
+    close, _ = make_panel(days=300)
+    masks = screen_masks(indicator_panels(close))
+    report = backtest(close, horizons=(5,))
+
+    # Picks in the last 5 days have no forward return yet.
+    for screen, mask in masks.items():
+        assert report.loc[(screen, 5), "signals"] == mask.iloc[:-5].to_numpy().sum()
+    assert abs(report.loc[("universe", 5), "excess"]) < 1e-9
+    assert (masks["down_streaks"].sum(axis=1) <= 15).all()
+
+
+def test_run_backtest_offline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    bars = {f"T{i}": make_bars(300, seed=i) for i in range(4)}
+    provider = LocalProvider({}, bars)
+    provider.universe = lambda: list(bars)
+
+    report = run_backtest(1, provider=provider, output_dir=tmp_path)
+
+    assert set(report.index.unique("screen")) >= {"watchlist", "parabolic", "rsi_buy", "universe"}
+    assert list(tmp_path.glob("backtest_*.csv"))
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from bench import bench_size, compare
+
+
+def test_bench_size_times_every_stage():
+    results = bench_size(20, repeat=1)
+
+    for name in ("calculate_rsi", "calculate_streak", "compute_indicators", "indicator_update", "analyze_stock",
+                 "categorize", "build_row", "render", "render_ndjson", "save_results", "load_results"):
+        assert results[name]["seconds"] >= 0
+    assert results["scan_file_bytes"]["bytes"] > 0
+
+
+def test_compare_flags_only_slowdowns_past_threshold():
+    baseline = {"results": {"500": {"render": {"seconds": 1.0}, "categorize": {"seconds": 1.0}}}}
+    current = {"results": {"500": {"render": {"seconds": 1.5}, "categorize": {"seconds": 1.1}, "new": {"seconds": 9.0}}}}
+
+    regressions = compare(current, baseline, threshold=0.25)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("render @ 500")
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from results import ScanResult, Stock
+
+
+def make_bars(days: int, end: date | None = None, start_price: float = 100.0, seed: int | None = None) -> pd.DataFrame:
+    """Business-day OHLCV bars ending at end; a straight line unless a random seed is given."""
+    end = end or date.today()
+    index = pd.bdate_range(end=end, periods=days)
+    if seed is None:
+        close = start_price + np.arange(days, dtype=float)
+    else:
+        rng = np.random.default_rng(seed)
+        close = start_price * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+
+    return pd.DataFrame({
+        "Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+        "Volume": np.full(days, 1_000_000.0),
+    }, index=index)
+
+
+def make_info(ticker: str, price: float, sector: str = "Technology") -> dict:
+    return {
+        "sector": sector,
+        "shortName": f"{ticker} Inc",
+        "marketCap": 50_000_000_000,
+        "averageVolume": 2_000_000,
+        "currentPrice": price,
+        "targetMeanPrice": price * 1.2,
+        "recommendationKey": "buy",
+    }
+
+
+def make_stock(ticker: str, **overrides) -> Stock:
+    values = dict(
+        ticker=ticker, name=f"{ticker} Inc", price=100.0, ath=150.0, market_cap=5e9, sector="Technology",
+        pct_from_ath=-33.3, change_1d=-6.0, streak=-3, rsi=25.0, roc_30d=-10.0, rs_vs_qqq=-8.0,
+        vol_surge=1.4, pct_vs_50dma=-12.0, is_52w_high=False,
+    )
+    values.update(overrides)
+
+    return Stock(**values)
+
+
+def make_result(timestamp: str, watchlist: list[Stock], big_drops: list[Stock] | None = None) -> ScanResult:
+    return ScanResult(
+        timestamp=timestamp, qqq_30d_return=1.5, total_stocks=10, watchlist=watchlist,
+        big_drops=big_drops or [], big_gains=[], down_streaks=[], up_streaks=[], parabolic=[],
+    )
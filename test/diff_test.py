@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import io
+import json
+
+from archive import Archive
+from conftest import make_result, make_stock
+from diff import Event, diff, scans_to_compare, write_events
+from results import dumps_results
+
+
+def test_reports_section_moves_rsi_crosses_and_ai_flips():
+    old = make_result("2026-02-04T16:00:00", [
+        make_stock("AAA", rsi=35.0, ai_assessment="WAIT - earnings"),
+        make_stock("BBB", rsi=float("nan")),
+        make_stock("CCC", rsi=68.0),
+    ])
+    new = make_result("2026-02-05T16:00:00", [
+        make_stock("AAA", rsi=25.0, ai_assessment="BUY - oversold"),
+        make_stock("BBB", rsi=20.0),
+        make_stock("DDD"),
+    ], big_drops=[make_stock("AAA")])
+
+    assert diff(old, new) == [
+        Event("entered", "DDD", "watchlist"),
+        Event("entered", "AAA", "big_drops"),
+        Event("left", "CCC", "watchlist"),
+        Event("rsi_cross", "AAA", level=30, before=35.0, after=25.0),
+        Event("ai_flip", "AAA", before="WAIT", after="BUY"),
+    ]
+    assert diff(new, new) == []
+
+
+def test_compares_the_latest_run_with_its_predecessor(tmp_path):
+    archive = Archive(tmp_path / "archive.sqlite")
+    for day, tickers in (("04", ["AAA"]), ("05", ["AAA", "BBB"]), ("06", ["BBB"])):
+        archive.add(make_result(f"2026-02-{day}T16:00:00", [make_stock(t) for t in tickers]))
+
+    old, new = scans_to_compare([], archive)
+    assert (old.timestamp, new.timestamp) == ("2026-02-05T16:00:00", "2026-02-06T16:00:00")
+    old, new = scans_to_compare(["2026-02-05"], archive)
+    assert [e.ticker for e in diff(old, new)] == ["BBB"]
+    old, new = scans_to_compare(["2026-02-06", "2026-02-04"], archive)
+    assert old.timestamp == "2026-02-06T16:00:00"
+
+    out = io.StringIO()
+    write_events(diff(old, new), old, new, "ndjson", out=out)
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [(row["kind"], row["ticker"], row["to"]) for row in rows] == [
+        ("entered", "AAA", "2026-02-04T16:00:00"), ("left", "BBB", "2026-02-04T16:00:00"),
+    ]
+
+
+def test_file_against_archived_run_keeps_custom_sections(tmp_path):
+    old = make_result("2026-02-04T16:00:00", [make_stock("AAA")])
+    old.custom = {"cheap": [make_stock("AAA"), make_stock("BBB")], "empty": []}
+    new = make_result("2026-02-05T16:00:00", [make_stock("AAA")])
+    new.custom = {"cheap": [make_stock("BBB")], "empty": [make_stock("CCC")]}
+    path = tmp_path / "scan_20260205_1600.json"
+    path.write_text(dumps_results(new))
+    archive = Archive(tmp_path / "archive.sqlite")
+    archive.add(old)
+
+    old, new = scans_to_compare(["2026-02-04", str(path)], archive)
+
+    assert old.custom == {"cheap": [make_stock("AAA"), make_stock("BBB")], "empty": []}
+    assert diff(old, new) == [Event("entered", "CCC", "empty"), Event("left", "AAA", "cheap")]
+    assert [row["sections"] for row in archive.history("AAA")] == [["watchlist", "cheap"]]
+
+
+def test_sections_only_one_scan_has_are_not_diffed():
+    old = make_result("2026-02-04T16:00:00", [make_stock("AAA")])
+    new = make_result("2026-02-05T16:00:00", [make_stock("AAA")])
+    new.custom = {"added_screen": [make_stock("AAA"), make_stock("BBB")]}
+
+    assert diff(old, new) == []
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from conftest import make_info
+from fetcher import FetchScheduler, TokenBucket
+from providers import FlakyProvider, LocalProvider
+
+
+def make_flaky(**kwargs) -> FlakyProvider:
+    infos = {f"T{i}": make_info(f"T{i}", 50.0) for i in range(60)}
+
+    return FlakyProvider(LocalProvider(infos, {}), **kwargs)
+
+
+def test_backs_off_under_concurrency_throttling_and_completes_everything():
+    provider = make_flaky(latency=0.01, max_concurrent=4)
+    scheduler = FetchScheduler(workers=12, min_workers=1, rate=1000, max_rate=1000, backoff=0.01, max_retries=8)
+
+    results = list(scheduler.run(provider.info, provider.universe()))
+
+    assert len(results) == 60
+    assert all(r.error is None for r in results)
+    assert provider.throttled > 0
+    assert scheduler.stats["throttled"] == provider.throttled
+    assert scheduler.limit.limit < 12
+
+
+def test_retries_transient_errors_and_reports_hard_failures():
+    provider = make_flaky(error_rate=0.3, seed=1)
+    scheduler = FetchScheduler(rate=1000, max_rate=1000, backoff=0.001, max_retries=6)
+
+    results = {r.item: r for r in scheduler.run(provider.info, provider.universe() + ["NOPE"])}
+
+    assert scheduler.stats["retries"] > 0
+    assert all(results[t].error is None for t in provider.universe())
+    assert isinstance(results["NOPE"].error, KeyError)
+    assert scheduler.stats["failed"] == 1
+
+
+def test_does_not_retry_non_transient_errors():
+    provider = make_flaky()
+    scheduler = FetchScheduler(rate=1000, backoff=0.001)
+
+    [result] = scheduler.run(provider.info, ["NOPE"])
+
+    assert isinstance(result.error, KeyError)
+    assert result.attempts == 1
+    assert scheduler.stats["retries"] == 0
+
+
+def test_token_bucket_paces_after_burst():
+    now = [0.0]
+    bucket = TokenBucket(rate=2, burst=2, clock=lambda: now[0])
+    bucket.acquire()
+    bucket.acquire()
+
+    assert bucket.tokens < 1
+    now[0] += 0.5
+    bucket.acquire()
+    assert bucket.tokens < 1
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from conftest import make_bars
+from incremental import IndicatorStore
+from indicators import compute_indicators
+
+
+def full_recompute(bars: pd.DataFrame) -> pd.Series:
+    return compute_indicators(bars[["Close"]].rename(columns={"Close": "T"}), bars[["Volume"]].rename(columns={"Volume": "T"})).loc["T"]
+
+
+def test_daily_updates_match_a_full_recompute(tmp_path):
+    bars = make_bars(300, seed=7)
+    # flat days and a missing volume exercise the streak and volume edge cases
+    bars.iloc[200:203, bars.columns.get_loc("Close")] = bars["Close"].iloc[199]
+    bars.iloc[290, bars.columns.get_loc("Volume")] = np.nan
+    path = tmp_path / "indicators.json"
+
+    for end in range(200, 301):
+        store = IndicatorStore(path)
+        window = bars.iloc[max(0, end - 252):end]
+        row = store.compute({"T": window}).loc["T"]
+        assert store.verify({"T": window}) == []
+        assert row["streak"] == full_recompute(window)["streak"]
+        store.save()
+
+    assert (store.seeded, store.updated) == (0, 1)
+
+
+def test_flat_bar_after_down_days_extends_the_down_streak(tmp_path):
+    bars = make_bars(60, seed=3)
+    # A flat close counts as down, like calculate_streak: 13.9 -> 14.0 is up, then three down.
+    bars.iloc[-5:, bars.columns.get_loc("Close")] = [13.9, 14.0, 13.5, 13.0, 13.0]
+    path = tmp_path / "indicators.json"
+
+    for end in range(55, 61):
+        store = IndicatorStore(path)
+        row = store.compute({"T": bars.iloc[:end]}).loc["T"]
+        assert store.verify({"T": bars.iloc[:end]}) == []
+        store.save()
+
+    assert row["streak"] == full_recompute(bars)["streak"] == -3
+
+
+def test_revised_partial_bar_and_readjusted_series(tmp_path):
+    bars = make_bars(120, seed=3)
+    store = IndicatorStore(tmp_path / "indicators.json")
+    store.compute({"T": bars})
+
+    # Today's partial bar moved: only the unsaved latest bar changes.
+    revised = bars.copy()
+    revised.iloc[-1, revised.columns.get_loc("Close")] *= 1.05
+    assert store.verify({"T": revised}) == []
+    assert store.seeded == 1
+
+    # A 2:1 split re-adjusts every close, so the stored state no longer matches and is reseeded.
+    split = bars.copy()
+    split["Close"] /= 2
+    assert store.verify({"T": split}) == []
+    assert store.seeded == 2
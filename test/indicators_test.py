@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_bars
+from indicators import compute_indicators, panel_from_histories
+
+import scan
+
+
+def reference(close: pd.Series, volume: pd.Series, price: float) -> dict:
+    """The per-ticker math from analyze_stock before the engine existed."""
+    avg_vol_20d = volume.iloc[-20:].mean()
+
+    return {
+        "rsi": scan.calculate_rsi(close),
+        "streak": scan.calculate_streak(close),
+        "ath": close.max(),
+        "pct_from_ath": (price - close.max()) / close.max() * 100,
+        "change_1d": (price - close.iloc[-2]) / close.iloc[-2] * 100,
+        "roc_30d": (price - close.iloc[-30]) / close.iloc[-30] * 100 if len(close) >= 30 else 0,
+        "vol_surge": volume.iloc[-1] / avg_vol_20d if avg_vol_20d > 0 else 1,
+        "pct_vs_50dma": (price - close.iloc[-50:].mean()) / close.iloc[-50:].mean() * 100 if len(close) >= 50 else 0,
+        "is_52w_high": price >= close.max() * 0.98,
+    }
+
+
+def test_matches_per_ticker_functions():
+    rng = np.random.default_rng(7)
+    histories = {}
+    for i in range(40):
+        bars = make_bars(int(rng.integers(20, 260)), seed=i)
+        bars["Volume"] = rng.integers(1, 5_000_000, len(bars)).astype(float)
+        if i % 3 == 0:
+            bars = bars.drop(bars.index[rng.integers(0, len(bars) - 1, 5)])
+        if i % 5 == 0:
+            bars.iloc[-4:, bars.columns.get_loc("Close")] = bars["Close"].iloc[-5]
+        histories[f"T{i}"] = bars
+
+    prices = pd.Series({t: bars["Close"].iloc[-1] * 1.01 for t, bars in histories.items()})
+    result = compute_indicators(
+        panel_from_histories(histories, "Close"),
+        panel_from_histories(histories, "Volume"),
+        prices,
+    )
+
+    for ticker, bars in histories.items():
+        expected = reference(bars["Close"], bars["Volume"], prices[ticker])
+        row = result.loc[ticker]
+        for name, value in expected.items():
+            assert row[name] == pytest.approx(value, rel=1e-9, nan_ok=True), (ticker, name)
+
+
+def test_edge_cases_match_reference():
+    close = pd.Series([10.0, 10.0, 10.0])
+    panel = pd.DataFrame({"FLAT": close, "ONE": [np.nan, np.nan, 5.0]})
+    result = compute_indicators(panel, panel)
+
+    assert result.at["FLAT", "streak"] == scan.calculate_streak(close)
+    assert np.isnan(result.at["FLAT", "rsi"]) and np.isnan(scan.calculate_rsi(close))
+    assert result.at["ONE", "streak"] == 0
+    assert result.at["ONE", "bars"] == 1
+
+    short = make_bars(14, seed=3)["Close"].reset_index(drop=True)
+    padded = pd.concat([pd.Series([np.nan] * 6), short], ignore_index=True)
+    result = compute_indicators(padded.to_frame("SHORT"), padded.to_frame("SHORT"))
+    assert result.at["SHORT", "rsi"] == pytest.approx(scan.calculate_rsi(short))
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from profiler import Profiler, percentile
+
+
+def test_percentile_uses_nearest_rank():
+    values = sorted(float(v) for v in range(1, 101))
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 90) == 0.0
+
+
+def test_summary_collects_stages_latencies_and_counters():
+    profiler = Profiler()
+    with profiler.stage("history"):
+        pass
+    for seconds in (0.1, 0.2, 0.3):
+        profiler.record("info", seconds)
+    profiler.count("errors", "RateLimitError")
+    profiler.count("errors", "RateLimitError")
+
+    summary = profiler.summary()
+
+    assert "history" in summary["stages"]
+    assert summary["latencies"]["info"]["count"] == 3
+    assert summary["latencies"]["info"]["max"] == 0.3
+    assert summary["counters"]["errors"] == {"RateLimitError": 2}
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import pytest
+
+import scanner
+from ath import AthIndex
+from conftest import make_bars, make_info
+from incremental import IndicatorStore
+from providers import LocalProvider
+from quotes import refresh_quotes
+from store import BarStore, FundamentalsCache, NegativeCache
+
+
+class CountingProvider(LocalProvider):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.calls: list[str] = []
+
+    def info(self, ticker):
+        self.calls.append("info")
+        return super().info(ticker)
+
+    def history(self, tickers, start=None, period="1y"):
+        self.calls.append(f"history {period}" if start is None else "history delta")
+        return super().history(tickers, start, period)
+
+
+def test_reprices_from_quotes_against_stored_history(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    bars = {"DOWN": make_bars(260, seed=1), "UP": make_bars(260, seed=2), "QQQ": make_bars(260, seed=4)}
+    # Today's bar is a 12% drop for DOWN.
+    close = bars["DOWN"].columns.get_loc("Close")
+    bars["DOWN"].iloc[-1, close] = bars["DOWN"]["Close"].iloc[-2] * 0.88
+    infos = {t: make_info(t, bars[t]["Close"].iloc[-2]) for t in ("DOWN", "UP")}
+    yesterday = {t: b.iloc[:-1] for t, b in bars.items()}
+    caches = dict(
+        store=BarStore(tmp_path / "bars"),
+        cache=FundamentalsCache(tmp_path / "fundamentals.json"),
+        negative=NegativeCache(tmp_path / "negative.json"),
+        indicator_state=IndicatorStore(tmp_path / "indicators.json"),
+        ath_index=AthIndex(tmp_path / "ath.json"),
+    )
+    scanner.scan(skip_ai=True, provider=LocalProvider(infos, yesterday), **caches)
+
+    provider = CountingProvider(infos, bars)
+    result = refresh_quotes(skip_ai=True, provider=provider, **caches)
+
+    assert provider.calls == ["history 1d", "history 60d"]
+    assert [s.ticker for s in result.big_drops] == ["DOWN"]
+    full = scanner.build_stocks({t: {"sector": "Technology"} for t in infos}, bars, result.qqq_30d_return)
+    expected = {stock.ticker: stock for stock in full}
+    picked = {stock.ticker: stock for section in result.sections().values() for stock in section}
+    assert picked
+    for ticker, stock in picked.items():
+        reference = expected[ticker]
+        for field in ("price", "change_1d", "pct_from_ath", "roc_30d", "vol_surge", "rsi", "streak"):
+            assert getattr(stock, field) == pytest.approx(getattr(reference, field)), field
+    # The quote only lives in memory; the next full scan syncs the store.
+    assert caches["store"].load("DOWN").index[-1] == bars["DOWN"].index[-2]
+
+
+def test_history_behind_by_several_sessions_is_synced_not_bridged_by_the_quote(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    bars = {"UP": make_bars(260, seed=2), "QQQ": make_bars(260, seed=4)}
+    close = bars["UP"].columns.get_loc("Close")
+    bars["UP"].iloc[-1, close] = bars["UP"]["Close"].iloc[-2] * 0.88
+    infos = {"UP": make_info("UP", bars["UP"]["Close"].iloc[-4])}
+    caches = dict(
+        store=BarStore(tmp_path / "bars"),
+        cache=FundamentalsCache(tmp_path / "fundamentals.json"),
+        negative=NegativeCache(tmp_path / "negative.json"),
+        indicator_state=IndicatorStore(tmp_path / "indicators.json"),
+        ath_index=AthIndex(tmp_path / "ath.json"),
+    )
+    scanner.scan(skip_ai=True, provider=LocalProvider(infos, {t: b.iloc[:-3] for t, b in bars.items()}), **caches)
+
+    provider = CountingProvider(infos, bars)
+    result = refresh_quotes(skip_ai=True, provider=provider, **caches)
+
+    assert provider.calls == ["history 1d", "history 60d", "history delta"]
+    assert caches["store"].load("UP").index[-1] == bars["UP"].index[-1]
+    [reference] = scanner.build_stocks({"UP": {"sector": "Technology"}}, bars, result.qqq_30d_return)
+    [stock] = result.big_drops
+    for field in ("price", "change_1d", "roc_30d", "rsi", "streak"):
+        assert getattr(stock, field) == pytest.approx(getattr(reference, field)), field
+
+
+def test_nothing_cached(tmp_path):
+    assert refresh_quotes(
+        skip_ai=True, provider=LocalProvider({}, {}), store=BarStore(tmp_path / "bars"),
+        cache=FundamentalsCache(tmp_path / "fundamentals.json"), negative=NegativeCache(tmp_path / "negative.json"),
+    ) is None
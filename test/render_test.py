@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from rich.text import Text
+
+from conftest import make_result, make_stock
+from render import COLUMNS, build_row, write_sections
+from results import STOCK_FIELD_NAMES
+
+ROOT = Path(__file__).parent.parent
+
+
+def stocks() -> list:
+    return [
+        make_stock("AAA", rating="strong_buy", fair_value=180.0, upside=80.0, fv_vs_ath=20.0, is_52w_high=True),
+        make_stock("BBB", streak=0, rsi=float("nan"), name="Pipe | Co", ai_assessment="WAIT - earnings"),
+    ]
+
+
+def test_rich_and_plain_cells_show_the_same_text():
+    for stock in stocks():
+        for name, column in COLUMNS.items():
+            assert column.field in STOCK_FIELD_NAMES
+            assert Text.from_markup(column.formatters["rich"](stock)).plain == column.formatters["plain"](stock), name
+            assert column.formatters["csv"](stock) is getattr(stock, column.field)
+
+    columns = [(name, column.width) for name, column in COLUMNS.items()]
+    assert build_row(stocks()[0], columns)[0] == "[bold white]AAA[/bold white]"
+
+
+def test_headless_formats_stream_every_section():
+    result = make_result("2026-02-05T10:33:00", stocks(), big_drops=stocks()[:1])
+
+    def write(output_format: str) -> str:
+        out = io.StringIO()
+        write_sections(result, output_format, out=out)
+        return out.getvalue()
+
+    rows = [json.loads(line) for line in write("ndjson").splitlines()]
+    assert [(row["section"], row["ticker"]) for row in rows] == [("watchlist", "AAA"), ("watchlist", "BBB"), ("big_drops", "AAA")]
+    assert rows[1]["rsi"] is None and rows[1]["ai_assessment"] == "WAIT - earnings"
+
+    table = list(csv.DictReader(io.StringIO(write("csv"))))
+    assert [row["ticker"] for row in table] == ["AAA", "BBB", "AAA"]
+    assert table[0]["is_52w_high"] == "True"
+
+    markdown = write("markdown")
+    assert "| BBB | Pipe \\| Co |" in markdown
+    assert markdown.count("_No stocks_") == 4
+
+    plain = write("plain").splitlines()
+    assert plain[:2] == ["📉 WATCHLIST - 20%+ Below ATH", "Ticker\tName\tPrice\tATH\t%ATH\tFV\t%FV\tFV%ATH\tRating\tRSI\tSignal\tAI"]
+    assert plain[3].split("\t")[-2:] == ["-", "WAIT - earnings"]
+
+
+def test_load_streams_only_rows_to_stdout():
+    scan_file = sorted((ROOT / "data").glob("scan_*.json"))[-1]
+    output = subprocess.run(
+        [sys.executable, "scan.py", "--load", str(scan_file), "--format", "ndjson"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+
+    assert output and all(json.loads(line)["ticker"] for line in output.splitlines())
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+
+from conftest import make_result, make_stock
+from results import SECTIONS, decode_results, dumps_results, encode_results, load_results
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def test_v2_stores_each_stock_once_and_round_trips():
+    shared = make_stock("BBB", ai_assessment="WAIT - earnings")
+    result = make_result("2026-02-05T10:33:00", [make_stock("AAA"), shared], big_drops=[shared])
+
+    document = json.loads(dumps_results(result))
+
+    assert document["version"] == 2
+    assert list(document["stocks"]) == ["AAA", "BBB"]
+    assert document["sections"]["big_drops"] == ["BBB"]
+    loaded = decode_results(document)
+    assert loaded == result
+    assert loaded.big_drops[0] is loaded.watchlist[1]
+
+
+def test_v2_unwraps_numpy_scalars_and_tolerates_column_changes():
+    result = make_result("2026-02-05T10:33:00", [make_stock("AAA", rsi=np.float64(25.0), is_52w_high=np.bool_(True))])
+    document = json.loads(dumps_results(result))
+    assert document["stocks"]["AAA"][document["columns"].index("is_52w_high")] is True
+
+    document["columns"] = [*document["columns"][:-1], "unknown_column"]
+
+    stock = decode_results(document).watchlist[0]
+    assert stock.fv_vs_ath == 0.0
+
+
+def test_reads_v1_files_and_rewrites_them_smaller():
+    path = sorted(DATA_DIR.glob("scan_*.json"))[-1]
+    result = load_results(path)
+
+    compact = dumps_results(result)
+
+    assert decode_results(json.loads(compact)) == result
+    assert len(compact) < path.stat().st_size / 2
+    assert sum(len(getattr(result, s)) for s in SECTIONS) > len(encode_results(result)["stocks"])
+
+
+def test_load_results_reads_v2_files(tmp_path):
+    result = make_result("2026-02-05T10:33:00", [make_stock("AAA")])
+    path = tmp_path / "scan_20260205_1033.json"
+    path.write_text(dumps_results(result))
+
+    assert asdict(load_results(path)) == asdict(result)
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+
+from archive import Archive
+from checkpoint import Checkpoint, run_label
+from conftest import make_bars, make_info
+from fetcher import FetchScheduler
+from providers import FlakyProvider, LocalProvider
+from store import FIELD_TTLS, BarStore, ConstituentCache, FundamentalsCache, NegativeCache
+
+import scan
+
+
+def make_provider() -> LocalProvider:
+    bars = {
+        "DOWN": make_bars(260, seed=1),
+        "UP": make_bars(260, seed=2),
+        "BANK": make_bars(260, seed=3),
+        "QQQ": make_bars(260, seed=4),
+    }
+    infos = {
+        "DOWN": make_info("DOWN", bars["DOWN"]["Close"].iloc[-1]),
+        "UP": make_info("UP", bars["UP"]["Close"].iloc[-1]),
+        "BANK": make_info("BANK", bars["BANK"]["Close"].iloc[-1], sector="Financial Services"),
+    }
+
+    return LocalProvider(infos, bars)
+
+
+def test_analyze_stock_against_local_provider(tmp_path):
+    provider = make_provider()
+    stock = scan.analyze_stock("UP", 0.0, provider, BarStore(tmp_path))
+
+    close = provider.bars["UP"]["Close"]
+    assert stock.ticker == "UP"
+    assert stock.ath == close.max()
+    assert stock.rsi == scan.calculate_rsi(close)
+    assert stock.streak == scan.calculate_streak(close)
+    assert scan.analyze_stock("BANK", 0.0, provider, BarStore(tmp_path)) is None
+    assert scan.analyze_stock("MISSING", 0.0, provider, BarStore(tmp_path)) is None
+
+
+def test_offline_scan(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    result = scan.scan(skip_ai=True, provider=make_provider(), store=BarStore(tmp_path / "bars"))
+
+    assert result.total_stocks == 2
+    assert list((tmp_path / "data").glob("scan_*.json"))
+
+
+def test_scan_saves_and_archives_into_the_given_places(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    offline = tmp_path / "offline"
+    archive = Archive(offline / "archive.sqlite")
+    scan.scan(
+        skip_ai=True, provider=make_provider(), store=BarStore(offline / "bars"),
+        negative=NegativeCache(offline / "negative.json"), archive=archive, output_dir=offline,
+    )
+
+    assert list(offline.glob("scan_*.json")) and archive.runs()
+    assert not list((tmp_path / "data").glob("scan_*.json"))
+    assert not (tmp_path / "data" / "archive.sqlite").exists()
+
+
+def test_repeat_scan_serves_fundamentals_from_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    provider = make_provider()
+    cache_path = tmp_path / "fundamentals.json"
+
+    scan.scan(skip_ai=True, provider=provider, store=BarStore(tmp_path / "bars"), cache=FundamentalsCache(cache_path))
+    cache = FundamentalsCache(cache_path)
+    result = scan.scan(skip_ai=True, provider=provider, store=BarStore(tmp_path / "bars"), cache=cache)
+
+    assert (cache.hits, cache.misses) == (2, 0)
+    assert result.total_stocks == 2
+
+
+class CountingProvider(LocalProvider):
+    def __init__(self, infos, bars):
+        super().__init__(infos, bars)
+        self.info_calls = []
+
+    def info(self, ticker):
+        self.info_calls.append(ticker)
+
+        return super().info(ticker)
+
+
+def test_prefilter_and_negative_cache_skip_network(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    base = make_provider()
+    infos = dict(base.infos, NEW=make_info("NEW", 50.0), GONE=make_info("GONE", 50.0))
+    bars = dict(base.bars, NEW=make_bars(10, seed=5))
+    provider = CountingProvider(infos, bars)
+    provider.universe = lambda: list(infos) + ["DEAD"]
+
+    scan.scan(skip_ai=True, provider=provider)
+    assert sorted(provider.info_calls) == ["BANK", "DEAD", "DOWN", "GONE", "NEW", "UP"]
+
+    negative = NegativeCache()
+    assert negative.reason("DEAD") == "error: KeyError"
+    assert negative.reason("NEW") == "short_history"
+    assert negative.reason("GONE") == "short_history"
+
+    provider.info_calls.clear()
+    cache = FundamentalsCache()
+    cache.entries["UP"]["targetMeanPrice"][1] = 0
+    cache.entries["BANK"]["targetMeanPrice"][1] = 0
+    scan.scan(skip_ai=True, provider=provider, cache=cache, negative=negative)
+    assert provider.info_calls == ["UP"]
+
+
+def test_info_without_market_cap_fails_the_screen_fresh_or_cached(tmp_path):
+    info = make_info("NOCAP", 50.0)
+    del info["marketCap"]
+    provider = LocalProvider({"NOCAP": info}, {})
+    cache = FundamentalsCache(tmp_path / "fundamentals.json")
+
+    assert scan.screen_reason(info) == "market_cap"
+    assert scan.fetch_fundamentals("NOCAP", provider, cache) is None
+    assert scan.fetch_fundamentals("NOCAP", provider, cache) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert scan.rejection_reason(cache.fresh("NOCAP")) is None
+
+
+def test_throttled_tickers_are_not_negative_cached(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    provider = FlakyProvider(make_provider(), throttle_rate=1.0)
+    scheduler = FetchScheduler(rate=1000, max_rate=1000, backoff=0.001, max_retries=1)
+
+    result = scan.scan(skip_ai=True, provider=provider, scheduler=scheduler)
+
+    assert result.total_stocks == 0 and provider.throttled
+    assert NegativeCache().entries == {}
+
+
+SP500_HTML = """<html><body>
+<table class="wikitable"><tr><th>Other</th></tr><tr><td>x</td></tr></table>
+<table id="constituents"><tr><th>Symbol</th><th>Security</th></tr>
+<tr><td>AAPL</td><td>Apple</td></tr><tr><td>BRK.B</td><td>Berkshire</td></tr></table>
+</body></html>"""
+
+
+class FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+def test_constituents_revalidate_with_etag_and_fall_back_when_offline(tmp_path, monkeypatch):
+    requests_seen = []
+    responses = [
+        FakeResponse(200, SP500_HTML, {"ETag": '"v1"'}),
+        FakeResponse(304),
+        FakeResponse(503),
+    ]
+
+    def fake_get(url, headers=None, timeout=None):
+        requests_seen.append(headers)
+        return responses.pop(0)
+
+    monkeypatch.setattr(scan.requests, "get", fake_get)
+    cache = ConstituentCache(tmp_path / "universe.json", max_age=timedelta(days=1))
+
+    assert scan.fetch_sp500_tickers(cache) == ["AAPL", "BRK-B"]
+    assert scan.fetch_sp500_tickers(cache) == ["AAPL", "BRK-B"]
+    assert len(requests_seen) == 1
+
+    cache = ConstituentCache(tmp_path / "universe.json", max_age=timedelta(0))
+    assert scan.fetch_sp500_tickers(cache) == ["AAPL", "BRK-B"]
+    assert requests_seen[-1]["If-None-Match"] == '"v1"'
+    assert scan.fetch_sp500_tickers(cache) == ["AAPL", "BRK-B"]
+    assert len(requests_seen) == 3
+
+
+def test_resume_fetches_only_remaining_tickers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    base = make_provider()
+    provider = CountingProvider(base.infos, base.bars)
+
+    checkpoint = Checkpoint(tmp_path / "run.jsonl")
+    # What scan() checkpoints: the cached fields, None where Yahoo reported nothing.
+    del base.infos["UP"]["shortName"]
+    info = scan.fetch_fundamentals("UP", base)
+    checkpoint.append("UP", "ok", {k: info.get(k) for k in FIELD_TTLS})
+    checkpoint.append("BANK", "rejected")
+    # DOWN failed on a transient error, which also put it in the negative cache.
+    checkpoint.append("DOWN", "failed")
+    negative = NegativeCache()
+    negative.add("DOWN", "error: Timeout")
+    negative.save()
+
+    result = scan.scan(skip_ai=True, provider=provider, resume=Checkpoint(tmp_path / "run.jsonl"))
+
+    assert provider.info_calls == ["DOWN"]
+    assert result.total_stocks == 2
+    assert not (tmp_path / "run.jsonl").exists()
+
+
+def test_latest_checkpoint_matches_the_run_label(tmp_path):
+    for name in ("run_20260204_160000.jsonl", "run_20260204_170000_shard1of2.jsonl"):
+        (tmp_path / name).touch()
+
+    assert Checkpoint.latest(tmp_path).path.name == "run_20260204_160000.jsonl"
+    assert Checkpoint.latest(tmp_path, label=run_label((1, 2))).path.name == "run_20260204_170000_shard1of2.jsonl"
+    assert Checkpoint.latest(tmp_path, label=run_label((2, 2))) is None
+
+
+def test_checkpoint_tolerates_truncated_last_line(tmp_path):
+    path = tmp_path / "run.jsonl"
+    Checkpoint(path).append("UP", "ok", {"sector": "Technology"})
+    with open(path, "a") as f:
+        f.write('{"ticker": "DO')
+
+    checkpoint = Checkpoint(path)
+    assert checkpoint.done() == {"UP"}
+    assert checkpoint.infos() == {"UP": {"sector": "Technology"}}
+
+
+def test_profile_writes_metrics_next_to_scan(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    scan.scan(skip_ai=True, provider=make_provider(), profile=True)
+
+    [metrics_path] = (tmp_path / "data").glob("metrics_*.json")
+    metrics = json.loads(metrics_path.read_text())
+
+    assert {"universe", "fundamentals", "history", "indicators", "render", "save"} <= set(metrics["stages"])
+    assert metrics["latencies"]["info"]["count"] == 3
+    assert metrics["latencies"]["ticker"]["count"] == 3
+    assert metrics["counters"]["rejections"] == {"sector": 1}
+    assert scan.get_latest_scan(tmp_path / "data").name.startswith("scan_")
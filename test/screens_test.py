@@ -0,0 +1,84 @@
+import json
+import random
+
+import numpy as np
+import pytest
+
+import scan
+from conftest import make_stock
+from results import decode_results, dumps_results, section_membership
+from screens import ScreenError, compile_filter, load_screens, make_screen, select
+
+
+def random_stocks(count: int = 300) -> list:
+    rng = random.Random(0)
+
+    return [
+        make_stock(
+            f"S{i}", pct_from_ath=rng.uniform(-60, 0), change_1d=round(rng.uniform(-9, 9)), streak=rng.randint(-6, 6),
+            roc_30d=rng.uniform(-20, 40), rsi=rng.uniform(10, 90), upside=rng.uniform(-10, 60),
+            rating=rng.choice(["buy", "hold", "strong_buy"]),
+        )
+        for i in range(count)
+    ]
+
+
+def test_configured_screens_match_the_original_sections():
+    stocks = random_stocks()
+    result = scan.categorize(stocks, 1.0)
+
+    def tickers(picked):
+        return [s.ticker for s in picked]
+
+    assert tickers(result.watchlist) == tickers(sorted([s for s in stocks if s.pct_from_ath <= -20], key=lambda x: x.pct_from_ath))
+    assert tickers(result.big_drops) == tickers(sorted([s for s in stocks if s.change_1d <= -5], key=lambda x: x.change_1d))
+    assert tickers(result.big_gains) == tickers(sorted([s for s in stocks if s.change_1d >= 5], key=lambda x: -x.change_1d))
+    assert tickers(result.down_streaks) == tickers(sorted([s for s in stocks if s.streak < -2], key=lambda x: x.streak)[:15])
+    assert tickers(result.up_streaks) == tickers(sorted([s for s in stocks if s.streak > 2], key=lambda x: -x.streak)[:15])
+    assert tickers(result.parabolic) == tickers(sorted([s for s in stocks if s.roc_30d > 15 and s.rsi > 55], key=lambda x: -x.roc_30d))
+    assert result.custom == {}
+
+
+def test_custom_screens_become_sections(tmp_path):
+    path = tmp_path / "screens.json"
+    path.write_text(json.dumps([
+        {"name": "watchlist", "title": "W", "filter": "pct_from_ath <= -50", "sort": "pct_from_ath"},
+        {"name": "cheap_buys", "title": "Cheap buys", "filter": "rating == 'buy' and not (upside < 20)", "sort": "-upside", "limit": 3},
+        {"name": "everything", "title": "All", "filter": "true"},
+    ]))
+    screens = load_screens(path)
+    stocks = random_stocks()
+
+    result = scan.categorize(stocks, 1.0, screens)
+
+    expected = sorted([s for s in stocks if s.rating == "buy" and s.upside >= 20], key=lambda s: -s.upside)[:3]
+    assert [s.ticker for s in result.custom["cheap_buys"]] == [s.ticker for s in expected]
+    assert len(result.custom["everything"]) == len(stocks)
+    assert result.big_drops == []
+    assert section_membership(decode_results(json.loads(dumps_results(result)))) == section_membership(result)
+
+
+def test_filters_are_checked_when_compiled():
+    evaluate, fields = compile_filter("-5 < change_1d * 2 <= 10 or streak > 3")
+    assert fields == {"change_1d", "streak"}
+
+    for expression, message in (("price > __import__('os')", "unsupported"), ("volume > 1", "unknown field"), ("rsi >", "invalid")):
+        with pytest.raises(ScreenError, match=message):
+            compile_filter(expression)
+    with pytest.raises(ScreenError, match="sort field"):
+        make_screen({"name": "x", "filter": "rsi < 30", "sort": "-nope"})
+
+
+def test_select_with_no_stocks():
+    assert select(load_screens(), []) == {screen.name: [] for screen in load_screens()}
+
+
+def test_not_and_boolean_operators_are_logical_for_numeric_operands():
+    columns = {"streak": np.array([0, 2, 3]), "rsi": np.array([20.0, 20.0, 50.0])}
+
+    for expression, expected in (
+        ("not 1", [False] * 3), ("not 0", [True] * 3), ("not streak", [True, False, False]),
+        ("streak and rsi < 30", [False, True, False]), ("streak or rsi < 30", [True, True, True]),
+    ):
+        evaluate, _ = compile_filter(expression)
+        assert np.broadcast_to(evaluate(columns), (3,)).tolist() == expected, expression
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from archive import Archive
+from conftest import make_result, make_stock
+from results import dumps_results
+from server import ScanIndex, make_server
+
+
+@pytest.fixture
+def api(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    shared = make_stock("BBB")
+    first = make_result("2026-02-04T16:00:00", [make_stock("AAA"), shared], big_drops=[shared])
+    (data_dir / "scan_20260204_1600.json").write_text(dumps_results(first))
+    archive = Archive(data_dir / "archive.sqlite")
+    archive.add(first)
+
+    index = ScanIndex(data_dir, archive_path=data_dir / "archive.sqlite")
+    server = make_server(index, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", index, data_dir, archive
+    server.shutdown()
+    server.server_close()
+    archive.close()
+
+
+def get(url: str, etag: str | None = None) -> tuple[int, dict, object]:
+    request = urllib.request.Request(url, headers={"If-None-Match": etag} if etag else {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, dict(response.headers), json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), None
+
+
+def test_serves_scans_sections_and_stocks(api):
+    base, *_ = api
+
+    status, _, listing = get(f"{base}/scans")
+    assert status == 200
+    assert listing == [{"id": "20260204_1600", "timestamp": "2026-02-04T16:00:00", "total_stocks": 10}]
+
+    _, _, scan = get(f"{base}/scans/latest")
+    assert [s["ticker"] for s in scan["watchlist"]] == ["AAA", "BBB"]
+
+    _, _, drops = get(f"{base}/scans/20260204_1600/big_drops")
+    assert [s["ticker"] for s in drops] == ["BBB"]
+
+    _, _, stock = get(f"{base}/scans/latest/stocks/BBB")
+    assert stock["sections"] == ["watchlist", "big_drops"]
+
+    _, _, history = get(f"{base}/tickers/bbb/history")
+    assert history[0]["sections"] == ["watchlist", "big_drops"]
+
+    assert get(f"{base}/scans/latest/stocks/NOPE")[0] == 404
+
+
+def test_etag_revalidation_and_new_scans(api):
+    base, index, data_dir, _ = api
+    status, headers, _ = get(f"{base}/scans/latest")
+
+    assert get(f"{base}/scans/latest", etag=headers["ETag"])[0] == 304
+
+    second = make_result("2026-02-05T10:00:00", [make_stock("CCC")])
+    (data_dir / "scan_20260205_1000.json").write_text(dumps_results(second))
+    index.refresh(force=True)
+
+    status, new_headers, scan = get(f"{base}/scans/latest", etag=headers["ETag"])
+    assert status == 200
+    assert new_headers["ETag"] != headers["ETag"]
+    assert scan["timestamp"] == "2026-02-05T10:00:00"
+
+
+def test_responses_are_serialized_once_per_scan(api, monkeypatch):
+    base, index, *_ = api
+    import server
+
+    def fail(*args, **kwargs):
+        raise AssertionError("scan file parsed again")
+
+    monkeypatch.setattr(server, "load_results", fail)
+    threads = [threading.Thread(target=get, args=(f"{base}/scans/latest/watchlist",)) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    index.refresh(force=True)
+
+    assert get(f"{base}/scans/latest/watchlist")[0] == 200
+
+
+def test_nan_indicators_are_served_as_null(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    result = make_result("2026-02-04T16:00:00", [make_stock("FLAT", rsi=float("nan"))])
+    (data_dir / "scan_20260204_1600.json").write_text(dumps_results(result))
+    index = ScanIndex(data_dir, archive_path=data_dir / "archive.sqlite")
+
+    def strict(constant):
+        raise ValueError(f"invalid JSON constant {constant}")
+
+    for path in ("/scans/latest", "/scans/latest/watchlist", "/scans/latest/stocks/FLAT"):
+        json.loads(index.get(path).body, parse_constant=strict)
+    assert json.loads(index.get("/scans/latest/stocks/FLAT").body)["rsi"] is None
@@ -0,0 +1,84 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import scan
+from conftest import make_bars, make_info
+from providers import LocalProvider
+from results import load_results, section_membership
+from shard import ShardError, in_shard, parse_shard, read_shards, shard_of, write_shard
+from store import BarStore
+
+ROOT = Path(__file__).resolve().parent.parent
+TICKERS = [f"T{i}" for i in range(12)]
+
+
+def make_provider() -> LocalProvider:
+    bars = {ticker: make_bars(260, seed=i + 10) for i, ticker in enumerate(TICKERS)}
+    bars["QQQ"] = make_bars(260, seed=4)
+    infos = {ticker: make_info(ticker, bars[ticker]["Close"].iloc[-1]) for ticker in TICKERS}
+
+    return LocalProvider(infos, bars)
+
+
+def test_shards_partition_the_universe_deterministically():
+    shards = [in_shard(TICKERS, (k, 3)) for k in (1, 2, 3)]
+
+    assert sorted(sum(shards, [])) == sorted(TICKERS)
+    assert all(shards)
+    # crc32 of the symbol, not Python's per-process salted hash()
+    assert [shard_of("NVDA", 4), shard_of("AAPL", 4), shard_of("MSFT", 4)] == [4, 1, 4]
+    assert shard_of("NVDA", 1) == 1
+
+
+def test_parse_shard():
+    assert parse_shard("2/4") == (2, 4)
+    for value in ("0/4", "5/4", "2", "a/b"):
+        with pytest.raises(ValueError):
+            parse_shard(value)
+
+
+def test_merged_shards_match_an_unsharded_scan(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    provider = make_provider()
+    full = scan.scan(skip_ai=True, provider=provider, store=BarStore(tmp_path / "bars"))
+
+    for k in (1, 2, 3):
+        scan.scan(provider=provider, store=BarStore(tmp_path / "bars"), shard=(k, 3))
+    assert len(list((tmp_path / "data").glob("scan_*.json"))) == 1
+
+    merged = scan.merge_shards(skip_ai=True)
+
+    assert merged.total_stocks == full.total_stocks == len(TICKERS)
+    assert section_membership(merged) == section_membership(full)
+    assert [s.ticker for s in merged.watchlist] == [s.ticker for s in full.watchlist]
+
+
+def test_merge_needs_every_shard_of_the_same_day(tmp_path):
+    write_shard([], 1.0, (1, 2), tmp_path)
+    with pytest.raises(ShardError, match="Missing shard 2/2"):
+        read_shards(tmp_path)
+
+    path = write_shard([], 1.0, (2, 2), tmp_path)
+    data = json.loads(path.read_text())
+    path.write_text(json.dumps({**data, "timestamp": "2020-01-01T10:00:00"}))
+    with pytest.raises(ShardError, match="rerun shard 2/2"):
+        read_shards(tmp_path)
+
+
+def test_local_launcher_runs_and_merges_all_shards(tmp_path):
+    make_provider().to_dir(tmp_path / "offline")
+    subprocess.run(
+        [sys.executable, str(ROOT / "scan.py"), "--shards", "2", "--offline", "offline", "--no-ai"],
+        cwd=tmp_path, check=True, capture_output=True,
+    )
+
+    assert sorted(p.name for p in (tmp_path / "data" / "shards").glob("*.json")) == ["shard_1of2.json", "shard_2of2.json"]
+    [json_path] = (tmp_path / "offline").glob("scan_*.json")
+    assert load_results(json_path).total_stocks == len(TICKERS)
+    assert (tmp_path / "offline" / "archive.sqlite").exists()
+    assert not list((tmp_path / "data").glob("scan_*.json"))
+    assert list((tmp_path / "offline" / "cache").glob("fundamentals.shard*of2.json"))
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+HEAVY = ("pandas", "numpy", "yfinance", "requests", "lxml")
+
+RENDER_ONLY = f"""
+import contextlib, io, json, sys
+sys.argv = ["scan.py", "--load", sys.argv[1]]
+import scan
+with contextlib.redirect_stdout(io.StringIO()):
+    scan.main()
+print(json.dumps([name for name in {HEAVY!r} if name in sys.modules]))
+"""
+
+
+def test_load_and_render_skip_the_data_stack():
+    scan_file = sorted((ROOT / "data").glob("scan_*.json"))[-1]
+    output = subprocess.run(
+        [sys.executable, "-c", RENDER_ONLY, str(scan_file)], cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+
+    assert json.loads(output.splitlines()[-1]) == []
+
+
+def test_pipeline_names_still_resolve_from_scan():
+    import scan
+    import scanner
+
+    assert scan.analyze_stock is scanner.analyze_stock
+    with pytest.raises(AttributeError):
+        scan.no_such_name
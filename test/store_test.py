@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+from conftest import make_bars
+from providers import LocalProvider
+from store import BarStore, FundamentalsCache, NegativeCache, write_json_atomic
+
+
+class RecordingProvider(LocalProvider):
+    def __init__(self, bars):
+        super().__init__({}, bars)
+        self.calls = []
+
+    def history(self, tickers, start=None, period="1y"):
+        self.calls.append((sorted(tickers), start))
+
+        return super().history(tickers, start=start, period=period)
+
+
+def test_seeds_then_fetches_only_from_last_stored_bar(tmp_path):
+    store = BarStore(tmp_path)
+    full = {"NVDA": make_bars(300), "AMD": make_bars(300, start_price=50)}
+    provider = RecordingProvider({t: bars.iloc[:-1] for t, bars in full.items()})
+
+    first = store.sync(["NVDA", "AMD"], provider)
+    provider.bars = full
+    second = store.sync(["NVDA", "AMD"], provider)
+
+    assert provider.calls[0] == (["AMD", "NVDA"], None)
+    assert provider.calls[1] == (["AMD", "NVDA"], full["NVDA"].index[-3].date())
+    assert len(second["NVDA"]) == len(first["NVDA"]) + 1
+    assert second["AMD"]["Close"].iloc[-1] == full["AMD"]["Close"].iloc[-1]
+    assert second["NVDA"].index[0] >= pd.Timestamp(date.today() - timedelta(days=365))
+
+
+def test_reseeds_when_completed_bar_was_readjusted(tmp_path):
+    store = BarStore(tmp_path)
+    provider = RecordingProvider({"AAPL": make_bars(60, end=date.today() - timedelta(days=7))})
+    store.sync(["AAPL"], provider)
+
+    provider.bars = {"AAPL": make_bars(65, start_price=25.0)}
+    bars = store.sync(["AAPL"], provider)["AAPL"]
+
+    assert provider.calls[-1] == (["AAPL"], None)
+    assert bars["Close"].iloc[0] == 25.0
+    assert store.load("AAPL")["Close"].iloc[-1] == provider.bars["AAPL"]["Close"].iloc[-1]
+
+
+def test_partial_bar_settling_is_not_a_readjustment(tmp_path):
+    store = BarStore(tmp_path)
+    full = make_bars(60, end=date.today())
+    partial = full.iloc[:-1].copy()
+    partial.iloc[-1, partial.columns.get_loc("Close")] *= 0.97  # day D's close, mid-session
+    provider = RecordingProvider({"T": partial})
+    store.sync(["T"], provider)
+
+    provider.bars = {"T": full}  # day D + 1: D settled at its real close
+    bars = store.sync(["T"], provider)["T"]
+
+    assert provider.calls[-1] == (["T"], full.index[-3].date())
+    assert bars["Close"].iloc[-2] == full["Close"].iloc[-2]
+    assert len(bars) == len(full)
+
+
+def test_round_trips_columns(tmp_path):
+    store = BarStore(tmp_path)
+    bars = store.append("MSFT", make_bars(10))
+    loaded = store.load("MSFT")
+
+    pd.testing.assert_frame_equal(loaded, bars, check_freq=False)
+    assert store.load("MISSING") is None
+
+
+def test_fundamentals_cache_expires_fields_independently(tmp_path):
+    path = tmp_path / "fundamentals.json"
+    fetches = []
+
+    def fetch(ticker):
+        fetches.append(ticker)
+
+        return {"sector": "Technology", "marketCap": 5e9, "averageVolume": 1e6, "currentPrice": 42.0}
+
+    cache = FundamentalsCache(path)
+    assert cache.get("NVDA", fetch)["currentPrice"] == 42.0
+    cache.save()
+
+    cache = FundamentalsCache(path)
+    info = cache.get("NVDA", fetch)
+    assert fetches == ["NVDA"]
+    assert info["sector"] == "Technology"
+    assert "targetMeanPrice" not in info
+
+    later = time.time() + timedelta(hours=7).total_seconds()
+    assert cache.expired("NVDA", later) == ["targetMeanPrice", "recommendationKey"]
+    assert "currentPrice" not in cache.fresh("NVDA", later)
+    assert cache.fresh("NVDA", later)["marketCap"] == 5e9
+
+
+def test_negative_cache_backs_off_on_repeat_failures(tmp_path):
+    negative = NegativeCache(tmp_path / "negative.json", ttl=timedelta(hours=1))
+    negative.add("DEAD", "error: KeyError")
+    first_until = negative.entries["DEAD"]["until"]
+    negative.add("DEAD", "error: KeyError")
+    negative.save()
+
+    negative = NegativeCache(tmp_path / "negative.json", ttl=timedelta(hours=1))
+    assert negative.reason("DEAD") == "error: KeyError"
+    assert negative.entries["DEAD"]["until"] - first_until > 3000
+    assert negative.reason("DEAD", now=time.time() + 3 * 3600) is None
+
+
+def test_write_json_atomic_replaces_the_file_without_leaving_a_temp_file(tmp_path):
+    path = tmp_path / "cache" / "entries.json"
+    write_json_atomic(path, {"OLD": 1})
+    write_json_atomic(path, {"NEW": [1.5, None]})
+
+    assert json.loads(path.read_text()) == {"NEW": [1.5, None]}
+    assert [p.name for p in path.parent.iterdir()] == ["entries.json"]
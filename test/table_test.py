@@ -0,0 +1,71 @@
+from dataclasses import asdict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import scanner
+from conftest import make_bars, make_info, make_stock
+from render import build_row
+from results import decode_results, encode_results
+from table import StockRow, StockTable
+
+
+def test_rows_read_and_write_the_columns():
+    stocks = [make_stock("AAA"), make_stock("BBB", streak=4, is_52w_high=True, rating="hold")]
+    table = StockTable.from_stocks(stocks)
+
+    assert table.columns["price"].dtype == np.float64
+    assert table.columns["streak"].dtype == np.int64
+    assert list(table) == stocks
+    assert [row.to_stock() for row in table] == stocks
+    assert type(table[1].streak) is int and type(table[1].is_52w_high) is bool
+    assert table[-1].ticker == "BBB"
+    with pytest.raises(AttributeError):
+        table[0].volume
+
+    table[0].ai_assessment = "BUY - cheap"
+    assert table.columns["ai_assessment"][0] == "BUY - cheap"
+    with pytest.raises(AttributeError):
+        table[0].volume = 1
+
+
+def test_build_stocks_matches_the_per_stock_fields():
+    infos = {"AAA": make_info("AAA", 120.0), "CHEAP": make_info("CHEAP", 5.0), "NOFV": make_info("NOFV", 80.0)}
+    del infos["NOFV"]["targetMeanPrice"]
+    histories = {
+        "AAA": make_bars(260, start_price=100, seed=1),
+        "CHEAP": make_bars(260, start_price=5, seed=2),
+        "NOFV": make_bars(260, start_price=90, seed=3),
+    }
+
+    table = scanner.build_stocks(infos, histories, 2.0)
+
+    assert isinstance(table, StockTable)
+    assert [row.ticker for row in table] == ["AAA", "NOFV"]
+    for row in table:
+        assert row.signal == scanner.rsi_signal_plain(row.rsi)
+        assert row.rs_vs_qqq == pytest.approx(row.roc_30d - 2.0)
+    aaa, nofv = table
+    assert aaa.upside == pytest.approx(20.0)
+    assert aaa.fv_vs_ath == pytest.approx((144.0 - aaa.ath) / aaa.ath * 100)
+    assert (nofv.fair_value, nofv.upside, nofv.fv_vs_ath) == (0.0, 0.0, 0.0)
+
+
+def test_sections_share_rows_and_export_like_stocks(tmp_path):
+    stocks = [make_stock("AAA"), make_stock("BBB", change_1d=7.0, streak=3), make_stock("CCC", pct_from_ath=-5.0)]
+    result = scanner.categorize(StockTable.from_stocks(stocks), 1.0)
+    assert all(isinstance(stock, StockRow) for stock in result.watchlist)
+
+    # An AI verdict set through one section shows in every section with that ticker.
+    result.watchlist[0].ai_assessment = "WAIT - earnings"
+    assert result.big_drops[0].ai_assessment == "WAIT - earnings"
+
+    columns = [("Ticker", "left"), ("Price", "right"), ("Rating", "center"), ("Signal", "center")]
+    assert build_row(result.watchlist[0], columns) == build_row(result.watchlist[0].to_stock(), columns)
+    assert decode_results(encode_results(result)).watchlist == [stock.to_stock() for stock in result.watchlist]
+
+    scanner.write_results(result, tmp_path / "scan.json", tmp_path / "scan.csv")
+    unique = {stock.ticker: stock.to_stock() for section in result.sections().values() for stock in section}
+    expected = pd.DataFrame([asdict(stock) for stock in unique.values()])
+    assert (tmp_path / "scan.csv").read_text() == expected.to_csv(index=False)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import argparse
+
+import pandas as pd
+import pytest
+
+from ath import AthIndex
+from incremental import IndicatorStore
+from providers import LocalProvider
+from results import get_latest_scan, load_results
+from scan_test import make_provider
+from store import BarStore
+from watch import Watcher, parse_interval
+
+
+class RecordingProvider(LocalProvider):
+    def __init__(self, inner: LocalProvider):
+        super().__init__(inner.infos, inner.bars)
+        self.history_calls = []
+
+    def history(self, tickers, start=None, period="1y"):
+        self.history_calls.append((sorted(tickers), start, period))
+        return super().history(tickers, start=start, period=period)
+
+
+def add_bar(provider: LocalProvider, ticker: str, change: float) -> None:
+    bars = provider.bars[ticker]
+    last = bars.iloc[-1]
+    day = bars.index[-1] + pd.offsets.BDay(1)
+    close = last["Close"] * (1 + change)
+    provider.bars[ticker] = pd.concat([bars, pd.DataFrame(
+        {"Open": [close], "High": [close], "Low": [close], "Close": [close], "Volume": [last["Volume"]]}, index=[day],
+    )])
+
+
+def test_parse_interval():
+    assert parse_interval("90") == 90
+    assert parse_interval("90s") == 90
+    assert parse_interval("5m") == 300
+    assert parse_interval("1h") == 3600
+    for value in ("5x", "", "m", "0", "-5m", "nan", "inf"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_interval(value)
+
+
+def test_refresh_fetches_deltas_and_saves_only_on_membership_change(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    provider = RecordingProvider(make_provider())
+    watcher = Watcher(provider=provider, store=BarStore(tmp_path / "bars"), skip_ai=True)
+    warm = watcher.warm()
+    assert "UP" not in {s.ticker for s in warm.big_drops}
+    saved = get_latest_scan(tmp_path / "data")
+    saved.unlink()
+
+    provider.history_calls.clear()
+    assert watcher.refresh() is False
+    assert get_latest_scan(tmp_path / "data") is None
+    # One batched delta request for every warm ticker plus the benchmark, from their last bar.
+    [(tickers, start, _)] = provider.history_calls
+    assert tickers == ["DOWN", "QQQ", "UP"]
+    assert start == provider.bars["UP"].index[-1].date()
+
+    add_bar(provider, "UP", -0.10)
+    add_bar(provider, "DOWN", 0.001)
+    add_bar(provider, "QQQ", 0.001)
+
+    assert watcher.refresh() is True
+    result = load_results(get_latest_scan(tmp_path / "data"))
+    assert "UP" in {s.ticker for s in result.big_drops}
+    assert watcher.state.histories["UP"].index[-1] == provider.bars["UP"].index[-1]
+
+
+def test_refresh_persists_indicator_and_ath_state(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    provider = make_provider()
+    watcher = Watcher(
+        provider=provider, store=BarStore(tmp_path / "bars"), skip_ai=True,
+        scan_options={"indicator_state": IndicatorStore(tmp_path / "indicators.json"), "ath_index": AthIndex(tmp_path / "ath.json")},
+    )
+    watcher.warm()
+
+    add_bar(provider, "UP", 0.50)
+    add_bar(provider, "DOWN", 0.001)
+    add_bar(provider, "QQQ", 0.001)
+    watcher.refresh()
+    add_bar(provider, "UP", -0.01)
+    watcher.refresh()
+
+    # A restart picks up the state the cycles advanced, not the warm-up's.
+    assert IndicatorStore(tmp_path / "indicators.json").states["UP"].to_dict() == watcher.indicator_state.states["UP"].to_dict()
+    assert AthIndex(tmp_path / "ath.json").get("UP") == provider.bars["UP"]["Close"].iloc[-2]
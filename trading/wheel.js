@@ -39,9 +39,32 @@ function getLatestScan(dataDir) {
   return path.join(dir, files[0]);
 }
 
+const SECTIONS = ['watchlist', 'big_drops', 'big_gains', 'down_streaks', 'up_streaks', 'parabolic'];
+
+// Version 2 scans store each stock once as a row in a ticker-keyed table and
+// sections as ticker lists; expand them to the version 1 shape (stock objects
+// per section) that the rest of this file works with.
+function normalizeScan(scan) {
+  if (!scan.version || scan.version < 2) return scan;
+
+  const stocks = {};
+  for (const [ticker, row] of Object.entries(scan.stocks)) {
+    const stock = { ticker };
+    scan.columns.forEach((column, i) => { stock[column] = row[i]; });
+    stocks[ticker] = stock;
+  }
+
+  const { timestamp, qqq_30d_return, total_stocks } = scan;
+  const result = { timestamp, qqq_30d_return, total_stocks };
+  for (const section of SECTIONS) {
+    result[section] = (scan.sections[section] || []).map(ticker => stocks[ticker]);
+  }
+  return result;
+}
+
 function loadScan(filePath) {
   const raw = fs.readFileSync(filePath, 'utf-8');
-  return JSON.parse(raw);
+  return normalizeScan(JSON.parse(raw));
 }
 
 // --- Candidate Filtering ---
@@ -421,6 +444,7 @@ module.exports = {
   filterWheelCandidates,
   enrichWithOptions,
   loadScan,
+  normalizeScan,
   getLatestScan,
   outputJSON,
 };
@@ -3,7 +3,7 @@ const assert = require('node:assert/strict');
 const path = require('path');
 const fs = require('fs');
 
-const { scoreStock, filterWheelCandidates, WHEEL_CRITERIA, loadScan, getLatestScan } = require('./wheel');
+const { scoreStock, filterWheelCandidates, WHEEL_CRITERIA, loadScan, normalizeScan, getLatestScan } = require('./wheel');
 
 // --- Mock stock factory ---
 function mockStock(overrides = {}) {
@@ -121,6 +121,28 @@ describe('filterWheelCandidates', () => {
   });
 });
 
+// --- Scan Format Tests ---
+describe('normalizeScan', () => {
+  it('expands a version 2 scan into per-section stock objects', () => {
+    const scan = normalizeScan({
+      version: 2, timestamp: '2026-02-05T10:33:35', qqq_30d_return: -3.6, total_stocks: 2,
+      columns: ['price', 'rsi'],
+      stocks: { AAA: [20, 25], BBB: [30, 60] },
+      sections: { watchlist: ['BBB', 'AAA'], big_drops: ['AAA'] },
+    });
+
+    assert.deepEqual(scan.watchlist, [{ ticker: 'BBB', price: 30, rsi: 60 }, { ticker: 'AAA', price: 20, rsi: 25 }]);
+    assert.equal(scan.big_drops[0], scan.watchlist[1]);
+    assert.deepEqual(scan.parabolic, []);
+    assert.equal(scan.total_stocks, 2);
+  });
+
+  it('passes version 1 scans through', () => {
+    const v1 = { total_stocks: 1, watchlist: [mockStock()] };
+    assert.equal(normalizeScan(v1), v1);
+  });
+});
+
 // --- Real Scan Data Test ---
 describe('real scan data', () => {
   it('loads latest scan file', () => {
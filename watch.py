@@ -0,0 +1,154 @@
+"""
+Watch mode: a long-running scanner that refreshes from warm in-memory state.
+
+The first cycle is a full scan. Its fundamentals and price histories stay in
+memory, and each following cycle fetches only the bars since each ticker's last
+one (today's partial bar included), advances each ticker's indicator state by
+the new bars and re-renders and saves only when a section gains or loses a ticker.
+Indicator and ATH state are saved every cycle. Fundamentals are reloaded with a
+full scan once a day.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from archive import Archive
+from ath import AthIndex
+from incremental import IndicatorStore
+from providers import DataProvider, YahooProvider
+from render import console
+from results import ScanResult, section_membership
+from scanner import ScanState, build_stocks, categorize, publish, return_30d, scan
+from store import PRICE_FIELDS, BarStore, merge_bars
+
+QQQ = "QQQ"
+
+
+def parse_interval(value: str) -> float:
+    """Seconds in an interval like "90", "90s", "5m" or "1h"; an argparse type, so bad values fail at parse time."""
+    units = {"s": 1, "m": 60, "h": 3600}
+    number, unit = (value[:-1], units[value[-1]]) if value and value[-1] in units else (value, 1)
+    try:
+        seconds = float(number) * unit
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid interval {value!r}; use e.g. 90, 90s, 5m or 1h") from None
+    if not 0 < seconds < math.inf:
+        raise argparse.ArgumentTypeError(f"interval must be a positive duration, got {value!r}")
+
+    return seconds
+
+
+class Watcher:
+    """Keeps a scan's state warm and refreshes it with delta bar fetches."""
+
+    def __init__(
+        self,
+        provider: DataProvider | None = None,
+        store: BarStore | None = None,
+        skip_ai: bool = False,
+        output_dir: Path = Path("data"),
+        archive: Archive | None = None,
+        scan_options: dict | None = None,
+    ):
+        self.provider = provider or YahooProvider()
+        self.store = store
+        self.skip_ai = skip_ai
+        self.output_dir = output_dir
+        self.archive = archive
+        self.scan_options = scan_options or {}
+        self.state = ScanState()
+        self.indicator_state = self.scan_options.pop("indicator_state", None) or IndicatorStore()
+        self.ath_index = self.scan_options.pop("ath_index", None) or AthIndex()
+        self.qqq: pd.DataFrame | None = None
+        self.result: ScanResult | None = None
+        self.warmed: date | None = None
+        self.cycles = 0
+        self.changes = 0
+
+    def warm(self) -> ScanResult:
+        """Full scan that (re)loads the universe, fundamentals and histories."""
+        self.state = ScanState()
+        self.result = scan(
+            skip_ai=self.skip_ai, provider=self.provider, store=self.store, archive=self.archive,
+            output_dir=self.output_dir, state=self.state, indicator_state=self.indicator_state, ath_index=self.ath_index, **self.scan_options,
+        )
+        # A resumed checkpoint only applies to the first warm-up.
+        self.scan_options.pop("resume", None)
+        self.qqq = self.provider.history([QQQ], period="60d").get(QQQ)
+        # The warm scan's quoted prices go stale; from now on price off the latest bar.
+        self.state.infos = {t: {k: v for k, v in info.items() if k not in PRICE_FIELDS} for t, info in self.state.infos.items()}
+        self.warmed = date.today()
+
+        return self.result
+
+    def fetch_deltas(self) -> None:
+        """Fetch bars since each ticker's last one, batched by that date, into the in-memory histories."""
+        histories = dict(self.state.histories)
+        if self.qqq is not None and not self.qqq.empty:
+            histories[QQQ] = self.qqq
+
+        by_start = defaultdict(list)
+        for ticker, bars in histories.items():
+            if not bars.empty:
+                by_start[bars.index[-1].date()].append(ticker)
+
+        for start, group in by_start.items():
+            fetched = self.provider.history(group, start=start)
+            for ticker in group:
+                new = fetched.get(ticker)
+                if new is not None and not new.empty:
+                    histories[ticker] = merge_bars(histories[ticker], new)
+
+        self.qqq = histories.pop(QQQ, self.qqq)
+        self.state.histories = histories
+
+    def refresh(self) -> bool:
+        """One delta cycle; True when section membership changed and the result was re-rendered and saved."""
+        self.fetch_deltas()
+        self.ath_index.refresh(self.state.histories, self.provider)
+        stocks = build_stocks(
+            self.state.infos, self.state.histories, return_30d(self.qqq), self.indicator_state, self.ath_index,
+        )
+        # Persist what this cycle advanced, so a restart's warm-up picks up from here.
+        self.indicator_state.save()
+        self.ath_index.save()
+        result = categorize(stocks, return_30d(self.qqq))
+
+        changed = self.result is None or section_membership(result) != section_membership(self.result)
+        if not changed:
+            console.print(f"[dim]{datetime.now():%H:%M:%S} no section changes ({len(stocks)} stocks)[/dim]")
+            self.result = result
+            return False
+
+        self.changes += 1
+        self.result = result
+        console.print()
+        # Renders and saves with cached verdicts while the rest are assessed in the background, like a scan.
+        publish(
+            result, stocks, self.skip_ai, archive=self.archive, output_dir=self.output_dir,
+            output_format=self.scan_options.get("output_format", "rich"),
+        )
+
+        return True
+
+    def run(self, interval: float, cycles: int | None = None, sleep: Callable[[float], None] = time.sleep) -> None:
+        """Warm up, then refresh every interval seconds (forever unless cycles is given)."""
+        self.warm()
+        console.print(f"\n[dim]Watching every {interval:g}s. Ctrl-C to stop.[/dim]")
+
+        while cycles is None or self.cycles < cycles:
+            sleep(interval)
+            self.cycles += 1
+            if date.today() != self.warmed:
+                self.warm()
+            else:
+                self.refresh()